@@ -0,0 +1,192 @@
+# authTools.py
+"""
+Name:
+    authTools.py
+
+Objectives:
+    One place to find the google credentials and default project for bqTools and gsTools,
+    google.auth.default() is slow (env lookup, metadata server probe, key file parse)
+    so it runs once per process and the result is cached here
+
+    A background thread refreshes the cached token a few minutes before it expires,
+    so no bq/gs call ever has to stop and wait on a token refresh
+
+Problem:
+    Contact Rich or Tam
+
+Install list:
+    sudo pip install --upgrade google-auth
+    Please set GOOGLE_APPLICATION_CREDENTIALS or explicitly
+    create credential and re-run the application.
+
+"""
+
+import datetime
+import threading
+import time
+import google.auth
+from google.auth.transport.requests import Request
+
+# cloud-platform covers both bigquery and cloud storage, so one token serves both modules
+DEFAULT_SCOPES = ('https://www.googleapis.com/auth/cloud-platform',)
+
+# refresh the token this many seconds before it expires
+REFRESH_MARGIN_SECONDS = 300
+
+# cache of (credentials, project_id) keyed by the scopes tuple
+_credentials_cache = {}
+_credentials_lock = threading.Lock()
+_refresh_thread = None
+
+# functions clear_credentials calls after emptying the cache, bqTools and gsTools register
+# the functions that empty their client registries (the clients hold the old credentials)
+_clear_callbacks = []
+
+
+def get_credentials(scopes=DEFAULT_SCOPES):
+    """
+    get_credentials returns the cached default credentials and project id,
+    the first call runs google.auth.default() and fetches a token, later calls are a dict lookup
+
+    Args:
+       scopes (tuple, default DEFAULT_SCOPES):  the oauth scopes the credentials are requested for
+
+    Returns:
+        A tuple of (credentials, project_id).
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    key = tuple(scopes)
+    try:
+        with _credentials_lock:
+            cached = _credentials_cache.get(key)
+            if cached is None:
+                credentials, project_id = google.auth.default(scopes=list(key))
+                # fetch the first token now so the first api call does not pay for it
+                credentials.refresh(Request())
+                cached = (credentials, project_id)
+                _credentials_cache[key] = cached
+                _start_refresh_thread()
+
+        return cached
+
+    except Exception as e:
+        errorStr = 'ERROR (get_credentials): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def get_project(project=None):
+    """
+    get_project returns the project passed in, or the cached default project when it is None
+
+    Args:
+       project (str, optional):  The gcp project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+
+    Returns:
+        The project name string, None when the credentials have no default project.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    if project:
+        return str(project)
+
+    credentials, project_id = get_credentials()
+    if project_id is None:
+        return None
+
+    return str(project_id)
+
+
+def clear_credentials():
+    """
+    clear_credentials empties the cache, the next get_credentials call runs google.auth.default() again,
+    use it after switching GOOGLE_APPLICATION_CREDENTIALS inside a running process,
+    the pooled bqTools and gsTools clients are closed too so the next call builds them with the new credentials
+
+    Args:
+       No inbound arguments.
+
+    Returns:
+        Nothing returned.
+
+    Raises:
+       No exceptions raised.
+    """
+    with _credentials_lock:
+        _credentials_cache.clear()
+        callbacks = list(_clear_callbacks)
+
+    for callback in callbacks:
+        callback()
+
+
+def on_clear_credentials(callback):
+    """
+    on_clear_credentials registers a function (no arguments) that clear_credentials calls,
+    for modules that keep clients built with the cached credentials
+
+    Args:
+       callback (callable, required):  the function to call
+
+    Returns:
+        Nothing returned.
+
+    Raises:
+       No exceptions raised.
+    """
+    with _credentials_lock:
+        if callback not in _clear_callbacks:
+            _clear_callbacks.append(callback)
+
+
+def _seconds_until_refresh(credentials):
+    """
+    _seconds_until_refresh returns how long the refresh thread can sleep before this token needs a refresh
+    """
+    if credentials.expiry is None:
+        # tokens without an expiry never need a refresh, look again later
+        return REFRESH_MARGIN_SECONDS
+
+    # google.auth keeps expiry as a naive utc datetime
+    remaining = (credentials.expiry - datetime.datetime.utcnow()).total_seconds()
+    return remaining - REFRESH_MARGIN_SECONDS
+
+
+def _refresh_loop():
+    """
+    _refresh_loop runs on the daemon refresh thread, refreshing each cached token
+    REFRESH_MARGIN_SECONDS before it expires
+    """
+    request = Request()
+    while True:
+        with _credentials_lock:
+            credentials_list = [cached[0] for cached in _credentials_cache.values()]
+
+        sleep_seconds = REFRESH_MARGIN_SECONDS
+        for credentials in credentials_list:
+            wait = _seconds_until_refresh(credentials)
+            if wait <= 0:
+                try:
+                    credentials.refresh(request)
+                    wait = _seconds_until_refresh(credentials)
+                except Exception as e:
+                    # leave the old token in place, google.auth will refresh inline if it really expires
+                    print('ERROR (authTools refresh): ' + str(e))
+                    wait = 30
+            sleep_seconds = min(sleep_seconds, max(wait, 1))
+
+        time.sleep(sleep_seconds)
+
+
+def _start_refresh_thread():
+    """
+    _start_refresh_thread starts the daemon refresh thread once per process, caller holds _credentials_lock
+    """
+    global _refresh_thread
+    if _refresh_thread is None or not _refresh_thread.is_alive():
+        _refresh_thread = threading.Thread(target=_refresh_loop, name='authTools-refresh')
+        _refresh_thread.daemon = True
+        _refresh_thread.start()
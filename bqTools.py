@@ -14,6 +14,8 @@ Install list:
     sudo pip install --upgrade google-cloud-bigquery
     sudo pip install --upgrade google-datalab-bigquery
     sudo pip install --upgrade google-cloud-storage
+    sudo pip install --upgrade futures  (python 2 only, for concurrent.futures)
+    sudo pip install --upgrade google-cloud-bigquery-storage pyarrow  (optional, Storage Read API + validation)
     Please set GOOGLE_APPLICATION_CREDENTIALS or explicitly
     create credential and re-run the application.
     For more information, please see
@@ -25,27 +27,448 @@ Install list:
 from pandas.io import gbq
 import json
 import re
-import google.auth
+import authTools
+import gsTools
+import compressTools
 from subprocess import call
 from google.cloud import bigquery
 from google.cloud.exceptions import NotFound
 from google.cloud.bigquery import LoadJobConfig
 from google.cloud.bigquery import Table
-from google.cloud import storage
 import pandas as pd
 import datetime
+import time
+import collections
+import threading
+import os
+import glob
+import fnmatch
+import gzip
+import shutil
+import hashlib
+import uuid
+import tempfile
+import multiprocessing
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from google.auth.transport.requests import AuthorizedSession
+
+try:
+    from urllib.parse import quote as url_quote
+except ImportError:
+    from urllib import quote as url_quote
+
+# the Storage Read API and arrow are only needed by the streaming read functions
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.csv as pacsv
+    import pyarrow.compute as pc
+    import numpy as np
+    from google.cloud import bigquery_storage
+except ImportError:
+    pa = None
+    pq = None
+    pacsv = None
+    pc = None
+    np = None
+    bigquery_storage = None
+
+# ------------------------------------------------------------------
+# client functions
+# ------------------------------------------------------------------
+
+# every function below used to build its own bigquery.Client, which meant a new
+# auth handshake and http session per call - clients now come from this registry,
+# keyed by (project, credentials), and are shared by every thread in the process
+_client_registry = {}
+_read_client_registry = {}
+_client_registry_lock = threading.Lock()
+
+# max keep-alive connections per client, raise it if many threads share a client
+HTTP_POOL_MAXSIZE = 32
+
+
+def get_client(project=None, credentials=None, client=None):
+    """
+    get_client returns the shared bigquery client for a project/credentials pair,
+    the first call builds the client plus a keep-alive http connection pool and every
+    later call (from any thread) gets the same warm client back
+
+    Args:
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       credentials (google.auth.credentials.Credentials, optional):  if null the cached authTools credentials are used
+       client (bigquery.Client, optional):  if passed in it is simply handed back, handy inside the functions below
+
+    Returns:
+        A bigquery.Client object.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    if client is not None:
+        return client
+
+    key = (project, credentials)
+    try:
+        with _client_registry_lock:
+            bigquery_client = _client_registry.get(key)
+            if bigquery_client is None:
+                if credentials is None:
+                    credentials, project_id = authTools.get_credentials()
+                else:
+                    project_id = None
+
+                http = AuthorizedSession(credentials)
+                adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_MAXSIZE,
+                                                        pool_maxsize=HTTP_POOL_MAXSIZE)
+                http.mount('https://', adapter)
+
+                bigquery_client = bigquery.Client(project=(project or project_id), credentials=credentials,
+                                                  _http=http)
+                _client_registry[key] = bigquery_client
+
+        return bigquery_client
+
+    except Exception as e:
+        errorStr = 'ERROR (get_client): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def close_clients():
+    """
+    close_clients closes the http sessions of every pooled client and empties the registry,
+    call it before forking worker processes or at the end of a long running job
+
+    Args:
+       No inbound arguments.
+
+    Returns:
+        The number of clients closed.
+
+    Raises:
+       No exceptions raised.
+    """
+    with _client_registry_lock:
+        n = len(_client_registry)
+        for bigquery_client in _client_registry.values():
+            bigquery_client._http.close()
+        _client_registry.clear()
+        _read_client_registry.clear()
+
+    return n
+
+
+# the pooled clients hold the cached credentials, drop them when authTools.clear_credentials runs
+authTools.on_clear_credentials(close_clients)
+
+
+def get_read_client(bigquery_client):
+    """
+    get_read_client returns the shared BigQuery Storage Read API client that goes with a bigquery client,
+    it uses the same credentials so there is no second credential lookup
+
+    Args:
+       bigquery_client (bigquery.Client, required):  a client from get_client
+
+    Returns:
+        A bigquery_storage.BigQueryReadClient object.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        if bigquery_storage is None:
+            raise ImportError('the Storage Read API needs google-cloud-bigquery-storage and pyarrow installed')
+
+        with _client_registry_lock:
+            read_client = _read_client_registry.get(bigquery_client)
+            if read_client is None:
+                read_client = bigquery_storage.BigQueryReadClient(credentials=bigquery_client._credentials)
+                _read_client_registry[bigquery_client] = read_client
+
+        return read_client
+
+    except Exception as e:
+        errorStr = 'ERROR (get_read_client): ' + str(e)
+        print(errorStr)
+        raise
+
+
+# ------------------------------------------------------------------
+# metadata cache functions
+# ------------------------------------------------------------------
+
+# get_table/get_dataset results (None when not found) keyed by (project, dataset_name, table_name),
+# table_name is None for datasets - the functions that create, change or drop tables invalidate their entries
+# set METADATA_CACHE_TTL_SECONDS to 0 to turn the cache off
+METADATA_CACHE_TTL_SECONDS = 300
+METADATA_CACHE_MAXSIZE = 4096
+_metadata_cache = collections.OrderedDict()
+_metadata_cache_lock = threading.Lock()
+
+
+def _metadata_cache_get(key):
+    """
+    _metadata_cache_get returns (True, value) for a live cache entry, (False, None) on a miss or expired entry
+    """
+    with _metadata_cache_lock:
+        entry = _metadata_cache.pop(key, None)
+        if entry is None:
+            return False, None
+
+        expires_at, value = entry
+        if expires_at < time.time():
+            return False, None
+
+        # re-insert so the entry moves to the most recently used end
+        _metadata_cache[key] = entry
+        return True, value
+
+
+def _metadata_cache_put(key, value):
+    """
+    _metadata_cache_put stores a value, evicting the least recently used entries past METADATA_CACHE_MAXSIZE
+    """
+    if METADATA_CACHE_TTL_SECONDS <= 0:
+        return
+
+    with _metadata_cache_lock:
+        _metadata_cache.pop(key, None)
+        _metadata_cache[key] = (time.time() + METADATA_CACHE_TTL_SECONDS, value)
+        while len(_metadata_cache) > METADATA_CACHE_MAXSIZE:
+            _metadata_cache.popitem(last=False)
+
+
+def invalidate_metadata_cache(project=None, dataset_name=None, table_name=None):
+    """
+    invalidate_metadata_cache drops cached table/dataset metadata,
+    with no arguments the whole cache is cleared, with dataset_name only the dataset and all of its tables
+
+    Args:
+       project (str, optional):  only drop entries for this project, if null entries for every project are dropped
+       dataset_name (str, optional):  The bq dataset name string, sometimes called id though not numeric.
+       table_name (str, optional):  The bq table name, requires dataset_name.
+
+    Returns:
+        The number of entries dropped.
+
+    Raises:
+       No exceptions raised.
+    """
+    with _metadata_cache_lock:
+        if dataset_name is None:
+            drop_keys = [key for key in _metadata_cache if project is None or key[0] == project]
+        elif table_name is None:
+            drop_keys = [key for key in _metadata_cache
+                         if key[1] == dataset_name and (project is None or key[0] == project)]
+        else:
+            drop_keys = [key for key in _metadata_cache
+                         if key[1:] == (dataset_name, table_name) and (project is None or key[0] == project)]
+
+        for key in drop_keys:
+            del _metadata_cache[key]
+
+    return len(drop_keys)
+
+
+def _get_dataset_cached(bigquery_client, dataset_name):
+    """
+    _get_dataset_cached returns the bigquery Dataset, or None if it does not exist, from the metadata cache
+    """
+    key = (bigquery_client.project, dataset_name, None)
+    hit, dataset = _metadata_cache_get(key)
+    if not hit:
+        try:
+            dataset = bigquery_client.get_dataset(bigquery_client.dataset(dataset_name))
+        except NotFound:
+            dataset = None
+        _metadata_cache_put(key, dataset)
+
+    return dataset
+
+
+def _get_table_cached(bigquery_client, dataset_name, table_name, not_found_ok=False):
+    """
+    _get_table_cached returns the bigquery Table from the metadata cache,
+    a missing table raises NotFound like get_table does, unless not_found_ok is set and then None is returned
+    """
+    key = (bigquery_client.project, dataset_name, table_name)
+    hit, table = _metadata_cache_get(key)
+    if not hit:
+        try:
+            table = bigquery_client.get_table(bigquery_client.dataset(dataset_name).table(table_name))
+        except NotFound:
+            table = None
+        _metadata_cache_put(key, table)
+
+    if table is None and not not_found_ok:
+        raise NotFound('Table {}:{}.{} not found'.format(bigquery_client.project, dataset_name, table_name))
+
+    return table
+
+
+# ------------------------------------------------------------------
+# job functions
+# ------------------------------------------------------------------
+
+# how often as_completed polls the running jobs, it backs off from the first value to the second
+JOB_POLL_SECONDS = (0.5, 5.0)
+
+
+class JobHandle(object):
+    """
+    JobHandle is what the submit_* functions hand back - a bq job that is already running,
+    plus the code that builds the usual output dictionary once the job is done
+        py> handles = [bqTools.submit_create_table_as_select('my_dataset', t, sql) for t, sql in ctas_list]
+        py> results = bqTools.wait_all(handles)
+
+    Attributes:
+        job:  the google.cloud.bigquery job object
+        job_id:  the bq job id
+    """
+
+    def __init__(self, job, on_done):
+        self.job = job
+        self.job_id = job.job_id
+        self._on_done = on_done
+        self._output_dict = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'JobHandle({} {})'.format(self.job.job_type, self.job_id)
+
+    def done(self):
+        """
+        done returns True once the job has finished (ok or not), it refreshes the job state from bq
+        """
+        return self.job.done()
+
+    def status(self):
+        """
+        status returns the bq job state string, PENDING, RUNNING or DONE
+        """
+        self.job.reload()
+        return self.job.state
+
+    def stats(self):
+        """
+        stats returns the job statistics dictionary bq keeps for the job (timings, bytes, rows...)
+        """
+        return self.job._properties.get('statistics', {})
+
+    def wait(self, timeout=None):
+        """
+        wait blocks until the job is finished and returns the same dictionary the blocking function returns,
+        a failed job raises its error here
+        """
+        self.job.result(timeout=timeout)
+        with self._lock:
+            if self._output_dict is None:
+                self._output_dict = self._on_done(self.job)
+
+        return self._output_dict
+
+
+def as_completed(handles, timeout=None):
+    """
+    as_completed yields the job handles as their jobs finish, like concurrent.futures.as_completed
+
+    Args:
+       handles (list, required):  JobHandle objects from the submit_* functions
+       timeout (float, optional):  seconds to wait in total, if null wait forever
+
+    Returns:
+        A generator of JobHandle objects in completion order.
+
+    Raises:
+       Standard errors are printed to stdout and raised, a timeout raises concurrent.futures.TimeoutError.
+    """
+    try:
+        pending = list(handles)
+        deadline = None if timeout is None else time.time() + timeout
+        poll_seconds = JOB_POLL_SECONDS[0]
+        while pending:
+            still_pending = []
+            for handle in pending:
+                if handle.done():
+                    yield handle
+                else:
+                    still_pending.append(handle)
+
+            pending = still_pending
+            if pending:
+                # the jobs were just polled, so only now is it a timeout - and the last sleep is cut
+                # short at the deadline so a job finishing in it is still polled once more
+                sleep_seconds = poll_seconds
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise FuturesTimeoutError('{} jobs still running'.format(len(pending)))
+                    sleep_seconds = min(sleep_seconds, remaining)
+                time.sleep(sleep_seconds)
+                poll_seconds = min(poll_seconds * 2, JOB_POLL_SECONDS[1])
+
+    except Exception as e:
+        errorStr = 'ERROR (as_completed): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def wait_all(handles, timeout=None, raise_errors=True):
+    """
+    wait_all waits for every job handle and returns their output dictionaries, in the order passed in
+
+    Args:
+       handles (list, required):  JobHandle objects from the submit_* functions
+       timeout (float, optional):  seconds to wait in total, if null wait forever
+       raise_errors (boolean, default True):  raise the first job error, if False a failed job gets
+            {"job_id": ..., "status": "error", "msg": ...} in its place and the others still come back
+
+    Returns:
+        A list of dictionary objects containing information about each process.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        output_list = [None] * len(handles)
+        positions = dict((id(handle), i) for i, handle in enumerate(handles))
+        for handle in as_completed(handles, timeout=timeout):
+            try:
+                output_dict = handle.wait()
+            except Exception as e:
+                if raise_errors:
+                    raise
+                output_dict = {
+                    "job_id": handle.job_id,
+                    "status": "error",
+                    "msg": 'ERROR (wait_all): ' + str(e)
+                }
+            output_list[positions[id(handle)]] = output_dict
+
+        return output_list
+
+    except Exception as e:
+        errorStr = 'ERROR (wait_all): ' + str(e)
+        print(errorStr)
+        raise
+
 
 # ------------------------------------------------------------------
 # project functions
 # ------------------------------------------------------------------
 
 
-def print_project_names():
+def print_project_names(client=None):
     """
     print_project_names prints a list of projects your account has access to stdout
 
     Args:
-       No inbound arguments.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         Nothing returned.
@@ -54,7 +477,7 @@ def print_project_names():
        No exceptions raised.
 
     """
-    bigquery_client = bigquery.Client()
+    bigquery_client = get_client(client=client)
     for project in bigquery_client.list_projects():
         print(project.project_id)
 
@@ -63,13 +486,14 @@ def print_project_names():
 # dataset functions
 # ------------------------------------------------------------------
 
-def dataset_exists(dataset_name, project=None):
+def dataset_exists(dataset_name, project=None, client=None):
     """
     dataset_exists returns a True/False, depending on if the bq dataset exists in the project
 
     Args:
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         True:  when the dataset exists
@@ -80,21 +504,20 @@ def dataset_exists(dataset_name, project=None):
 
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
-        dataset_ref = bigquery_client.dataset(dataset_name)
-        bigquery_client.get_dataset(dataset_ref)
-        return True
+        bigquery_client = get_client(project, client=client)
+        return _get_dataset_cached(bigquery_client, dataset_name) is not None
     except NotFound:
         return False
 
 
-def create_dataset(dataset_name, project=None):
+def create_dataset(dataset_name, project=None, client=None):
     """
     create_dataset creates a bq dataset, if already exists it will tell you
 
     Args:
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         A dictionary object containing information about the process
@@ -105,13 +528,14 @@ def create_dataset(dataset_name, project=None):
     """
     try:
 
-        bigquery_client = bigquery.Client(project=project)
-        if dataset_exists(dataset_name, project) is True:
+        bigquery_client = get_client(project, client=client)
+        if dataset_exists(dataset_name, project, client=bigquery_client) is True:
             returnMsg = 'Existing dataset {}.'.format(dataset_name)
             return returnMsg
 
         dataset_ref = bigquery_client.dataset(dataset_name)
         bigquery_client.create_dataset(bigquery.Dataset(dataset_ref))
+        invalidate_metadata_cache(bigquery_client.project, dataset_name)
 
         output_dict = {
             "dataset_name": dataset_name,
@@ -127,13 +551,14 @@ def create_dataset(dataset_name, project=None):
         raise
 
 
-def print_dataset_names(project=None):
+def print_dataset_names(project=None, client=None):
     """
     print_dataset_names prints to stdout all datasets in a given project.
     If no project is specified, then the currently active project is used.
     
     Args:
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         None.
@@ -141,12 +566,12 @@ def print_dataset_names(project=None):
     Raises:
        None.
     """
-    bigquery_client = bigquery.Client(project=project)
+    bigquery_client = get_client(project, client=client)
     for dataset in bigquery_client.list_datasets():
         print(dataset.dataset_id)
 
 
-def delete_dataset(dataset_name, project=None):
+def delete_dataset(dataset_name, project=None, client=None):
     """
     delete_dataset will drop a dataset.
     Note:  I haven't tried to drop one with tables in it, #todo test that".
@@ -154,6 +579,7 @@ def delete_dataset(dataset_name, project=None):
     Args:
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         A dictionary object containing information about the process.
@@ -162,11 +588,12 @@ def delete_dataset(dataset_name, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
+        bigquery_client = get_client(project, client=client)
         dataset_ref = bigquery_client.dataset(dataset_name)
-        if dataset_exists(dataset_name, project=project):
+        if dataset_exists(dataset_name, project=project, client=bigquery_client):
             dataset_ref = bigquery_client.get_dataset(dataset_ref)
             bigquery_client.delete_dataset(dataset_ref)
+            invalidate_metadata_cache(bigquery_client.project, dataset_name)
 
         output_dict = {
             "dataset_name": dataset_name,
@@ -186,7 +613,7 @@ def delete_dataset(dataset_name, project=None):
 # table functions
 # ------------------------------------------------------------------
 
-def print_table_names(dataset_name, project=None):
+def print_table_names(dataset_name, project=None, client=None):
     """
     print_table_names prints to stdout all of the tables in a given dataset.
     If no project is specified, then the currently active project is used.
@@ -194,6 +621,7 @@ def print_table_names(dataset_name, project=None):
     Args:
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         A string containg a simple message.
@@ -202,7 +630,7 @@ def print_table_names(dataset_name, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
+        bigquery_client = get_client(project, client=client)
         dataset_ref = bigquery_client.dataset(dataset_name)
 
         for table in bigquery_client.list_dataset_tables(dataset_ref):
@@ -218,7 +646,7 @@ def print_table_names(dataset_name, project=None):
         raise
 
 
-def table_exists(dataset_name, table_name, project=None):
+def table_exists(dataset_name, table_name, project=None, client=None):
     """
     table_exists returns a True/False - does the table or VIEW live in this dataset?
     
@@ -226,6 +654,7 @@ def table_exists(dataset_name, table_name, project=None):
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
        table_name (str, required):  The bq table name, need to test if CaSe SENsitIVE.
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         True:  when the object exists.
@@ -235,14 +664,10 @@ def table_exists(dataset_name, table_name, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
-        dataset_ref = bigquery_client.dataset(dataset_name)
-
-        for table in bigquery_client.list_dataset_tables(dataset_ref):
-            if table.table_id == table_name:
-                return True
+        bigquery_client = get_client(project, client=client)
+        table = _get_table_cached(bigquery_client, dataset_name, table_name, not_found_ok=True)
 
-        return False
+        return table is not None
 
     except Exception as e:
         errorStr = 'ERROR (table_exists): ' + str(e)
@@ -250,7 +675,56 @@ def table_exists(dataset_name, table_name, project=None):
         raise
 
 
-def create_empty_table(dataset_name, table_name, schema=None, project=None):
+def _apply_partitioning(target, time_partitioning=None, range_partitioning=None, clustering_fields=None,
+                        partition_expiration_days=None):
+    """
+    _apply_partitioning sets the partitioning and clustering arguments (see create_empty_table) on a
+    bigquery.Table, LoadJobConfig or QueryJobConfig - they all take the same three attributes
+    """
+    if time_partitioning and range_partitioning:
+        raise ValueError('use time_partitioning or range_partitioning, not both')
+
+    if time_partitioning:
+        if time_partitioning is True:
+            spec = {}
+        elif isinstance(time_partitioning, dict):
+            spec = time_partitioning
+        else:
+            spec = {"field": time_partitioning}
+        expiration_ms = int(partition_expiration_days * 86400000) if partition_expiration_days else None
+        target.time_partitioning = bigquery.TimePartitioning(type_=spec.get("type", "DAY"), field=spec.get("field"),
+                                                             expiration_ms=expiration_ms)
+    elif partition_expiration_days:
+        raise ValueError('partition_expiration_days needs time_partitioning')
+
+    if range_partitioning:
+        target.range_partitioning = bigquery.RangePartitioning(
+            field=range_partitioning["field"],
+            range_=bigquery.PartitionRange(start=range_partitioning["start"], end=range_partitioning["end"],
+                                           interval=range_partitioning["interval"]))
+
+    if clustering_fields:
+        if not isinstance(clustering_fields, (list, tuple)):
+            clustering_fields = [c.strip() for c in clustering_fields.split(',')]
+        target.clustering_fields = list(clustering_fields)
+
+    return target
+
+
+def _partition_decorator(table_name, partition):
+    """
+    _partition_decorator returns table_name$partition, a date becomes YYYYMMDD, None leaves table_name alone
+    """
+    if partition is None:
+        return table_name
+    if isinstance(partition, (datetime.date, datetime.datetime)):
+        partition = partition.strftime('%Y%m%d')
+
+    return '{}${}'.format(table_name, partition)
+
+
+def create_empty_table(dataset_name, table_name, schema=None, project=None, client=None, time_partitioning=None,
+                       range_partitioning=None, clustering_fields=None, partition_expiration_days=None):
     """
     create_empty_table creates an empty table with the provided schema, 
     note the schema format should be the same as the bq cli.
@@ -260,6 +734,13 @@ def create_empty_table(dataset_name, table_name, schema=None, project=None):
        table_name (str, required):  The bq table name, need to test if CaSe SENsitIVE.
        schema (str, optional):  The bq schema for this table, if no schema provided, it uses a dummy/sample schema.
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       time_partitioning (str, dict or True, optional):  partition by this DATE/TIMESTAMP column (daily),
+            or {"field": "event_ts", "type": "HOUR"} (DAY, HOUR, MONTH, YEAR), True is ingestion time
+       range_partitioning (dict, optional):  integer range partitioning,
+            {"field": "customer_id", "start": 0, "end": 100000, "interval": 1000}
+       clustering_fields (list, optional):  up to 4 columns to cluster by
+       partition_expiration_days (float, optional):  time partitions are dropped once they are this old
 
     Returns:
         A dictionary object containing information about the process.
@@ -268,7 +749,7 @@ def create_empty_table(dataset_name, table_name, schema=None, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
+        bigquery_client = get_client(project, client=client)
         if not schema:
             schema = """[
                      {
@@ -282,7 +763,7 @@ def create_empty_table(dataset_name, table_name, schema=None, project=None):
 
         schemaList = convert_schema(schema)
 
-        if table_exists(dataset_name, table_name, project) is True:
+        if table_exists(dataset_name, table_name, project, client=bigquery_client) is True:
             returnMsg = 'ERROR (create_empty_table) Existing Table: {}.'.format(dataset_name)
             return returnMsg
 
@@ -290,7 +771,10 @@ def create_empty_table(dataset_name, table_name, schema=None, project=None):
         table_ref = dataset_ref.table(table_name)
         # table_ref.schema = schema
         table = Table(table_ref, schema=schemaList)
+        _apply_partitioning(table, time_partitioning, range_partitioning, clustering_fields,
+                            partition_expiration_days)
         table = bigquery_client.create_table(table)
+        invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
         if table:
             table_str = "yes"
         else:
@@ -312,17 +796,29 @@ def create_empty_table(dataset_name, table_name, schema=None, project=None):
         raise
 
 
-def create_table_as_select(dataset_name, table_name, sqlQuery, project=None):
+def create_table_as_select(dataset_name, table_name, sqlQuery, project=None, client=None, max_scan_bytes=None,
+                           write_disposition='WRITE_APPEND', partition=None, time_partitioning=None,
+                           range_partitioning=None, clustering_fields=None, partition_expiration_days=None):
     """
     create_table_as_select - classic Create Table As Select (CTAS), 
-    uses CREATE_IF_NEEDED and WRITE_APPEND,
-    these two options could be added later as arguments if needed
+    uses CREATE_IF_NEEDED and WRITE_APPEND by default
 
     Args:
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
        table_name (str, required):  The bq table name, need to test if CaSe SENsitIVE.
        sqlQuery (str, required):  The sql needed to create the table
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       max_scan_bytes (int, optional):  reject the query if it would scan more, if null MAX_SCAN_BYTES is used
+       write_disposition (str, default WRITE_APPEND):  other options: WRITE_TRUNCATE WRITE_EMPTY
+       partition (str or date, optional):  write only into this partition (table$YYYYMMDD), with WRITE_TRUNCATE
+            only that partition is replaced
+       time_partitioning (str, dict or True, optional):  partition by this DATE/TIMESTAMP column (daily),
+            or {"field": "event_ts", "type": "HOUR"} (DAY, HOUR, MONTH, YEAR), True is ingestion time
+       range_partitioning (dict, optional):  integer range partitioning,
+            {"field": "customer_id", "start": 0, "end": 100000, "interval": 1000}
+       clustering_fields (list, optional):  up to 4 columns to cluster by
+       partition_expiration_days (float, optional):  time partitions are dropped once they are this old
 
     Returns:
         A dictionary object containing information about the process.
@@ -331,12 +827,43 @@ def create_table_as_select(dataset_name, table_name, sqlQuery, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
+        # Wait for the query to finish
+        return submit_create_table_as_select(dataset_name, table_name, sqlQuery, project, client=client,
+                                             max_scan_bytes=max_scan_bytes, write_disposition=write_disposition,
+                                             partition=partition, time_partitioning=time_partitioning,
+                                             range_partitioning=range_partitioning,
+                                             clustering_fields=clustering_fields,
+                                             partition_expiration_days=partition_expiration_days).wait()
+
+    except Exception as e:
+        errorStr = 'ERROR (create_table_as_select): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def submit_create_table_as_select(dataset_name, table_name, sqlQuery, project=None, client=None,
+                                  max_scan_bytes=None, write_disposition='WRITE_APPEND', partition=None,
+                                  time_partitioning=None, range_partitioning=None,
+                                  clustering_fields=None, partition_expiration_days=None):
+    """
+    submit_create_table_as_select starts a create_table_as_select job and returns without waiting for it
+
+    Args:
+       same as create_table_as_select
+
+    Returns:
+        A JobHandle, its wait() returns the create_table_as_select dictionary.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
         job_config = bigquery.QueryJobConfig()
 
-        # Set configuration.query.destinationTable
+        # Set configuration.query.destinationTable, table$partition when only one partition is written
         dataset_ref = bigquery_client.dataset(dataset_name)
-        table_ref = dataset_ref.table(table_name)
+        table_ref = dataset_ref.table(_partition_decorator(table_name, partition))
 
         job_config.destination = table_ref
 
@@ -344,27 +871,36 @@ def create_table_as_select(dataset_name, table_name, sqlQuery, project=None):
         job_config.create_disposition = 'CREATE_IF_NEEDED'
 
         # Set configuration.query.writeDisposition
-        job_config.write_disposition = 'WRITE_APPEND'
+        job_config.write_disposition = write_disposition
+
+        # only used when the query creates the table
+        _apply_partitioning(job_config, time_partitioning, range_partitioning, clustering_fields,
+                            partition_expiration_days)
+
+        # bq refuses the job up front if it would bill more than this
+        job_config.maximum_bytes_billed = _max_scan_bytes(max_scan_bytes)
 
         # Start the query
         job = bigquery_client.query(sqlQuery, job_config=job_config)
 
-        # Wait for the query to finish
-        job.result()
+        def on_done(job):
+            invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
 
-        output_dict = {
-            "dataset_name": dataset_name,
-            "table_name": table_name,
-            "sqlQuery": sqlQuery,
-            "job_id": job.job_id,
-            "status": "complete",
-            "msg": 'Created table {} .'.format(table_name)
-        }
+            output_dict = {
+                "dataset_name": dataset_name,
+                "table_name": table_name,
+                "sqlQuery": sqlQuery,
+                "job_id": job.job_id,
+                "status": "complete",
+                "msg": 'Created table {} .'.format(table_name)
+            }
 
-        return output_dict
+            return output_dict
+
+        return JobHandle(job, on_done)
 
     except Exception as e:
-        errorStr = 'ERROR (create_table_as_select): ' + str(e)
+        errorStr = 'ERROR (submit_create_table_as_select): ' + str(e)
         print(errorStr)
         raise
 
@@ -413,7 +949,8 @@ def create_table_as_select_cli(dataset_name, table_name, sqlQuery):
         raise
 
 
-def copy_table(dataset_name, source_table_name, dest_table_name, dest_dataset_name=None, project=None):
+def copy_table(dataset_name, source_table_name, dest_table_name, dest_dataset_name=None, project=None,
+               client=None):
     """
     copy_table clones the source table to the destination table within the same dataset
 
@@ -423,6 +960,7 @@ def copy_table(dataset_name, source_table_name, dest_table_name, dest_dataset_na
        dest_table_name (str, required):  The bq table name of the new destination table
        dest_dataset_name (str, optional):  the bq target destination dataset for the copy, if None then dataset_name
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         A dictionary object containing information about the process.
@@ -432,11 +970,44 @@ def copy_table(dataset_name, source_table_name, dest_table_name, dest_dataset_na
     """
     try:
 
-        bigquery_client = bigquery.Client(project=project)
-        if table_exists(dataset_name, dest_table_name, project) is True:
+        bigquery_client = get_client(project, client=client)
+        if table_exists(dataset_name, dest_table_name, project, client=bigquery_client) is True:
             returnMsg = 'ERROR (copy_table) Existing Table: {}.'.format(dataset_name)
             return returnMsg
 
+        # Waits for job to complete.
+        return submit_copy_table(dataset_name, source_table_name, dest_table_name, dest_dataset_name, project,
+                                 client=bigquery_client).wait()
+
+    except Exception as e:
+        errorStr = 'ERROR (copy_table): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def submit_copy_table(dataset_name, source_table_name, dest_table_name, dest_dataset_name=None, project=None,
+                      client=None, write_disposition=None):
+    """
+    submit_copy_table starts a copy_table job and returns without waiting for it,
+    there is no existing table check up front - the job itself fails if the destination exists
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       source_table_name (str, required):  The bq table name of the origin table
+       dest_table_name (str, required):  The bq table name of the new destination table
+       dest_dataset_name (str, optional):  the bq target destination dataset for the copy, if None then dataset_name
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       write_disposition (str, optional):  WRITE_EMPTY, WRITE_TRUNCATE or WRITE_APPEND, if null bq uses WRITE_EMPTY
+
+    Returns:
+        A JobHandle, its wait() returns the copy_table dictionary.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
         if not dest_dataset_name:
             dest_dataset_name = dataset_name
 
@@ -445,37 +1016,49 @@ def copy_table(dataset_name, source_table_name, dest_table_name, dest_dataset_na
         source_table_ref = dataset_ref.table(source_table_name)
         dest_table_ref = dest_dataset_ref.table(dest_table_name)
         job_config = bigquery.CopyJobConfig()
+        if write_disposition:
+            job_config.write_disposition = write_disposition
         copy_job = bigquery_client.copy_table(source_table_ref, dest_table_ref, job_config=job_config)
-        copy_job.result()  # Waits for job to complete.
 
-        output_dict = {
-            "dataset_name": dataset_name,
-            "source_table_name": source_table_name,
-            "dest_table_name": dest_table_name,
-            "dest_dataset_name": dest_dataset_name,
-            "job_id": copy_job.job_id,
-            "status": "complete",
-            "msg": 'copy_table: Table {} copied to {}.'.format(source_table_name, dest_table_name)
-        }
+        def on_done(copy_job):
+            invalidate_metadata_cache(bigquery_client.project, dest_dataset_name, dest_table_name)
 
-        return output_dict
+            output_dict = {
+                "dataset_name": dataset_name,
+                "source_table_name": source_table_name,
+                "dest_table_name": dest_table_name,
+                "dest_dataset_name": dest_dataset_name,
+                "job_id": copy_job.job_id,
+                "status": "complete",
+                "msg": 'copy_table: Table {} copied to {}.'.format(source_table_name, dest_table_name)
+            }
+
+            return output_dict
+
+        return JobHandle(copy_job, on_done)
 
     except Exception as e:
-        errorStr = 'ERROR (copy_table): ' + str(e)
+        errorStr = 'ERROR (submit_copy_table): ' + str(e)
         print(errorStr)
         raise
 
 
-def drop_table(dataset_name, table_name, project=None):
+def copy_tables(dataset_name, source_table_names, dest_table_name, dest_dataset_name=None,
+                write_disposition='WRITE_EMPTY', project=None, client=None):
     """
-    drop_table - drops the table, whamo - good luck
-    Deletes a table in a given dataset.
-    If no project is specified, then the currently active project is used.
+    copy_tables copies several source tables into one destination table with a single multi-source copy job,
+    i.e. gathering daily shards into one table, the sources must have compatible schemas
+        py> bqTools.copy_tables('my_dataset', ['events_20240101', 'events_20240102'], 'events_2024')
 
     Args:
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
-       table_name (str, required):  The bq table name of the table to get killed
+       source_table_names (list, required):  The bq table names of the origin tables, "other_dataset.table"
+            reads from another dataset
+       dest_table_name (str, required):  The bq table name of the destination table
+       dest_dataset_name (str, optional):  the bq target destination dataset for the copy, if None then dataset_name
+       write_disposition (str, default 'WRITE_EMPTY'):  WRITE_EMPTY, WRITE_TRUNCATE or WRITE_APPEND
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         A dictionary object containing information about the process.
@@ -484,53 +1067,135 @@ def drop_table(dataset_name, table_name, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
-        dataset_ref = bigquery_client.dataset(dataset_name)
-        table_ref = dataset_ref.table(table_name)
-
-        if table_exists(dataset_name, table_name):
-            bigquery_client.delete_table(table_ref)
-            myStatus = "complete/dropped"
-        else:
-            myStatus = "complete/table-not-exists"
-
-        output_dict = {
-            "dataset_name": dataset_name,
-            "table_name": table_name,
-            "status": myStatus,
-            "msg": 'Table {}:{} delete command complete.'.format(dataset_name, table_name)
-        }
-
-        return output_dict
+        # Waits for job to complete.
+        return submit_copy_tables(dataset_name, source_table_names, dest_table_name, dest_dataset_name,
+                                  write_disposition, project, client=client).wait()
 
     except Exception as e:
-        errorStr = 'ERROR (delete_table): ' + str(e)
+        errorStr = 'ERROR (copy_tables): ' + str(e)
         print(errorStr)
         raise
 
 
-def print_table_meta(dataset_name, table_name, project=None):
+def submit_copy_tables(dataset_name, source_table_names, dest_table_name, dest_dataset_name=None,
+                       write_disposition='WRITE_EMPTY', project=None, client=None):
     """
-    print_table_meta prints to stdout the num of rows (via gcp meta), schema, and description
+    submit_copy_tables starts a copy_tables job and returns without waiting for it
 
     Args:
-       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
-       table_name (str, required):  The bq table name of the table to get the metadata for
-       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+        same as copy_tables
 
     Returns:
-        A dictionary object containing information about the process.
+        A JobHandle, its wait() returns the copy_tables dictionary.
 
     Raises:
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
-        dataset = bigquery_client.dataset(dataset_name)
-        table_ref = dataset.table(table_name)
-        table = bigquery_client.get_table(table_ref)
-        print(table.table_id)
-        print("table.table_id: " + str(table.table_id))
+        bigquery_client = get_client(project, client=client)
+        if not dest_dataset_name:
+            dest_dataset_name = dataset_name
+
+        source_table_refs = []
+        for source_table_name in source_table_names:
+            source_dataset_name, _, source_table_name = source_table_name.rpartition('.')
+            source_table_refs.append(bigquery_client.dataset(source_dataset_name or dataset_name)
+                                     .table(source_table_name))
+
+        dest_table_ref = bigquery_client.dataset(dest_dataset_name).table(dest_table_name)
+        job_config = bigquery.CopyJobConfig()
+        job_config.write_disposition = write_disposition
+        copy_job = bigquery_client.copy_table(source_table_refs, dest_table_ref, job_config=job_config)
+
+        def on_done(copy_job):
+            invalidate_metadata_cache(bigquery_client.project, dest_dataset_name, dest_table_name)
+
+            output_dict = {
+                "dataset_name": dataset_name,
+                "source_table_names": list(source_table_names),
+                "dest_table_name": dest_table_name,
+                "dest_dataset_name": dest_dataset_name,
+                "job_id": copy_job.job_id,
+                "status": "complete",
+                "msg": 'copy_tables: {} tables copied to {}.'.format(len(source_table_refs), dest_table_name)
+            }
+
+            return output_dict
+
+        return JobHandle(copy_job, on_done)
+
+    except Exception as e:
+        errorStr = 'ERROR (submit_copy_tables): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def drop_table(dataset_name, table_name, project=None, client=None):
+    """
+    drop_table - drops the table, whamo - good luck
+    Deletes a table in a given dataset.
+    If no project is specified, then the currently active project is used.
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_name (str, required):  The bq table name of the table to get killed
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary object containing information about the process.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        dataset_ref = bigquery_client.dataset(dataset_name)
+        table_ref = dataset_ref.table(table_name)
+
+        if table_exists(dataset_name, table_name, project, client=bigquery_client):
+            bigquery_client.delete_table(table_ref)
+            invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
+            myStatus = "complete/dropped"
+        else:
+            myStatus = "complete/table-not-exists"
+
+        output_dict = {
+            "dataset_name": dataset_name,
+            "table_name": table_name,
+            "status": myStatus,
+            "msg": 'Table {}:{} delete command complete.'.format(dataset_name, table_name)
+        }
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (delete_table): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def print_table_meta(dataset_name, table_name, project=None, client=None):
+    """
+    print_table_meta prints to stdout the num of rows (via gcp meta), schema, and description
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_name (str, required):  The bq table name of the table to get the metadata for
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary object containing information about the process.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        table = _get_table_cached(bigquery_client, dataset_name, table_name)
+        print(table.table_id)
+        print("table.table_id: " + str(table.table_id))
         print("table.description: " + str(table.description))
         print("table.num_rows: " + str(table.num_rows))
         print("table.schema: " + str(table.schema))
@@ -552,17 +1217,20 @@ def print_table_meta(dataset_name, table_name, project=None):
         raise
 
 
-def rename_table(dataset_name, table_name, new_table_name, project=None):
+def rename_table(dataset_name, table_name, new_table_name, project=None, client=None):
     """
     rename_table renames a table within the same dataset,
-    to do this it copies and then removes the original, not pretty but there is no 
-    rename function in bq at this time
+    tables are renamed with an ALTER TABLE ... RENAME TO ddl, a metadata-only change that takes
+    the same time whatever the table size, anything the ddl can not rename (views, external tables,
+    a table with rows still in the streaming buffer) falls back to copy_table and then drop_table,
+    "rename_path" in the result says which one was used
 
     Args:
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
        table_name (str, required):  The bq table name of the table to get renamed
        new_table_name (str, required):  The *NEW* bq table name
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         A dictionary object containing information about the process.
@@ -571,16 +1239,59 @@ def rename_table(dataset_name, table_name, new_table_name, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        if table_exists(dataset_name, new_table_name, project) is True:
+        bigquery_client = get_client(project, client=client)
+        if table_exists(dataset_name, new_table_name, project, client=bigquery_client) is True:
             returnMsg = 'ERROR (rename_table) new_table_name exists: {}.'.format(new_table_name)
             return returnMsg
 
-        if table_exists(dataset_name, table_name, project) is False:
+        table = _get_table_cached(bigquery_client, dataset_name, table_name, not_found_ok=True)
+        if table is None:
             returnMsg = 'ERROR (rename_table) table_name does not exist: {}.'.format(table_name)
             return returnMsg
 
-        copyResult = copy_table(dataset_name, table_name, new_table_name, project)
-        dropResult = drop_table(dataset_name, table_name, project)
+        ddl_error = None
+        if table.table_type == 'TABLE':
+            renameQuery = 'ALTER TABLE `{}.{}.{}` RENAME TO `{}`'.format(bigquery_client.project, dataset_name,
+                                                                        table_name, new_table_name)
+            job_config = bigquery.QueryJobConfig()
+            job_config.use_legacy_sql = False
+            query_job = None
+            try:
+                query_job = bigquery_client.query(renameQuery, job_config=job_config,
+                                                  job_id_prefix="bqTools_rename_job")
+                query_job.result()  # Waits for job to complete
+            except Exception as e:
+                # i.e. rows in the streaming buffer, the copy below takes those along
+                ddl_error = str(e)
+            finally:
+                invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
+                invalidate_metadata_cache(bigquery_client.project, dataset_name, new_table_name)
+
+            # a transient error waiting on the job can come after the rename has already happened
+            renamed = ddl_error is None or (
+                table_exists(dataset_name, new_table_name, project, client=bigquery_client) is True and
+                table_exists(dataset_name, table_name, project, client=bigquery_client) is False)
+            if renamed:
+                output_dict = {
+                    "dataset_name": dataset_name,
+                    "source_table_name": table_name,
+                    "dest_table_name": new_table_name,
+                    "dest_dataset_name": dataset_name,
+                    "job_id": query_job.job_id if query_job is not None else None,
+                    "rename_table": "rename_table",
+                    "rename_path": "ALTER TABLE",
+                    "rename_status": "complete",
+                    "ddl_error": ddl_error,
+                    "status": "complete",
+                    "msg": 'rename_table: Table {} renamed to {}.'.format(table_name, new_table_name)
+                }
+
+                return output_dict
+
+            print('rename_table: ALTER TABLE failed, falling back to copy and drop: ' + ddl_error)
+
+        copyResult = copy_table(dataset_name, table_name, new_table_name, project=project, client=bigquery_client)
+        dropResult = drop_table(dataset_name, table_name, project, client=bigquery_client)
 
         if dropResult:
             dropResult_str = "yes"
@@ -590,18 +1301,20 @@ def rename_table(dataset_name, table_name, new_table_name, project=None):
         output_dict = copyResult
 
         output_dict.update({"rename_table": "rename_table"})
+        output_dict.update({"rename_path": "copy+drop"})
         output_dict.update({"rename_status": "complete"})
         output_dict.update({"dropResult_str": dropResult_str})
-        
+        output_dict.update({"ddl_error": ddl_error})
+
         return output_dict
 
     except Exception as e:
-        errorStr = 'ERROR (copy_table): ' + str(e)
+        errorStr = 'ERROR (rename_table): ' + str(e)
         print(errorStr)
         raise
 
 
-def get_table_schema(dataset_name, table_name, project=None):
+def get_table_schema(dataset_name, table_name, project=None, client=None):
     """
     get_table_schema returns an object containing the schema information for a table
 
@@ -609,6 +1322,7 @@ def get_table_schema(dataset_name, table_name, project=None):
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
        table_name (str, required):  The bq table name of the table to get the schema for
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         An object of type bigquery_client table schema (complex object).
@@ -617,10 +1331,8 @@ def get_table_schema(dataset_name, table_name, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
-        dataset = bigquery_client.dataset(dataset_name)
-        table_ref = dataset.table(table_name)
-        table = bigquery_client.get_table(table_ref)
+        bigquery_client = get_client(project, client=client)
+        table = _get_table_cached(bigquery_client, dataset_name, table_name)
         return table.schema
 
     except Exception as e:
@@ -629,55 +1341,948 @@ def get_table_schema(dataset_name, table_name, project=None):
         raise
 
 
-def get_table_columns_df(dataset_name, table_name, project=None):
+def get_table_columns_df(dataset_name, table_name, project=None, client=None):
+    """
+    get_table_columns_df returns a pandas dataframe containing the field names for a table
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_name (str, required):  The bq table name of the table to get the column list for
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A pandas dataframe containing the list of columns.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        table = _get_table_cached(bigquery_client, dataset_name, table_name)
+        field_dict = {}
+        myCount = 0
+        for field in table.schema:
+            myCount = myCount + 1
+            field_dict.update({myCount: field.name})
+
+        df = pd.DataFrame.from_dict(field_dict, 'index')
+        return df
+
+    except Exception as e:
+        errorStr = 'ERROR (get_table_columns): ' + str(e)
+        print(errorStr)
+        raise
+
+
+# ------------------------------------------------------------------
+# bulk table functions
+# ------------------------------------------------------------------
+
+# default number of threads the bulk functions fan out over
+BULK_MAX_WORKERS = 8
+
+
+def tables_exist(dataset_name, table_names, project=None, client=None):
+    """
+    tables_exist is the bulk table_exists, it lists the dataset once instead of one call per table
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_names (list, required):  The bq table (or view) names to look for.
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary of table_name: True/False.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        dataset_ref = bigquery_client.dataset(dataset_name)
+
+        existing = set(table.table_id for table in bigquery_client.list_tables(dataset_ref))
+
+        return dict((table_name, table_name in existing) for table_name in table_names)
+
+    except Exception as e:
+        errorStr = 'ERROR (tables_exist): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def describe_tables(dataset_name, table_names=None, max_workers=BULK_MAX_WORKERS, project=None, client=None):
+    """
+    describe_tables fetches the metadata of many tables concurrently (through the metadata cache)
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_names (list, optional):  The bq table names to describe, if null every table in the dataset.
+       max_workers (int, default BULK_MAX_WORKERS):  max number of get_table calls in flight
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary of table_name: dictionary object with the table metadata.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        if table_names is None:
+            dataset_ref = bigquery_client.dataset(dataset_name)
+            table_names = [table.table_id for table in bigquery_client.list_tables(dataset_ref)]
+
+        def describe_one(table_name):
+            table = _get_table_cached(bigquery_client, dataset_name, table_name, not_found_ok=True)
+            if table is None:
+                return {
+                    "dataset_name": dataset_name,
+                    "table_name": table_name,
+                    "status": "complete/table-not-exists",
+                    "msg": 'describe_tables: Table {}:{} does not exist.'.format(dataset_name, table_name)
+                }
+
+            return {
+                "dataset_name": dataset_name,
+                "table_name": table_name,
+                "table_type": str(table.table_type),
+                "num_rows": table.num_rows,
+                "num_bytes": table.num_bytes,
+                "created": table.created,
+                "modified": table.modified,
+                "description": table.description,
+                "field_names": [field.name for field in table.schema],
+                "status": "complete",
+                "msg": 'describe_tables: Table {}:{}.'.format(dataset_name, table_name)
+            }
+
+        output_dict = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for table_name, result in zip(table_names, executor.map(describe_one, table_names)):
+                output_dict[table_name] = result
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (describe_tables): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def drop_tables(dataset_name, table_names, max_workers=BULK_MAX_WORKERS, project=None, client=None):
+    """
+    drop_tables is the bulk drop_table - whamo times many, good luck
+    existence is checked with one list call, then the deletes run concurrently,
+    a failed delete is reported in its own result with status "error" and does not stop the others
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_names (list, required):  The bq table names of the tables to get killed
+       max_workers (int, default BULK_MAX_WORKERS):  max number of deletes in flight
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary of table_name: the same dictionary object drop_table returns.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        dataset_ref = bigquery_client.dataset(dataset_name)
+        exists_dict = tables_exist(dataset_name, table_names, project, client=bigquery_client)
+
+        def drop_one(table_name):
+            try:
+                if exists_dict[table_name]:
+                    bigquery_client.delete_table(dataset_ref.table(table_name))
+                    myStatus = "complete/dropped"
+                else:
+                    myStatus = "complete/table-not-exists"
+                msg = 'Table {}:{} delete command complete.'.format(dataset_name, table_name)
+            except Exception as e:
+                myStatus = "error"
+                msg = 'ERROR (drop_tables): ' + str(e)
+                print(msg)
+            finally:
+                invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
+
+            return {
+                "dataset_name": dataset_name,
+                "table_name": table_name,
+                "status": myStatus,
+                "msg": msg
+            }
+
+        output_dict = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for table_name, result in zip(table_names, executor.map(drop_one, table_names)):
+                output_dict[table_name] = result
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (drop_tables): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def clone_dataset(dataset_name, dest_dataset_name, include=None, exclude=None, max_running_jobs=BULK_MAX_WORKERS,
+                  write_disposition='WRITE_EMPTY', project=None, client=None):
+    """
+    clone_dataset copies the tables of a dataset into another dataset, the source is listed once and
+    the copy jobs run concurrently, max_running_jobs at a time, a failed copy is reported in its own result
+    with status "error" and does not stop the others, views and external tables are skipped (they have
+    no data to copy), the destination dataset is created in the source location if it does not exist
+        py> result = bqTools.clone_dataset('prod', 'prod_backup', exclude=['tmp_*'])
+        py> print(result["tables"]["orders"]["duration_seconds"])
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string of the source dataset.
+       dest_dataset_name (str, required):  The bq dataset name string of the clone.
+       include (list, optional):  table name patterns to copy (fnmatch style, i.e. "orders_*"), if null all
+       exclude (list, optional):  table name patterns not to copy, checked after include
+       max_running_jobs (int, default BULK_MAX_WORKERS):  max number of copy jobs in flight
+       write_disposition (str, default 'WRITE_EMPTY'):  WRITE_EMPTY fails tables that already exist in the clone,
+            WRITE_TRUNCATE refreshes them
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary object containing information about the process, "tables" is a dictionary of
+        table_name: dictionary object with the job id, bytes, rows and duration of each copy.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        start = time.time()
+        bigquery_client = get_client(project, client=client)
+
+        source_dataset = _get_dataset_cached(bigquery_client, dataset_name)
+        if source_dataset is None:
+            raise NotFound('Dataset {}:{} not found'.format(bigquery_client.project, dataset_name))
+        if _get_dataset_cached(bigquery_client, dest_dataset_name) is None:
+            dest_dataset = bigquery.Dataset(bigquery_client.dataset(dest_dataset_name))
+            dest_dataset.location = source_dataset.location
+            bigquery_client.create_dataset(dest_dataset)
+            invalidate_metadata_cache(bigquery_client.project, dest_dataset_name)
+
+        table_names = []
+        skipped = []
+        for table in bigquery_client.list_tables(bigquery_client.dataset(dataset_name)):
+            if include and not any(fnmatch.fnmatchcase(table.table_id, pattern) for pattern in include):
+                continue
+            if exclude and any(fnmatch.fnmatchcase(table.table_id, pattern) for pattern in exclude):
+                continue
+            if table.table_type != 'TABLE':
+                skipped.append(table.table_id)
+                continue
+            table_names.append(table.table_id)
+
+        def copy_one(table_name):
+            copy_start = time.time()
+            try:
+                copy_result = submit_copy_table(dataset_name, table_name, table_name, dest_dataset_name,
+                                                client=bigquery_client,
+                                                write_disposition=write_disposition).wait()
+                table = _get_table_cached(bigquery_client, dest_dataset_name, table_name)
+                copy_result.update({
+                    "num_bytes": table.num_bytes,
+                    "num_rows": table.num_rows,
+                })
+            except Exception as e:
+                copy_result = {
+                    "dataset_name": dataset_name,
+                    "source_table_name": table_name,
+                    "status": "error",
+                    "msg": 'ERROR (clone_dataset): ' + str(e)
+                }
+                print(copy_result["msg"])
+
+            copy_result["duration_seconds"] = round(time.time() - copy_start, 3)
+            return copy_result
+
+        tables = {}
+        with ThreadPoolExecutor(max_workers=max_running_jobs) as executor:
+            for table_name, result in zip(table_names, executor.map(copy_one, table_names)):
+                tables[table_name] = result
+
+        failed = [table_name for table_name in table_names if tables[table_name]["status"] == "error"]
+        total_bytes = sum(result.get("num_bytes") or 0 for result in tables.values())
+
+        output_dict = {
+            "dataset_name": dataset_name,
+            "dest_dataset_name": dest_dataset_name,
+            "tables": tables,
+            "skipped_tables": skipped,
+            "failed_tables": failed,
+            "total_bytes": total_bytes,
+            "elapsed_seconds": round(time.time() - start, 3),
+            "status": "complete" if not failed else "complete/with-errors",
+            "msg": 'clone_dataset: {} tables copied from {} to {}, {} failed'.format(
+                len(table_names) - len(failed), dataset_name, dest_dataset_name, len(failed))
+        }
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (clone_dataset): ' + str(e)
+        print(errorStr)
+        raise
+
+
+# ------------------------------------------------------------------
+# query functions
+# ------------------------------------------------------------------
+
+# size limit of a get_dataframe cache_dir
+RESULT_CACHE_MAX_BYTES = 10 * 1024 ** 3
+
+# process-wide scan limit in bytes for every query bqTools runs, None is no limit,
+# a max_scan_bytes argument overrides it for one call
+MAX_SCAN_BYTES = None
+
+
+def _max_scan_bytes(max_scan_bytes):
+    """
+    _max_scan_bytes returns the scan limit that applies to a call, the argument or else MAX_SCAN_BYTES
+    """
+    return max_scan_bytes if max_scan_bytes is not None else MAX_SCAN_BYTES
+
+
+def _check_scan_bytes(dry_run_job, max_scan_bytes):
+    """
+    _check_scan_bytes raises ValueError when a dry run scans more than the limit, else returns the bytes it scans
+    """
+    total_bytes_processed = dry_run_job.total_bytes_processed or 0
+    limit = _max_scan_bytes(max_scan_bytes)
+    if limit is not None and total_bytes_processed > limit:
+        raise ValueError('query would scan {} bytes, over the limit of {} bytes'.format(
+            total_bytes_processed, limit))
+
+    return total_bytes_processed
+
+
+def estimate_query(sqlQuery, dialect='standard', project=None, client=None, max_scan_bytes=None):
+    """
+    estimate_query dry-runs a query - nothing is billed and no slots are used - and reports
+    how many bytes it would scan and which tables it reads
+        py> est = bqTools.estimate_query('SELECT * FROM `my_dataset.huge_table`')
+        py> print(est["total_bytes_processed"])
+
+    Args:
+       sqlQuery (str, required):  The bq sql to be estimated.
+       dialect (str, default 'standard'):  'standard' or 'legacy' sql
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       max_scan_bytes (int, optional):  raise ValueError if the query would scan more, if null MAX_SCAN_BYTES is used
+
+    Returns:
+        A dictionary object containing information about the process.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        job_config = bigquery.QueryJobConfig()
+        job_config.dry_run = True
+        job_config.use_query_cache = False
+        job_config.use_legacy_sql = (dialect == 'legacy')
+        dry_run_job = bigquery_client.query(sqlQuery, job_config=job_config)
+
+        total_bytes_processed = _check_scan_bytes(dry_run_job, max_scan_bytes)
+        referenced_tables = ['{}.{}.{}'.format(ref.project, ref.dataset_id, ref.table_id)
+                             for ref in dry_run_job.referenced_tables]
+
+        output_dict = {
+            "sqlQuery": sqlQuery,
+            "total_bytes_processed": total_bytes_processed,
+            "total_gigabytes_processed": round(total_bytes_processed / float(1024 ** 3), 3),
+            "referenced_tables": referenced_tables,
+            "status": "complete",
+            "msg": 'estimate_query: {} bytes from {} tables'.format(total_bytes_processed, len(referenced_tables))
+        }
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (estimate_query): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def print_25_rows(dataset_name, table_name, project=None, client=None):
+    """
+    print_25_rows prints rows to stdout in the given table.
+    Will print 25 rows at most for brevity as tables can contain large amounts of rows. 
+    If no project is specified, then the currently active project is used.
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_name (str, required):  The bq table name of the table to be inspected
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary object containing information about the process.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        # Get the table from the API (or the metadata cache) so that the schema is available.
+        table = _get_table_cached(bigquery_client, dataset_name, table_name)
+
+        # Load at most 25 results.
+        rows = bigquery_client.list_rows(table, max_results=25)
+
+        # Use format to create a simple table.
+        format_string = '{!s:<16} ' * len(table.schema)
+
+        # Print schema field names
+        field_names = [field.name for field in table.schema]
+        print(format_string.format(*field_names))
+
+        for row in rows:
+            print(format_string.format(*row))
+
+        returnMsg = 'print_25_rows table {} in dataset {}.'.format(table_name, dataset_name)
+        output_dict = {
+            "dataset_name": dataset_name,
+            "table_name": table_name,
+            "status": "complete",
+            "msg": returnMsg
+        }
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (print_25_rows): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def get_dataframe(sqlQuery, project=None, index_col=None, col_order=None, reauth=False,
+                  verbose=False, private_key=None, dialect='legacy', cache_dir=None,
+                  cache_max_bytes=RESULT_CACHE_MAX_BYTES, max_scan_bytes=None):
+    """
+    get_dataframe returns a pandas dataframe for a query, nice!
+    the whole result is held in memory, for multi-GB results use iter_dataframes
+
+    docs:  http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
+
+    Args:
+       sqlQuery (str, required):  The bq sql to be executed.
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       index_col (str, optional):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
+       col_order (str, optional):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
+       reauth (boolean, default False):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
+       verbose (boolean, default False):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
+       private_key (str, optional):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
+       dialect (str, default 'legacy'):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
+       cache_dir (str, optional):  turn on the local result cache in this directory, see get_result_cache_key,
+            a hit returns the cached parquet file without reading any rows from bq
+       cache_max_bytes (int, default RESULT_CACHE_MAX_BYTES):  least recently used results are removed past this size
+       max_scan_bytes (int, optional):  reject the query if it would scan more, if null MAX_SCAN_BYTES is used
+
+    Returns:
+        A pandas dataframe containing the list of columns.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        # the read_gbq requires the project_id(project name), so fetch it if none passed in
+        project = authTools.get_project(project)
+
+        cache_file = None
+        if cache_dir:
+            cache_key, dry_run_job = _result_cache_key(get_client(project), sqlQuery, dialect,
+                                                       (index_col, col_order))
+            cache_file = os.path.join(cache_dir, cache_key + '.parquet')
+            if os.path.exists(cache_file):
+                # touch it, eviction goes by modified time
+                os.utime(cache_file, None)
+                return pd.read_parquet(cache_file)
+
+            # the cache key dry run doubles as the scan limit check
+            _check_scan_bytes(dry_run_job, max_scan_bytes)
+
+        elif _max_scan_bytes(max_scan_bytes) is not None:
+            # read_gbq does not take a job config here, so the scan limit is checked with a dry run first
+            estimate_query(sqlQuery, dialect=dialect, project=project, max_scan_bytes=max_scan_bytes)
+
+        df_gbq = gbq.read_gbq(sqlQuery, project, index_col, col_order, reauth, verbose, private_key, dialect)
+
+        if cache_file:
+            _result_cache_put(df_gbq, cache_dir, cache_file, cache_max_bytes)
+
+        return df_gbq
+
+    except Exception as e:
+        errorStr = 'ERROR (get_dataframe): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def get_result_cache_key(sqlQuery, dialect='legacy', extra=None, project=None, client=None):
+    """
+    get_result_cache_key returns the get_dataframe cache key for a query, the sha256 of the
+    sql as written (only leading/trailing whitespace and a trailing ; are dropped) plus the last modified time
+    (and row count) of every table it reads,
+    the tables come from a dry run so nothing is billed and no rows move
+    note:  queries using CURRENT_DATE(), RAND() and the like are cached as if they were repeatable
+
+    Args:
+       sqlQuery (str, required):  The bq sql to be executed.
+       dialect (str, default 'legacy'):  'standard' or 'legacy' sql
+       extra (object, optional):  anything else that changes the result, its repr is part of the key
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        The key string (64 hex characters).
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        cache_key, dry_run_job = _result_cache_key(bigquery_client, sqlQuery, dialect, extra)
+        return cache_key
+
+    except Exception as e:
+        errorStr = 'ERROR (get_result_cache_key): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def _result_cache_key(bigquery_client, sqlQuery, dialect, extra):
+    """
+    _result_cache_key returns (cache key, dry run job) for get_result_cache_key and get_dataframe,
+    the dry run job is handed back so get_dataframe can check the scan limit without a second dry run
+    """
+    job_config = bigquery.QueryJobConfig()
+    job_config.dry_run = True
+    job_config.use_query_cache = False
+    job_config.use_legacy_sql = (dialect == 'legacy')
+    dry_run_job = bigquery_client.query(sqlQuery, job_config=job_config)
+
+    # whitespace inside the sql is kept, it can be part of a string literal ('a  b' is not 'a b')
+    key_parts = [sqlQuery.strip().rstrip(';').rstrip(), str(dialect), repr(extra), str(bigquery_client.project)]
+    table_refs = sorted(dry_run_job.referenced_tables,
+                        key=lambda ref: (ref.project, ref.dataset_id, ref.table_id))
+    for table_ref in table_refs:
+        # straight to bq, not the metadata cache - a stale modified time would return stale rows
+        table = bigquery_client.get_table(table_ref)
+        streaming_rows = table.streaming_buffer.estimated_rows if table.streaming_buffer else 0
+        key_parts.append('{}.{}.{}@{}/{}/{}'.format(table_ref.project, table_ref.dataset_id, table_ref.table_id,
+                                                    table.modified, table.num_rows, streaming_rows))
+
+    return hashlib.sha256('\n'.join(key_parts).encode('utf-8')).hexdigest(), dry_run_job
+
+
+def _result_cache_put(df, cache_dir, cache_file, cache_max_bytes):
+    """
+    _result_cache_put writes a result to the cache (temp file then rename, so readers never see half a file),
+    then removes the least recently used results until the cache fits in cache_max_bytes,
+    the cache is best-effort - a result that does not write (i.e. mixed-type object columns) is printed and skipped
+    """
+    tmp_file = None
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        os.close(fd)
+        df.to_parquet(tmp_file)
+        os.rename(tmp_file, cache_file)
+        tmp_file = None
+
+        cache_files = []
+        for file_name in os.listdir(cache_dir):
+            if file_name.endswith('.parquet'):
+                path = os.path.join(cache_dir, file_name)
+                file_stat = os.stat(path)
+                cache_files.append((file_stat.st_mtime, file_stat.st_size, path))
+
+        total_bytes = sum(size for mtime, size, path in cache_files)
+        for mtime, size, path in sorted(cache_files):
+            if total_bytes <= cache_max_bytes or path == cache_file:
+                break
+            os.remove(path)
+            total_bytes -= size
+
+    except Exception as e:
+        print('ERROR (_result_cache_put): result not cached: ' + str(e))
+        if tmp_file and os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def _run_query_to_destination(bigquery_client, sqlQuery, dialect='standard', max_scan_bytes=None):
+    """
+    _run_query_to_destination runs the query, waits for it and returns the job,
+    job.destination is the (anonymous) table that holds the results
+    """
+    job_config = bigquery.QueryJobConfig()
+    job_config.use_legacy_sql = (dialect == 'legacy')
+    job_config.maximum_bytes_billed = _max_scan_bytes(max_scan_bytes)
+    query_job = bigquery_client.query(sqlQuery, job_config=job_config)
+    query_job.result()
+
+    if query_job.destination is None:
+        raise ValueError('query has no result table (DDL or script?): ' + str(query_job.job_id))
+
+    return query_job
+
+
+def _create_read_session(bigquery_client, table_ref, max_stream_count=1, selected_fields=None, row_restriction=None):
+    """
+    _create_read_session opens a Storage Read API session over a table in arrow format,
+    max_stream_count=1 keeps the rows in table order (needed for ORDER BY results)
+    """
+    read_client = get_read_client(bigquery_client)
+    read_options = None
+    if selected_fields or row_restriction:
+        read_options = bigquery_storage.types.ReadSession.TableReadOptions(
+            selected_fields=list(selected_fields or []), row_restriction=(row_restriction or ''))
+
+    requested_session = bigquery_storage.types.ReadSession(
+        table='projects/{}/datasets/{}/tables/{}'.format(table_ref.project, table_ref.dataset_id,
+                                                         table_ref.table_id),
+        data_format=bigquery_storage.types.DataFormat.ARROW,
+        read_options=read_options)
+
+    return read_client.create_read_session(parent='projects/' + bigquery_client.project,
+                                           read_session=requested_session, max_stream_count=max_stream_count)
+
+
+def _iter_stream_batches(read_client, read_session, stream_name, batch_rows):
+    """
+    _iter_stream_batches yields pyarrow Tables of exactly batch_rows rows (the last one may be shorter)
+    from one read stream, holding at most batch_rows rows plus one server message in memory
+    """
+    pending = []
+    pending_rows = 0
+    for page in read_client.read_rows(stream_name).rows(read_session).pages:
+        record_batch = page.to_arrow()
+        pending.append(record_batch)
+        pending_rows += record_batch.num_rows
+
+        while pending_rows >= batch_rows:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, batch_rows)
+            rest = table.slice(batch_rows)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
+
+
+def iter_dataframes(sqlQuery, batch_rows=100000, as_arrow=False, dialect='standard', project=None, client=None,
+                    max_scan_bytes=None):
+    """
+    iter_dataframes is the streaming get_dataframe, it runs the query and then reads the result table
+    through the BigQuery Storage Read API as arrow record batches,
+    yielding one bounded-size dataframe at a time so memory stays flat however big the result is
+        py> for df in bqTools.iter_dataframes('SELECT * FROM `my_dataset.big_table`', batch_rows=500000):
+        py>     do_something(df)
+
+    Args:
+       sqlQuery (str, required):  The bq sql to be executed.
+       batch_rows (int, default 100000):  number of rows per dataframe yielded, the last one may be smaller
+       as_arrow (boolean, default False):  yield pyarrow Tables instead of pandas dataframes
+       dialect (str, default 'standard'):  'standard' or 'legacy' sql
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       max_scan_bytes (int, optional):  reject the query if it would scan more, if null MAX_SCAN_BYTES is used
+
+    Returns:
+        A generator of pandas dataframes (or pyarrow Tables), in result order.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        if bigquery_storage is None or pa is None:
+            raise ImportError('iter_dataframes needs google-cloud-bigquery-storage and pyarrow installed')
+
+        bigquery_client = get_client(project, client=client)
+        query_job = _run_query_to_destination(bigquery_client, sqlQuery, dialect, max_scan_bytes)
+        read_session = _create_read_session(bigquery_client, query_job.destination, max_stream_count=1)
+
+        # an empty result comes back with no streams at all
+        read_client = get_read_client(bigquery_client)
+        for stream in read_session.streams:
+            for table in _iter_stream_batches(read_client, read_session, stream.name, batch_rows):
+                if as_arrow:
+                    yield table
+                else:
+                    yield table.to_pandas()
+
+    except Exception as e:
+        errorStr = 'ERROR (iter_dataframes): ' + str(e)
+        print(errorStr)
+        raise
+
+
+# read client of a get_dataframe_parallel worker process, built on its first stream
+_worker_read_client = None
+
+
+def _check_worker_credentials(bigquery_client):
     """
-    get_table_columns_df returns a pandas dataframe containing the field names for a table
+    _check_worker_credentials raises ValueError when bigquery_client does not use the authTools default
+    credentials - the worker processes build their read client from those (credentials with a private key
+    do not pickle), so a client with other credentials would read as another identity
+    """
+    credentials, project_id = authTools.get_credentials()
+    if bigquery_client._credentials is not credentials:
+        raise ValueError('the worker processes read with the default authTools credentials, '
+                         'the client passed in uses other credentials')
+
+
+def _read_stream_worker(session_bytes, stream_name, parquet_file=None):
+    """
+    _read_stream_worker runs in a worker process, it reads and decodes one read stream,
+    returning a pyarrow Table, or writing the stream to parquet_file page by page and returning the row count
+    """
+    global _worker_read_client
+    if _worker_read_client is None:
+        credentials, project_id = authTools.get_credentials()
+        _worker_read_client = bigquery_storage.BigQueryReadClient(credentials=credentials)
+
+    read_session = bigquery_storage.types.ReadSession.deserialize(session_bytes)
+    rows = _worker_read_client.read_rows(stream_name).rows(read_session)
+    if parquet_file is None:
+        return rows.to_arrow()
+
+    writer = None
+    n = 0
+    for page in rows.pages:
+        record_batch = page.to_arrow()
+        if writer is None:
+            writer = pq.ParquetWriter(parquet_file, record_batch.schema)
+        writer.write_table(pa.Table.from_batches([record_batch]))
+        n += record_batch.num_rows
+
+    if writer is not None:
+        writer.close()
+
+    return n
+
+
+def get_dataframe_parallel(sqlQuery=None, dataset_name=None, table_name=None, max_streams=None, processes=None,
+                           parquet_path=None, as_arrow=False, dialect='standard', project=None, client=None,
+                           max_scan_bytes=None):
+    """
+    get_dataframe_parallel pulls a query result (or a whole table) through several Storage Read API streams
+    at once, decoding them in parallel across a process pool, then either reassembles one dataframe
+    or writes one parquet file per stream under parquet_path
+    note:  rows come back grouped by stream, so ORDER BY is not kept - use iter_dataframes if you need it
+        py> df = bqTools.get_dataframe_parallel('SELECT * FROM `my_dataset.big_table`', max_streams=16)
+        py> bqTools.get_dataframe_parallel(dataset_name='my_dataset', table_name='big_table',
+                                           parquet_path='/data/big_table')
 
     Args:
-       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
-       table_name (str, required):  The bq table name of the table to get the column list for
+       sqlQuery (str, optional):  The bq sql to be executed, leave null to read dataset_name.table_name instead
+       dataset_name (str, optional):  The bq dataset name string, used with table_name when there is no sqlQuery.
+       table_name (str, optional):  The bq table name of the table to be read
+       max_streams (int, optional):  number of read streams to ask for, if null the number of cpus,
+            bq may hand back fewer for small results
+       processes (int, optional):  size of the process pool, if null max_streams
+       parquet_path (str, optional):  local directory to write part-NNNNN.parquet files to instead of returning data
+       as_arrow (boolean, default False):  return a pyarrow Table instead of a pandas dataframe
+       dialect (str, default 'standard'):  'standard' or 'legacy' sql
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool,
+            it has to use the default credentials, the worker processes read with those
+       max_scan_bytes (int, optional):  reject the query if it would scan more, if null MAX_SCAN_BYTES is used
 
     Returns:
-        A pandas dataframe containing the list of columns.
+        A pandas dataframe (or pyarrow Table), or when parquet_path is set
+        a dictionary object containing information about the process.
 
     Raises:
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
-        dataset = bigquery_client.dataset(dataset_name)
-        table_ref = dataset.table(table_name)
-        table = bigquery_client.get_table(table_ref)
-        field_dict = {}
-        myCount = 0
-        for field in table.schema:
-            myCount = myCount + 1
-            field_dict.update({myCount: field.name})
+        if bigquery_storage is None or pa is None:
+            raise ImportError('get_dataframe_parallel needs google-cloud-bigquery-storage and pyarrow installed')
 
-        df = pd.DataFrame.from_dict(field_dict, 'index')
-        return df
+        bigquery_client = get_client(project, client=client)
+        _check_worker_credentials(bigquery_client)
+        if sqlQuery:
+            table_ref = _run_query_to_destination(bigquery_client, sqlQuery, dialect, max_scan_bytes).destination
+        else:
+            table_ref = bigquery_client.dataset(dataset_name).table(table_name)
+
+        max_streams = max_streams or multiprocessing.cpu_count()
+        read_session = _create_read_session(bigquery_client, table_ref, max_stream_count=max_streams)
+        stream_names = [stream.name for stream in read_session.streams]
+        session_bytes = bigquery_storage.types.ReadSession.serialize(read_session)
+
+        parquet_files = [None] * len(stream_names)
+        if parquet_path:
+            if not os.path.isdir(parquet_path):
+                os.makedirs(parquet_path)
+            parquet_files = [os.path.join(parquet_path, 'part-{:05d}.parquet'.format(i))
+                             for i in range(len(stream_names))]
+
+        results = []
+        if stream_names:
+            # spawn, not fork - the grpc channel opened above must not be copied into the workers
+            with ProcessPoolExecutor(max_workers=(processes or len(stream_names)),
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                results = list(executor.map(_read_stream_worker, [session_bytes] * len(stream_names),
+                                            stream_names, parquet_files))
+
+        if parquet_path:
+            output_dict = {
+                "table": '{}.{}.{}'.format(table_ref.project, table_ref.dataset_id, table_ref.table_id),
+                "parquet_path": parquet_path,
+                "parquet_files": [f for f, n in zip(parquet_files, results) if n],
+                "streams": len(stream_names),
+                "outputRows": sum(results),
+                "status": "complete",
+                "msg": 'get_dataframe_parallel: wrote {} rows to {}'.format(sum(results), parquet_path)
+            }
+            return output_dict
+
+        if results:
+            table = pa.concat_tables(results)
+        else:
+            # an empty result comes back with no streams, build an empty table from the session schema
+            schema = pa.ipc.read_schema(pa.py_buffer(read_session.arrow_schema.serialized_schema))
+            table = schema.empty_table()
+
+        if as_arrow:
+            return table
+
+        return table.to_pandas()
 
     except Exception as e:
-        errorStr = 'ERROR (get_table_columns): ' + str(e)
+        errorStr = 'ERROR (get_dataframe_parallel): ' + str(e)
         print(errorStr)
         raise
 
-# ------------------------------------------------------------------
-# query functions
-# ------------------------------------------------------------------
+
+def _hive_partition_dir(partition_cols, values):
+    """
+    _hive_partition_dir returns the col=value/col=value path of one partition, null values go to
+    __HIVE_DEFAULT_PARTITION__ the way hive and spark write them
+    """
+    parts = []
+    for col, value in zip(partition_cols, values):
+        value = '__HIVE_DEFAULT_PARTITION__' if value is None else url_quote(str(value), safe='')
+        parts.append('{}={}'.format(col, value))
+
+    return os.path.join(*parts)
 
 
-def print_25_rows(dataset_name, table_name, project=None):
+def _read_stream_to_parquet_dataset(session_bytes, stream_name, part_index, local_path, partition_cols=None,
+                                    row_group_rows=250000, compression='snappy'):
     """
-    print_25_rows prints rows to stdout in the given table.
-    Will print 25 rows at most for brevity as tables can contain large amounts of rows. 
-    If no project is specified, then the currently active project is used.
+    _read_stream_to_parquet_dataset runs in a worker process, it writes one read stream under local_path,
+    as part-NNNNN.parquet or, with partition_cols, one part-NNNNN.parquet in each hive partition folder,
+    at most row_group_rows rows of the stream are in memory at a time
+    returns (rows written, files written)
+    """
+    global _worker_read_client
+    if _worker_read_client is None:
+        credentials, project_id = authTools.get_credentials()
+        _worker_read_client = bigquery_storage.BigQueryReadClient(credentials=credentials)
+
+    read_session = bigquery_storage.types.ReadSession.deserialize(session_bytes)
+    file_name = 'part-{:05d}.parquet'.format(part_index)
+    # one writer per partition folder, keyed by the tuple of partition values
+    writers = {}
+    n = 0
+    written = 0
+    try:
+        for table in _iter_stream_batches(_worker_read_client, read_session, stream_name, row_group_rows):
+            n += table.num_rows
+            if not partition_cols:
+                if None not in writers:
+                    writers[None] = pq.ParquetWriter(os.path.join(local_path, file_name), table.schema,
+                                                     compression=compression)
+                writers[None].write_table(table)
+                written += table.num_rows
+                continue
+
+            data_cols = [c for c in table.column_names if c not in partition_cols]
+            # the row numbers of each group, so every row lands in exactly one group - comparing values
+            # would miss NaN keys (NaN equals nothing) and match -0.0 rows to the 0.0 group as well
+            numbered = table.select(partition_cols).append_column('__row', pa.array(np.arange(table.num_rows)))
+            groups = numbered.group_by(partition_cols).aggregate([('__row', 'list')])
+            for i in range(groups.num_rows):
+                values = tuple(groups.column(c)[i].as_py() for c in partition_cols)
+                part = table.take(groups.column('__row_list')[i].values).select(data_cols)
+                written += part.num_rows
+
+                # keyed on the folder, NaN and -NaN group apart but go to the same nan folder and writer
+                part_key = _hive_partition_dir(partition_cols, values)
+                if part_key not in writers:
+                    part_dir = os.path.join(local_path, part_key)
+                    if not os.path.isdir(part_dir):
+                        try:
+                            os.makedirs(part_dir)
+                        except OSError:
+                            # another stream made it first
+                            if not os.path.isdir(part_dir):
+                                raise
+                    writers[part_key] = pq.ParquetWriter(os.path.join(part_dir, file_name), part.schema,
+                                                         compression=compression)
+                writers[part_key].write_table(part)
+
+            if written != n:
+                raise ValueError('{} rows of {} read from {} did not land in a partition'.format(
+                    n - written, n, stream_name))
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return n, sorted(writer.where for writer in writers.values())
+
+
+def export_table_to_local_parquet(dataset_name, table_name, local_path, columns=None, row_filter=None,
+                                  partition_cols=None, max_streams=None, processes=None, row_group_rows=250000,
+                                  compression='snappy', project=None, client=None):
+    """
+    export_table_to_local_parquet writes a table straight to a local parquet dataset through the
+    Storage Read API, no export job, no gcs and no csv round trip, and the bq types are kept,
+    only the columns asked for are read and row_filter is applied by bq before the rows are sent,
+    the read streams are written in parallel on a process pool, holding at most row_group_rows rows each
+        py> bqTools.export_table_to_local_parquet('my_dataset', 'orders', '/data/orders',
+                                                  columns=['order_id', 'order_date', 'amount'],
+                                                  row_filter="order_date >= '2024-01-01'",
+                                                  partition_cols=['order_date'])
 
     Args:
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
-       table_name (str, required):  The bq table name of the table to be inspected
+       table_name (str, required):  The bq table name of the table to be exported
+       local_path (str, required):  directory of the parquet dataset, it must be missing or empty
+       columns (list, optional):  column names to read, if null all of them
+       row_filter (str, optional):  sql where-clause condition (no WHERE), i.e. "amount > 0 AND region = 'EU'"
+       partition_cols (list, optional):  write hive partition folders (col=value/) on these columns,
+            they have to be in columns when columns is given
+       max_streams (int, optional):  number of read streams to ask for, if null the number of cpus,
+            bq may hand back fewer for small tables
+       processes (int, optional):  size of the process pool, if null the number of streams
+       row_group_rows (int, default 250000):  rows per parquet row group, also the memory bound per stream
+       compression (str, default 'snappy'):  parquet compression, snappy, zstd, gzip or none
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool,
+            it has to use the default credentials, the worker processes read with those
 
     Returns:
         A dictionary object containing information about the process.
@@ -686,122 +2291,134 @@ def print_25_rows(dataset_name, table_name, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
-        dataset_ref = bigquery_client.dataset(dataset_name)
-        table_ref = dataset_ref.table(table_name)
-
-        # Get the table from the API so that the schema is available.
-        table = bigquery_client.get_table(table_ref)
-
-        # Load at most 25 results.
-        rows = bigquery_client.list_rows(table, max_results=25)
-
-        # Use format to create a simple table.
-        format_string = '{!s:<16} ' * len(table.schema)
-
-        # Print schema field names
-        field_names = [field.name for field in table.schema]
-        print(format_string.format(*field_names))
-
-        for row in rows:
-            print(format_string.format(*row))
+        if bigquery_storage is None or pa is None:
+            raise ImportError('export_table_to_local_parquet needs google-cloud-bigquery-storage and pyarrow installed')
+
+        partition_cols = list(partition_cols or [])
+        if columns and set(partition_cols) - set(columns):
+            raise ValueError('partition_cols {} are not in columns'.format(sorted(set(partition_cols) - set(columns))))
+
+        if os.path.isdir(local_path) and os.listdir(local_path):
+            raise ValueError('local_path {} is not empty'.format(local_path))
+        if not os.path.isdir(local_path):
+            os.makedirs(local_path)
+
+        start = time.time()
+        bigquery_client = get_client(project, client=client)
+        _check_worker_credentials(bigquery_client)
+        table_ref = bigquery_client.dataset(dataset_name).table(table_name)
+
+        max_streams = max_streams or multiprocessing.cpu_count()
+        read_session = _create_read_session(bigquery_client, table_ref, max_stream_count=max_streams,
+                                            selected_fields=columns, row_restriction=row_filter)
+        stream_names = [stream.name for stream in read_session.streams]
+        session_bytes = bigquery_storage.types.ReadSession.serialize(read_session)
+
+        results = []
+        if stream_names:
+            # spawn, not fork - the grpc channel opened above must not be copied into the workers
+            with ProcessPoolExecutor(max_workers=(processes or len(stream_names)),
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                n = len(stream_names)
+                results = list(executor.map(_read_stream_to_parquet_dataset, [session_bytes] * n, stream_names,
+                                            range(n), [local_path] * n, [partition_cols] * n,
+                                            [row_group_rows] * n, [compression] * n))
+
+        parquet_files = sorted(f for rows, files in results for f in files)
+        output_rows = sum(rows for rows, files in results)
+        output_bytes = sum(os.path.getsize(f) for f in parquet_files)
 
-        returnMsg = 'print_25_rows table {} in dataset {}.'.format(table_name, dataset_name)
         output_dict = {
-            "dataset_name": dataset_name,
-            "table_name": table_name,
+            "table": '{}.{}.{}'.format(table_ref.project, table_ref.dataset_id, table_ref.table_id),
+            "local_path": local_path,
+            "parquet_files": parquet_files,
+            "partition_cols": partition_cols,
+            "streams": len(stream_names),
+            "outputRows": output_rows,
+            "outputBytes": output_bytes,
+            "elapsed_seconds": round(time.time() - start, 3),
             "status": "complete",
-            "msg": returnMsg
+            "msg": 'export_table_to_local_parquet: wrote {} rows in {} files to {}'.format(
+                output_rows, len(parquet_files), local_path)
         }
 
         return output_dict
 
     except Exception as e:
-        errorStr = 'ERROR (print_25_rows): ' + str(e)
+        errorStr = 'ERROR (export_table_to_local_parquet): ' + str(e)
         print(errorStr)
         raise
 
 
-def get_dataframe(sqlQuery, project=None, index_col=None, col_order=None, reauth=False,
-                  verbose=False, private_key=None, dialect='legacy'):
+def query_standard_sql(sqlQuery, print_stdout=True, project=None, client=None, max_scan_bytes=None):
     """
-    get_dataframe returns a pandas dataframe for a query, nice!
-
-    docs:  http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
+    query_standard_sql allows you to just fire/forget a query to bq, Standard SQL
+    allows you to turn on/off stdout for results, and returns a message back to you
+    SQL should include fully qualified table names: `bigquery-public-data.samples.wikipedia`
 
     Args:
-       sqlQuery (str, required):  The bq sql to be executed.
+       sqlQuery (str, required):  The bq sql which will be executed on the db.
+       print_stdout (boolean, default True):  set to false if you want to hide standard output
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
-       index_col (str, optional):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
-       col_order (str, optional):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
-       reauth (boolean, default False):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
-       verbose (boolean, default False):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
-       private_key (str, optional):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
-       dialect (str, default 'legacy'):  see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_gbq.html
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       max_scan_bytes (int, optional):  reject the query if it would scan more, if null MAX_SCAN_BYTES is used
 
     Returns:
-        A pandas dataframe containing the list of columns.
+        A dictionary object containing information about the process.
 
     Raises:
        Standard errors are printed to stdout and raised.
     """
-    try:
-        # the read_gbq requires the project_id(project name), so fetch it if none passed in
-        if not project:
-            credentials, project_id = google.auth.default(scopes=['https://www.googleapis.com/auth/iam'])
-            project = str(project_id)
-
-        df_gbq = gbq.read_gbq(sqlQuery, project, index_col, col_order, reauth, verbose, private_key, dialect)
-
-        return df_gbq
-
-    except Exception as e:
-        errorStr = 'ERROR (get_dataframe): ' + str(e)
-        print(errorStr)
-        raise
+    # Waits for job to complete.
+    return submit_query_standard_sql(sqlQuery, print_stdout, project, client=client,
+                                     max_scan_bytes=max_scan_bytes).wait()
 
 
-def query_standard_sql(sqlQuery, print_stdout=True):
+def submit_query_standard_sql(sqlQuery, print_stdout=False, project=None, client=None, max_scan_bytes=None):
     """
-    query_standard_sql allows you to just fire/forget a query to bq, Standard SQL
-    allows you to turn on/off stdout for results, and returns a message back to you
-    SQL should include fully qualified table names: `bigquery-public-data.samples.wikipedia`
+    submit_query_standard_sql starts a query_standard_sql job and returns without waiting for it
 
     Args:
        sqlQuery (str, required):  The bq sql which will be executed on the db.
-       print_stdout (boolean, default True):  set to false if you want to hide standard output
+       print_stdout (boolean, default False):  print the result rows to stdout when the handle is waited on
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       max_scan_bytes (int, optional):  reject the query if it would scan more, if null MAX_SCAN_BYTES is used
 
     Returns:
-        A dictionary object containing information about the process.
+        A JobHandle, its wait() returns the query_standard_sql dictionary.
 
     Raises:
        Standard errors are printed to stdout and raised.
     """
+    bigquery_client = get_client(project, client=client)
     job_config = bigquery.QueryJobConfig()
 
     # Set use_legacy_sql to False to use standard SQL syntax.
     # Note that queries are treated as standard SQL by default.
     job_config.use_legacy_sql = False
+    job_config.maximum_bytes_billed = _max_scan_bytes(max_scan_bytes)
     query_job = bigquery_client.query(sqlQuery, job_config=job_config)
 
-    # Print the results.
-    if print_stdout:
-        for row in query_job.result():  # Waits for job to complete.
-            print(row)
-    else:
-        query_job.result()  # Waits for job to complete.
+    def on_done(query_job):
+        # Print the results.
+        if print_stdout:
+            for row in query_job.result():
+                print(row)
 
-    output_dict = {
-        "sqlQuery": sqlQuery,
-        "status": "complete",
-        "job_id": query_job.job_id,
-        "msg": 'query_standard_sql: Complete {}'.format(sql)
-    }
+        output_dict = {
+            "sqlQuery": sqlQuery,
+            "status": "complete",
+            "job_id": query_job.job_id,
+            "msg": 'query_standard_sql: Complete {}'.format(sqlQuery)
+        }
 
-    return output_dict
+        return output_dict
 
+    return JobHandle(query_job, on_done)
 
-def print_1_rows(dataset_name, table_name, project=None):
+
+def print_1_rows(dataset_name, table_name, project=None, client=None):
     """
     print_1_rows - created by Bandhav - Prints rows in the given table.
     Will print 25 rows at most for brevity as tables can contain large amounts
@@ -811,6 +2428,7 @@ def print_1_rows(dataset_name, table_name, project=None):
        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
        table_name (str, required):  The bq table name of the table to be inspected
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         A list with the field names.
@@ -819,12 +2437,9 @@ def print_1_rows(dataset_name, table_name, project=None):
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
-        dataset_ref = bigquery_client.dataset(dataset_name)
-        table_ref = dataset_ref.table(table_name)
-
-        # Get the table from the API so that the schema is available.
-        table = bigquery_client.get_table(table_ref)
+        bigquery_client = get_client(project, client=client)
+        # Get the table from the API (or the metadata cache) so that the schema is available.
+        table = _get_table_cached(bigquery_client, dataset_name, table_name)
 
         # Load at most 1 results.
         # commented this out, was it needed?
@@ -852,12 +2467,265 @@ def print_1_rows(dataset_name, table_name, project=None):
         raise
 
 
+# ------------------------------------------------------------------
+# validation functions
+# ------------------------------------------------------------------
+
+# a load job only says how many records it dropped, not which ones - validate_delimited_file
+# checks a local file against the same json schema before it is loaded and reports line numbers and byte offsets
+VALIDATE_CHUNK_BYTES = 64 * 1024 * 1024
+
+# what a bq csv load accepts for each type, empty values are NULL and are checked against the mode instead
+_VALIDATE_PATTERNS = {
+    'INTEGER': r'^[+-]?\d+$',
+    'NUMERIC': r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$',
+    'FLOAT': r'^([+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?|(?i:[+-]?inf(inity)?|nan))$',
+    'BOOLEAN': r'(?i)^(true|false|t|f|yes|no|y|n|1|0)$',
+    'DATE': r'^\d{4}-\d{1,2}-\d{1,2}$',
+    'TIME': r'^\d{1,2}:\d{1,2}(:\d{1,2}(\.\d{1,6})?)?$',
+    'DATETIME': r'^\d{4}-\d{1,2}-\d{1,2}([ T]\d{1,2}:\d{1,2}(:\d{1,2}(\.\d{1,6})?)?)?$',
+    'TIMESTAMP': r'^\d{4}-\d{1,2}-\d{1,2}([ T]\d{1,2}:\d{1,2}(:\d{1,2}(\.\d{1,6})?)?)?'
+                 r'( ?(Z|UTC|[+-]\d{1,2}(:\d{2})?))?$',
+}
+_VALIDATE_TYPE_ALIASES = {'INT64': 'INTEGER', 'FLOAT64': 'FLOAT', 'BOOL': 'BOOLEAN', 'BIGNUMERIC': 'NUMERIC'}
+
+
+def _validate_casts(column, empty, types):
+    """
+    _validate_casts returns True when the non-empty values of a string column all cast to one of the arrow types
+    """
+    values = pc.if_else(empty, pa.scalar(None, pa.string()), column)
+    for arrow_type in types:
+        try:
+            pc.cast(values, arrow_type)
+            return True
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+
+    return False
+
+
+def validate_delimited_file(local_file_name, schema, field_delimiter=",", skip_leading_rows=1, quote_char='"',
+                            max_errors=1000, chunk_bytes=VALIDATE_CHUNK_BYTES):
+    """
+    validate_delimited_file checks a local delimited file against a bq schema before it is loaded:
+    field count per line, REQUIRED fields that are empty, and values that will not cast to the
+    column type (INTEGER, FLOAT, NUMERIC, BOOLEAN, DATE, TIME, DATETIME, TIMESTAMP)
+    the file is read in chunks and each check runs over whole columns with numpy / pyarrow compute
+        py> result = bqTools.validate_delimited_file('/data/drop/orders.txt', schema, field_delimiter='|')
+        py> result["errors"].head()
+
+    Note:  quoted values may hold the delimiter but not a newline, one line is one record
+
+    Args:
+       local_file_name (str, required):  The file location, fully qualified is best i.e. /opt/projects/test/filename.csv
+       schema (str, required):  the bq schema and column structure, in json bq cli format (see convert_schema)
+       field_delimiter (str, default ","):  the file delimiter, "\t" or "tab" for tab
+       skip_leading_rows (int, default 1):  set to 0 if no header
+       quote_char (str, default '"'):  the quote character, None if values are never quoted
+       max_errors (int, default 1000):  stop recording errors after this many, the counts keep going
+       chunk_bytes (int, default VALIDATE_CHUNK_BYTES):  bytes read per chunk
+
+    Returns:
+        A dictionary object containing information about the process, "errors" is a pandas dataframe of
+        line_number, byte_offset, column, value and error, "bad_rows" the number of lines with any error.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        if pacsv is None:
+            raise ImportError('validate_delimited_file needs pyarrow and numpy installed')
+
+        if field_delimiter in ('tab', '\\t', '/t'):
+            field_delimiter = '\t'
+        delimiter_byte = ord(field_delimiter)
+        newline_byte = ord('\n')
+        quote_byte = ord(quote_char) if quote_char else None
+
+        schemaJson = json.loads(re.sub(r'\s+', ' ', schema.replace('\n', '')))
+        columns = []
+        for item in schemaJson:
+            fieldType = str(item["type"]).upper()
+            fieldType = _VALIDATE_TYPE_ALIASES.get(fieldType, fieldType)
+            columns.append((str(item["name"]), fieldType, str(item.get("mode", "NULLABLE")).upper()))
+        fields = len(columns)
+
+        read_options = pacsv.ReadOptions(column_names=['f{}'.format(i) for i in range(fields)],
+                                         block_size=max(chunk_bytes, 1 << 20))
+        parse_options = pacsv.ParseOptions(delimiter=field_delimiter, quote_char=quote_char or False,
+                                           ignore_empty_lines=False)
+        convert_options = pacsv.ConvertOptions(
+            column_types=dict(('f{}'.format(i), pa.string()) for i in range(fields)),
+            strings_can_be_null=False, quoted_strings_can_be_null=False)
+
+        # a column that casts in one go is valid, most columns stop here
+        fast_casts = {
+            'INTEGER': [pa.int64()],
+            'FLOAT': [pa.float64()],
+            'BOOLEAN': [pa.bool_()],
+            'DATE': [pa.date32()],
+            'DATETIME': [pa.timestamp('us')],
+            'TIMESTAMP': [pa.timestamp('us'), pa.timestamp('us', tz='UTC')],
+        }
+
+        errors = []
+        error_count = 0
+        bad_rows = 0
+        rows = 0
+        total_bytes = 0
+        line_number = 0
+        start = time.time()
+
+        with open(local_file_name, 'rb') as readable:
+            carry = b''
+            while True:
+                data = readable.read(chunk_bytes)
+                chunk = carry + data
+                if not chunk:
+                    break
+                if data:
+                    # only whole lines are checked, the tail waits for the next read
+                    cut = chunk.rfind(b'\n') + 1
+                    if cut == 0:
+                        carry = chunk
+                        continue
+                    chunk, carry = chunk[:cut], chunk[cut:]
+                else:
+                    carry = b''
+                chunk_offset = total_bytes
+                total_bytes += len(chunk)
+
+                buf = np.frombuffer(chunk, dtype=np.uint8)
+                newlines = np.flatnonzero(buf == newline_byte)
+                line_starts = np.concatenate(([0], newlines + 1))
+                if line_starts[-1] == len(buf):
+                    line_starts = line_starts[:-1]
+                line_ends = np.append(newlines, len(buf))[:len(line_starts)]
+                n_lines = len(line_starts)
+
+                def line_bytes(i):
+                    return chunk[line_starts[i]:line_ends[i]].rstrip(b'\r').decode('utf-8', 'replace')
+
+                # header lines are counted for line numbers but not checked
+                first = min(max(skip_leading_rows - line_number, 0), n_lines)
+                chunk_line_number = line_number
+                line_number += n_lines
+                if first == n_lines:
+                    continue
+
+                # field counts: delimiters per line + 1, not counting delimiters inside quotes -
+                # an odd number of quotes since the line start means inside, "" escapes flip twice
+                is_delimiter = (buf == delimiter_byte).view(np.uint8)
+                if quote_byte is not None and quote_byte in buf:
+                    # uint8 wraps at 256, which keeps the parity
+                    quote_parity = np.cumsum(buf == quote_byte, dtype=np.uint8) & 1
+                    before_line = np.where(line_starts > 0, quote_parity[line_starts - 1], 0).astype(np.uint8)
+                    line_parity = np.repeat(before_line, np.diff(np.append(line_starts, len(buf))))
+                    is_delimiter = is_delimiter & (quote_parity == line_parity)
+                field_count = np.add.reduceat(is_delimiter, line_starts, dtype=np.int64) + 1
+
+                checked = np.arange(first, n_lines)
+                count_ok = field_count[checked] == fields
+                good_lines = checked[count_ok]
+                chunk_errors = [[i, None, line_bytes(i)[:200],
+                                 'expected {} fields, found {}'.format(fields, field_count[i])]
+                                for i in checked[~count_ok]]
+
+                if len(good_lines):
+                    if len(good_lines) == n_lines:
+                        good_bytes = chunk
+                    else:
+                        keep = np.zeros(n_lines, dtype=bool)
+                        keep[good_lines] = True
+                        byte_mask = np.repeat(keep, np.diff(np.append(line_starts, len(buf))))
+                        good_bytes = buf[byte_mask].tobytes()
+
+                    table = pacsv.read_csv(pa.BufferReader(good_bytes), read_options=read_options,
+                                           parse_options=parse_options, convert_options=convert_options)
+                    if table.num_rows != len(good_lines):
+                        raise ValueError('rows out of step near byte {}, a quoted value may hold a newline'.format(
+                            chunk_offset))
+
+                    for i, (name, fieldType, mode) in enumerate(columns):
+                        column = table.column(i)
+                        empty = pc.equal(pc.utf8_length(column), 0)
+                        if mode == 'REQUIRED':
+                            for row in np.flatnonzero(empty.to_numpy(zero_copy_only=False)):
+                                chunk_errors.append([good_lines[row], name, '', 'REQUIRED field is empty'])
+
+                        pattern = _VALIDATE_PATTERNS.get(fieldType)
+                        if pattern is None or _validate_casts(column, empty, fast_casts.get(fieldType, ())):
+                            continue
+                        # some value did not cast, the (slower) patterns find which ones
+                        matched = pc.match_substring_regex(column, pattern)
+                        if fieldType in ('DATE', 'DATETIME', 'TIMESTAMP'):
+                            # the pattern allows 2019-02-31 and strptime rolls it over to 03-03,
+                            # so the day strptime lands on has to be the day that was written
+                            date_part = pc.replace_substring_regex(column, r'^(\d{4}-\d{1,2}-\d{1,2}).*$', r'\1')
+                            day = pc.replace_substring_regex(date_part, r'^.*-0?(\d+)$', r'\1')
+                            parsed = pc.strptime(date_part, format='%Y-%m-%d', unit='s', error_is_null=True)
+                            real_date = pc.equal(pc.day(parsed), pc.cast(pc.if_else(matched, day, '0'), pa.int64()))
+                            matched = pc.fill_null(pc.and_(matched, real_date), False)
+                        bad = pc.and_not(pc.invert(matched), empty)
+                        for row in np.flatnonzero(bad.to_numpy(zero_copy_only=False)):
+                            chunk_errors.append([good_lines[row], name, column[int(row)].as_py()[:200],
+                                                 'not a valid ' + fieldType])
+
+                rows += len(checked)
+                if chunk_errors:
+                    bad_rows += len(set(e[0] for e in chunk_errors))
+                    error_count += len(chunk_errors)
+                    chunk_errors.sort(key=lambda e: e[0])
+                    for i, column_name, value, error in chunk_errors[:max(max_errors - len(errors), 0)]:
+                        errors.append({"line_number": chunk_line_number + int(i) + 1,
+                                       "byte_offset": chunk_offset + int(line_starts[i]),
+                                       "column": column_name, "value": value, "error": error})
+
+        seconds = time.time() - start
+        errors_df = pd.DataFrame(errors, columns=["line_number", "byte_offset", "column", "value", "error"])
+
+        output_dict = {
+            "local_file_name": local_file_name,
+            "rows": rows,
+            "bad_rows": bad_rows,
+            "error_count": error_count,
+            "errors": errors_df,
+            "bytes": total_bytes,
+            "seconds": round(seconds, 3),
+            "mb_per_second": round(total_bytes / 1048576.0 / max(seconds, 1e-6), 1),
+            "status": "complete" if not bad_rows else "complete/with-errors",
+            "msg": 'validate_delimited_file {} {} rows, {} bad'.format(local_file_name, rows, bad_rows)
+        }
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (validate_delimited_file): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def _preflight_validate(local_file_name, schema, field_delimiter, skip_leading_rows, max_bad_records):
+    """
+    _preflight_validate runs validate_delimited_file before a load and raises ValueError, with the first
+    errors in the message, when more lines are bad than the load would allow
+    """
+    result = validate_delimited_file(local_file_name, schema, field_delimiter=field_delimiter,
+                                     skip_leading_rows=skip_leading_rows, max_errors=max(max_bad_records, 0) + 10)
+    if result["bad_rows"] > max_bad_records:
+        raise ValueError('{} has {} bad rows (max_bad_records {}), first errors:\n{}'.format(
+            local_file_name, result["bad_rows"], max_bad_records, result["errors"].head(10).to_string(index=False)))
+
+    return result
+
+
 # ------------------------------------------------------------------
 # import functions
 # ------------------------------------------------------------------
 
 
-def load_data_from_gcs_simple(dataset_name, table_name, source, max_bad_records=0, project=None):
+def load_data_from_gcs_simple(dataset_name, table_name, source, max_bad_records=0, project=None, client=None):
     """
     load_data_from_gcs_simple loads a *NEW* table to bq from gcs without the schema, autodetect it - nice!
 
@@ -867,6 +2735,7 @@ def load_data_from_gcs_simple(dataset_name, table_name, source, max_bad_records=
        source (str, required):  The file location, fully qualified i.e. gs://bucketName/filename.csv.
        max_bad_records (int, default 0):  suggest setting this to a larger number as it will allow some errors.
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         A dictionary object containing information about the process.
@@ -875,7 +2744,7 @@ def load_data_from_gcs_simple(dataset_name, table_name, source, max_bad_records=
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
+        bigquery_client = get_client(project, client=client)
         dataset_ref = bigquery_client.dataset(dataset_name)
         table_ref = dataset_ref.table(table_name)
         job_config = bigquery.LoadJobConfig()
@@ -890,6 +2759,7 @@ def load_data_from_gcs_simple(dataset_name, table_name, source, max_bad_records=
         load_job = bigquery_client.load_table_from_uri(source, table_ref, job_config=job_config)
 
         load_job.result()  # Waits for job to complete
+        invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
 
         print('Loaded {} rows into {}:{}.'.format(
             load_job.output_rows, dataset_name, table_name))
@@ -930,7 +2800,9 @@ def load_data_from_gcs_simple(dataset_name, table_name, source, max_bad_records=
 
 
 def load_table_from_gcs(dataset_name, table_name, schema, source, skip_leading_rows=1, source_format='CSV',
-                        max_bad_records=0, write_disposition='WRITE_EMPTY', field_delimiter=",", project=None):
+                        max_bad_records=0, write_disposition='WRITE_EMPTY', field_delimiter=",", project=None,
+                        client=None, partition=None, time_partitioning=None, range_partitioning=None,
+                        clustering_fields=None, partition_expiration_days=None):
     """
     load_table_from_gcs loads a *NEW* table to bq from gcs with the schema
 
@@ -946,6 +2818,15 @@ def load_table_from_gcs(dataset_name, table_name, schema, source, skip_leading_r
             other options: WRITE_TRUNCATE WRITE_APPEND
        field_delimiter (str, default ","):  the file delimiter, use "/t" for tab
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       partition (str or date, optional):  load only into this partition (table$YYYYMMDD), with WRITE_TRUNCATE
+            only that partition is replaced, the table is only created when it is missing
+       time_partitioning (str, dict or True, optional):  partition by this DATE/TIMESTAMP column (daily),
+            or {"field": "event_ts", "type": "HOUR"} (DAY, HOUR, MONTH, YEAR), True is ingestion time
+       range_partitioning (dict, optional):  integer range partitioning,
+            {"field": "customer_id", "start": 0, "end": 100000, "interval": 1000}
+       clustering_fields (list, optional):  up to 4 columns to cluster by
+       partition_expiration_days (float, optional):  time partitions are dropped once they are this old
 
     Returns:
         A dictionary object containing information about the process.
@@ -954,37 +2835,17 @@ def load_table_from_gcs(dataset_name, table_name, schema, source, skip_leading_r
        Standard errors are printed to stdout and raised.
     """
     try:
-
-        bigquery_client = bigquery.Client(project=project)
-
-        # convert the schema json string to a list
-        schemaList = convert_schema(schema)
-
-        dataset_ref = bigquery_client.dataset(dataset_name)
-        table_ref = dataset_ref.table(table_name)
-        table = bigquery.Table(table_ref, schema=schemaList)
-
-        bigquery_client.create_table(table)
-
-        job_id_prefix = "bqTools_load_job"
-        job_config = bigquery.LoadJobConfig()
-        job_config.create_disposition = 'NEVER'
-        job_config.skip_leading_rows = skip_leading_rows
-        job_config.source_format = source_format
-        job_config.write_disposition = write_disposition
-
-        if max_bad_records:
-            job_config.max_bad_records = max_bad_records
-
-        if field_delimiter:
-            job_config.field_delimiter = field_delimiter
-
-        load_job = bigquery_client.load_table_from_uri(
-            source, table_ref, job_config=job_config,
-            job_id_prefix=job_id_prefix)
+        handle = submit_load_table_from_gcs(dataset_name, table_name, schema, source, skip_leading_rows,
+                                            source_format, max_bad_records, write_disposition, field_delimiter,
+                                            project, client=client, partition=partition,
+                                            time_partitioning=time_partitioning,
+                                            range_partitioning=range_partitioning,
+                                            clustering_fields=clustering_fields,
+                                            partition_expiration_days=partition_expiration_days)
 
         # the following waits for table load to complete
-        load_job.result()
+        output_dict = handle.wait()
+        load_job = handle.job
 
         print("------ load_job\n")
         print("load_job: " + str(type(load_job)))
@@ -996,68 +2857,152 @@ def load_table_from_gcs(dataset_name, table_name, schema, source, skip_leading_r
         print(job_result)
 
         job_exception = load_job.exception
-        job_id = load_job.job_id
-        job_state = load_job.state
-        error_result = load_job.error_result
-        job_statistics = load_job._job_statistics()
-        badRecords = job_statistics['badRecords']
-        outputRows = job_statistics['outputRows']
-        inputFiles = job_statistics['inputFiles']
-        inputFileBytes = job_statistics['inputFileBytes']
-        outputBytes = job_statistics['outputBytes']
 
         print("\n ***************************** ")
-        print(" job_state:      " + str(job_state))
-        print(" error_result:   " + str(error_result))
-        print(" job_id:         " + str(job_id))
-        print(" badRecords:     " + str(badRecords))
-        print(" outputRows:     " + str(outputRows))
-        print(" inputFiles:     " + str(inputFiles))
-        print(" inputFileBytes: " + str(inputFileBytes))
-        print(" outputBytes:    " + str(outputBytes))
+        print(" job_state:      " + output_dict["job_state"])
+        print(" error_result:   " + output_dict["error_result"])
+        print(" job_id:         " + str(output_dict["job_id"]))
+        print(" badRecords:     " + output_dict["badRecords"])
+        print(" outputRows:     " + output_dict["outputRows"])
+        print(" inputFiles:     " + output_dict["inputFiles"])
+        print(" inputFileBytes: " + output_dict["inputFileBytes"])
+        print(" outputBytes:    " + output_dict["outputBytes"])
         print(" type(job_exception):  " + str(type(job_exception)))
         print(" job_exception:  " + str(job_exception))
         print(" ***************************** ")
 
         print("------ load_job.errors \n")
-        myErrors = load_job.errors if load_job.errors is not None else []
+        myErrors = output_dict["error_list"]
         print("load_job.errors - count is : " + str(len(myErrors)))
         for errorRecord in myErrors:
             print(errorRecord)
 
         print("------ ------ ------ ------\n")
 
-        # TODO:  need to figure out how to get # records failed, and which ones they are
-        # research shoed "statistics.load_job" - but not sure how that works
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (load_table_from_gcs): ' + str(e)
+        print(errorStr)
+        raise
 
-        output_dict = {
-            "dataset_name": dataset_name,
-            "table_name": table_name,
-            "source": source,
-            "job_id": job_id,
-            "job_state": str(job_state),
-            "error_result": str(error_result),
-            "badRecords": str(badRecords),
-            "outputRows": str(outputRows),
-            "inputFiles": str(inputFiles),
-            "inputFileBytes": str(inputFileBytes),
-            "outputBytes": str(outputBytes),
-            "error_list": myErrors,
-            "status": "complete",
-            "msg": 'load_table_from_gcs {}:{} {}'.format(dataset_name, table_name, source)
 
-        }
+def submit_load_table_from_gcs(dataset_name, table_name, schema, source, skip_leading_rows=1, source_format='CSV',
+                               max_bad_records=0, write_disposition='WRITE_EMPTY', field_delimiter=",",
+                               project=None, client=None, create_table=True, partition=None,
+                               time_partitioning=None, range_partitioning=None,
+                               clustering_fields=None, partition_expiration_days=None):
+    """
+    submit_load_table_from_gcs creates the table and starts a load_table_from_gcs job,
+    returning without waiting for the load
 
-        return output_dict
+    Args:
+       same as load_table_from_gcs, source can also be a list of gs:// uris
+       create_table (boolean, default True):  create the table first, if False the load job creates it
+            when it is missing and appends/truncates it when it is there (see write_disposition),
+            schema None then means autodetect
+
+    Returns:
+        A JobHandle, its wait() returns the load_table_from_gcs dictionary.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+
+        bigquery_client = get_client(project, client=client)
+
+        # convert the schema json string to a list, no schema is autodetect (create_table=False only)
+        schemaList = convert_schema(schema) if schema else None
+
+        dataset_ref = bigquery_client.dataset(dataset_name)
+        table_ref = dataset_ref.table(table_name)
+        job_id_prefix = "bqTools_load_job"
+        job_config = bigquery.LoadJobConfig()
+        if partition is not None and create_table:
+            # a partition load goes into a table that is usually already there
+            create_table = _get_table_cached(bigquery_client, dataset_name, table_name, not_found_ok=True) is None
+
+        if create_table:
+            table = bigquery.Table(table_ref, schema=schemaList)
+            _apply_partitioning(table, time_partitioning, range_partitioning, clustering_fields,
+                                partition_expiration_days)
+
+            bigquery_client.create_table(table)
+            invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
+
+            job_config.create_disposition = 'NEVER'
+        elif schemaList:
+            job_config.schema = schemaList
+            job_config.create_disposition = 'CREATE_IF_NEEDED'
+        else:
+            job_config.autodetect = True
+            job_config.create_disposition = 'CREATE_IF_NEEDED'
+
+        if not create_table:
+            # only used when the load creates the table
+            _apply_partitioning(job_config, time_partitioning, range_partitioning, clustering_fields,
+                                partition_expiration_days)
+        table_ref = dataset_ref.table(_partition_decorator(table_name, partition))
+
+        job_config.skip_leading_rows = skip_leading_rows
+        job_config.source_format = source_format
+        job_config.write_disposition = write_disposition
+
+        if max_bad_records:
+            job_config.max_bad_records = max_bad_records
+
+        if field_delimiter:
+            job_config.field_delimiter = field_delimiter
+
+        load_job = bigquery_client.load_table_from_uri(
+            source, table_ref, job_config=job_config,
+            job_id_prefix=job_id_prefix)
+
+        def on_done(load_job):
+            invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
+
+            job_statistics = load_job._job_statistics()
+            myErrors = load_job.errors if load_job.errors is not None else []
+
+            # TODO:  need to figure out how to get # records failed, and which ones they are
+            # research shoed "statistics.load_job" - but not sure how that works
+
+            output_dict = {
+                "dataset_name": dataset_name,
+                "table_name": table_name,
+                "source": source,
+                "job_id": load_job.job_id,
+                "job_state": str(load_job.state),
+                "error_result": str(load_job.error_result),
+                "badRecords": str(job_statistics['badRecords']),
+                "outputRows": str(job_statistics['outputRows']),
+                "inputFiles": str(job_statistics['inputFiles']),
+                "inputFileBytes": str(job_statistics['inputFileBytes']),
+                "outputBytes": str(job_statistics['outputBytes']),
+                "error_list": myErrors,
+                "status": "complete",
+                "msg": 'load_table_from_gcs {}:{} {}'.format(dataset_name, table_name, source)
+
+            }
+
+            return output_dict
+
+        return JobHandle(load_job, on_done)
 
     except Exception as e:
-        errorStr = 'ERROR (load_table_from_gcs): ' + str(e)
+        errorStr = 'ERROR (submit_load_table_from_gcs): ' + str(e)
         print(errorStr)
         raise
 
 
+# load_table_from_file sends a stream in resumable chunks of 100MB and seeks back to the start of a chunk
+# that failed, so a compressed stream has to keep at least that much behind its read position
+COMPRESSED_LOAD_REWIND_BYTES = 128 * 1024 * 1024
+
+
 def load_table_from_csv(dataset_name, table_name, schema, local_file_name, skip_leading_rows=1, source_format='CSV',
-                        max_bad_records=0, project=None):
+                        max_bad_records=0, project=None, client=None, compression=None, validate=False):
     """
     load_table_from_csv loads a local file to bq.
     This is really just a sample for the code base.  
@@ -1073,6 +3018,10 @@ def load_table_from_csv(dataset_name, table_name, schema, local_file_name, skip_
        source_format (str, default CSV):  only set this to CSV or things like Avro, etc. 
        max_bad_records (int, default 0):  suggest setting this to a higher number, like 1000 or something
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       compression (str, optional):  GZIP to gzip the file on all cores while it uploads, no .gz copy is written to disk
+       validate (boolean, default False):  check the file with validate_delimited_file first, nothing is loaded
+            if it has more bad rows than max_bad_records
 
     Returns:
         A dictionary object containing information about the process.
@@ -1081,11 +3030,14 @@ def load_table_from_csv(dataset_name, table_name, schema, local_file_name, skip_
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
+        bigquery_client = get_client(project, client=client)
 
         # convert the schema json string to a list
         schemaList = convert_schema(schema)
 
+        if validate:
+            _preflight_validate(local_file_name, schema, ",", skip_leading_rows, max_bad_records)
+
         # load a local file
         dataset_ref = bigquery_client.dataset(dataset_name)
 
@@ -1099,14 +3051,25 @@ def load_table_from_csv(dataset_name, table_name, schema, local_file_name, skip_
         if max_bad_records:
             job_config.max_bad_records = max_bad_records
 
-        with open(local_file_name, 'rb') as readable:
+        if compression:
+            # bq loads take gzip but not zstd, the stream is concatenated gzip members which bq reads as one file
+            if compression.upper() != 'GZIP':
+                raise ValueError('compression must be GZIP for a bq load, not ' + str(compression))
+            readable = compressTools.CompressedStream(local_file_name, method='gzip',
+                                                      rewind_bytes=COMPRESSED_LOAD_REWIND_BYTES)
+        else:
+            readable = open(local_file_name, 'rb')
+
+        with readable:
             # API request
             bigquery_client.load_table_from_file(readable, table_ref, job_config=job_config)
+        invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
 
         output_dict = {
             "dataset_name": dataset_name,
             "table_name": table_name,
             "local_file_name": local_file_name,
+            "compression": compression,
             "status": "complete",
             "msg": 'load_table_from_csv {}:{} {}'.format(dataset_name, table_name, local_file_name)
         }
@@ -1119,8 +3082,120 @@ def load_table_from_csv(dataset_name, table_name, schema, local_file_name, skip_
         raise
 
 
+def load_table_from_local_dir(dataset_name, table_name, schema, path_glob, bucket_name, gs_prefix=None,
+                              skip_leading_rows=1, source_format='CSV', max_bad_records=0,
+                              write_disposition='WRITE_EMPTY', field_delimiter="|", max_workers=8,
+                              keep_staged_files=False, project=None, client=None, validate=False):
+    """
+    load_table_from_local_dir loads every local file matching path_glob into one *NEW* table,
+    the files are staged to gcs in parallel and then loaded by a single load job of exactly the staged uris
+    (at most 10,000 files, the bq limit per load job), instead of one upload plus one load per file
+        py> bqTools.load_table_from_local_dir('my_dataset', 'daily_drop', schema, '/data/drop/*.txt',
+                                              'my-staging-bucket')
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_name (str, required):  The bq table name of the table to get loaded
+       schema (str, required):  the bq schema and column structure, in json bq cli format
+       path_glob (str, required):  local files to load, i.e. /opt/projects/drop/*.txt
+       bucket_name (str, required):  gcs bucket the files are staged in
+       gs_prefix (str, optional):  gcs "folder" for the staged files, if null bqTools_staging/<table>_<timestamp>/
+       skip_leading_rows (int, default 1):  set to 0 if no header
+       source_format (str, default CSV):  only set this to CSV or things like Avro, etc.
+       max_bad_records (int, default 0):  suggest setting this to a higher number, like 1000 or something
+       write_disposition (str, default WRITE_EMPTY):  other options: WRITE_TRUNCATE WRITE_APPEND
+       field_delimiter (str, default "|"):  the file delimiter, use "/t" for tab
+       max_workers (int, default 8):  number of uploads in flight
+       keep_staged_files (boolean, default False):  leave the staged files on gcs after the load,
+            otherwise they are removed even when the load fails
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       validate (boolean, default False):  check every file with validate_delimited_file before it is staged,
+            nothing is loaded if a file has more bad rows than max_bad_records
+
+    Returns:
+        A dictionary object containing information about the process, "file_list" has the bytes
+        and upload seconds of each file.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    # gcs names of the files uploaded so far, removed in the finally below
+    staged = []
+    try:
+        local_files = sorted(glob.glob(path_glob))
+        if not local_files:
+            raise ValueError('no files match ' + str(path_glob))
+        if len(local_files) > 10000:
+            raise ValueError('{} files match {}, a load job takes at most 10,000'.format(len(local_files), path_glob))
+
+        if not gs_prefix:
+            gs_prefix = 'bqTools_staging/{}_{}/'.format(table_name,
+                                                        datetime.datetime.now().strftime('%Y%m%d%H%M%S%f'))
+        if not gs_prefix.endswith('/'):
+            gs_prefix = gs_prefix + '/'
+
+        def stage_one(i_file):
+            i, local_file_name = i_file
+            # the index keeps two files with the same name from different folders apart
+            gs_filename = '{}{:05d}_{}'.format(gs_prefix, i, os.path.basename(local_file_name))
+            start = time.time()
+            gsTools.upload_file(local_file_name, bucket_name, gs_filename)
+            staged.append(gs_filename)
+            return {
+                "local_file_name": local_file_name,
+                "gs_filename": gs_filename,
+                "bytes": os.path.getsize(local_file_name),
+                "upload_seconds": round(time.time() - start, 3)
+            }
+
+        if validate:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(lambda f: _preflight_validate(f, schema, field_delimiter, skip_leading_rows,
+                                                                max_bad_records), local_files))
+
+        stage_start = time.time()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            file_list = list(executor.map(stage_one, enumerate(local_files)))
+        stage_seconds = time.time() - stage_start
+
+        # the staged uris, not a wildcard that could pick up other files under gs_prefix
+        source = ['gs://{}/{}'.format(bucket_name, f["gs_filename"]) for f in file_list]
+        load_start = time.time()
+        output_dict = submit_load_table_from_gcs(dataset_name, table_name, schema, source, skip_leading_rows,
+                                                 source_format, max_bad_records, write_disposition,
+                                                 field_delimiter, project, client=client).wait()
+        load_seconds = time.time() - load_start
+
+        output_dict.update({
+            "path_glob": path_glob,
+            "file_list": file_list,
+            "total_bytes": sum(f["bytes"] for f in file_list),
+            "stage_seconds": round(stage_seconds, 3),
+            "load_seconds": round(load_seconds, 3),
+            "staged_files_kept": "YES" if keep_staged_files else "NO",
+            "msg": 'load_table_from_local_dir {}:{} {} files from {}'.format(dataset_name, table_name,
+                                                                             len(file_list), path_glob)
+        })
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (load_table_from_local_dir): ' + str(e)
+        print(errorStr)
+        raise
+
+    finally:
+        if staged and not keep_staged_files:
+            bucket = gsTools.get_client(project).bucket(bucket_name)
+            # on_error, a file that is already gone is not a reason to fail
+            bucket.delete_blobs([bucket.blob(f) for f in staged], on_error=lambda blob: None)
+
+
 def load_table_from_df(dataset_name, table_name, dataframe, chunksize=10000, verbose=False, reauth=False,
-                       if_exists='replace', private_key=None, project=None):
+                       if_exists='replace', private_key=None, project=None, load_format=None, client=None,
+                       partition=None, time_partitioning=None, range_partitioning=None,
+                       clustering_fields=None, partition_expiration_days=None):
     """
     load_table_from_df loads a table from a pandas dataframe
 
@@ -1134,6 +3209,19 @@ def load_table_from_df(dataset_name, table_name, dataframe, chunksize=10000, ver
        if_exists (str, default replace): 
        private_key (str, optional): 
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       load_format (str, optional):  "PARQUET" writes the frame as one compressed parquet file and loads it
+            with a single load job, the schema comes from the arrow types (see convert_schema_from_df),
+            if null the frame goes through to_gbq in chunks of chunksize rows
+       client (bigquery.Client, optional):  a shared client, only used by the PARQUET load_format
+       partition (str or date, optional):  load only into this partition (table$YYYYMMDD), with WRITE_TRUNCATE
+            only that partition is replaced
+       time_partitioning (str, dict or True, optional):  partition by this DATE/TIMESTAMP column (daily),
+            or {"field": "event_ts", "type": "HOUR"} (DAY, HOUR, MONTH, YEAR), True is ingestion time
+       range_partitioning (dict, optional):  integer range partitioning,
+            {"field": "customer_id", "start": 0, "end": 100000, "interval": 1000}
+       clustering_fields (list, optional):  up to 4 columns to cluster by
+       partition_expiration_days (float, optional):  time partitions are dropped once they are this old
+            (to_gbq can not partition, so any of these five use the PARQUET load_format)
 
     Returns:
         A dictionary object containing information about the process.
@@ -1142,17 +3230,23 @@ def load_table_from_df(dataset_name, table_name, dataframe, chunksize=10000, ver
        Standard errors are printed to stdout and raised.
     """
     try:
-        # the read_gbq requires the project_id(project name), so fetch it if none passed in
-        if not project:
-            credentials, project_id = google.auth.default(scopes=['https://www.googleapis.com/auth/iam'])
-            project = str(project_id)
+        # the to_gbq requires the project_id(project name), so fetch it if none passed in
+        project = authTools.get_project(project)
 
         # Name of table to be written, in the form dataset.tablename
         destination_table = str(dataset_name) + "." + str(table_name)
 
+        partition_options = {"partition": partition, "time_partitioning": time_partitioning,
+                             "range_partitioning": range_partitioning, "clustering_fields": clustering_fields,
+                             "partition_expiration_days": partition_expiration_days}
+        if (load_format and load_format.upper() == 'PARQUET') or any(partition_options.values()):
+            return _load_table_from_df_parquet(dataset_name, table_name, dataframe, if_exists, project, client,
+                                               **partition_options)
+
         # https://pandas.pydata.org/pandas-docs/stable/generated/pandas.DataFrame.to_gbq.html
         myResult = dataframe.to_gbq(destination_table, project, chunksize=chunksize, verbose=verbose,
                                     reauth=reauth, if_exists=if_exists, private_key=private_key)
+        invalidate_metadata_cache(project, dataset_name, table_name)
 
         output_dict = {
             "dataset_name": str(dataset_name),
@@ -1172,8 +3266,122 @@ def load_table_from_df(dataset_name, table_name, dataframe, chunksize=10000, ver
         raise
 
 
+# frames up to this size are spooled to parquet in memory, bigger ones spill to a temp file
+PARQUET_SPOOL_MAX_BYTES = 256 * 1024 ** 2
+
+# to_gbq if_exists values as load job write dispositions
+_IF_EXISTS_WRITE_DISPOSITION = {
+    'fail': 'WRITE_EMPTY',
+    'replace': 'WRITE_TRUNCATE',
+    'append': 'WRITE_APPEND',
+}
+
+
+def _load_table_from_df_parquet(dataset_name, table_name, dataframe, if_exists, project, client, partition=None,
+                                time_partitioning=None, range_partitioning=None, clustering_fields=None,
+                                partition_expiration_days=None):
+    """
+    _load_table_from_df_parquet is the PARQUET load_format of load_table_from_df,
+    one snappy parquet file (spooled, in memory while small) and one load job, with typed columns
+    """
+    bigquery_client = get_client(project, client=client)
+    dataset_ref = bigquery_client.dataset(dataset_name)
+    table_ref = dataset_ref.table(_partition_decorator(table_name, partition))
+
+    # one arrow conversion gives both the schema and the data, so the two always agree
+    table = _arrow_table_from_df(dataframe)
+
+    job_config = LoadJobConfig()
+    job_config.source_format = 'PARQUET'
+    job_config.schema = _bq_schema_from_arrow(table.schema)
+    job_config.create_disposition = 'CREATE_IF_NEEDED'
+    job_config.write_disposition = _IF_EXISTS_WRITE_DISPOSITION[if_exists]
+    _apply_partitioning(job_config, time_partitioning, range_partitioning, clustering_fields,
+                        partition_expiration_days)
+
+    with tempfile.SpooledTemporaryFile(max_size=PARQUET_SPOOL_MAX_BYTES) as spool:
+        # bq reads parquet timestamps in micro seconds, pandas writes nano seconds by default
+        pq.write_table(table, spool, compression='snappy', coerce_timestamps='us', allow_truncated_timestamps=True)
+        spool.seek(0)
+        load_job = bigquery_client.load_table_from_file(spool, table_ref, job_config=job_config,
+                                                        job_id_prefix="bqTools_load_job")
+        load_job.result()  # Waits for job to complete
+
+    invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
+
+    output_dict = {
+        "dataset_name": str(dataset_name),
+        "table_name": str(table_name),
+        "destination_table": str(dataset_name) + "." + str(table_name),
+        "project": str(bigquery_client.project),
+        "job_id": load_job.job_id,
+        "outputRows": str(load_job.output_rows),
+        "load_format": "PARQUET",
+        "status": "complete",
+        "msg": 'load_table_from_df {}.{}'.format(dataset_name, table_name)
+    }
+
+    return output_dict
+
+
+def _load_table_from_gcs_fixedwidth_external(dataset_name, table_name, fixedwidth_spec, source, skip_leading_rows,
+                                             max_bad_records, project, client, max_scan_bytes=None):
+    """
+    _load_table_from_gcs_fixedwidth_external is the use_external_table mode of load_table_from_gcs_fixedwidth,
+    the gcs files are a temporary external table of one fullstring column, defined on the query job only,
+    and the SUBSTR/CAST select writes straight into the destination - one query job, nothing staged
+    """
+    bigquery_client = get_client(project, client=client)
+    table_ref = bigquery_client.dataset(dataset_name).table(table_name)
+
+    external_config = bigquery.ExternalConfig('CSV')
+    external_config.source_uris = source if isinstance(source, list) else [source]
+    external_config.schema = [bigquery.SchemaField('fullstring', 'STRING', mode='NULLABLE')]
+    external_config.max_bad_records = max_bad_records
+    external_config.options.skip_leading_rows = skip_leading_rows
+    # a whole record is one value, so no delimiter or quote inside it may split it
+    external_config.options.field_delimiter = '\x01'
+    external_config.options.quote_character = ''
+
+    sqlQuery = convert_sqlquery_from_fixedwidth_spec(None, 'fixedwidth_source', fixedwidth_spec,
+                                                     full_col_name="fullstring")
+
+    job_config = bigquery.QueryJobConfig()
+    job_config.table_definitions = {'fixedwidth_source': external_config}
+    job_config.destination = table_ref
+    job_config.create_disposition = 'CREATE_IF_NEEDED'
+    # the staging mode drops the destination first, truncate does the same in the same job
+    job_config.write_disposition = 'WRITE_TRUNCATE'
+    job_config.use_legacy_sql = False
+    job_config.maximum_bytes_billed = _max_scan_bytes(max_scan_bytes)
+
+    query_job = bigquery_client.query(sqlQuery, job_config=job_config, job_id_prefix="bqTools_fixedwidth_job")
+    query_job.result()  # Waits for job to complete
+    invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
+
+    destination = bigquery_client.get_table(table_ref)
+
+    output_dict = {
+        "dataset_name": dataset_name,
+        "table_name": table_name,
+        "source": source,
+        "select_query_job_id": query_job.job_id,
+        "sqlQuery": sqlQuery,
+        "error_result": query_job.error_result,
+        "outputRows": str(destination.num_rows),
+        "outputBytes": str(destination.num_bytes),
+        "totalBytesProcessed": str(query_job.total_bytes_processed),
+        "use_external_table": "YES",
+        "status": "complete",
+        "msg": 'load_table_from_gcs_fixedwidth {}:{} {}'.format(dataset_name, table_name, source)
+    }
+
+    return output_dict
+
+
 def load_table_from_gcs_fixedwidth(dataset_name, table_name, fixedwidth_spec, source, skip_leading_rows=1,
-                                   max_bad_records=0, project=None):
+                                   max_bad_records=0, project=None, client=None, use_external_table=False,
+                                   max_scan_bytes=None):
     """
     load_table_from_gcs_fixedwidth loads a fixed width format file from gcs to 
     bq with fixedwidth_spec
@@ -1192,6 +3400,10 @@ def load_table_from_gcs_fixedwidth(dataset_name, table_name, fixedwidth_spec, so
        skip_leading_rows (int, default 1):  set to 0 if no header
        max_bad_records (int, default 0):  suggest setting this to a higher number, like 1000 or something
        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+       use_external_table (boolean, default False):  read source as a temporary external table in one query job,
+            instead of loading a _tmp table, running a CTAS and dropping the _tmp table
+       max_scan_bytes (int, optional):  reject the select if it would scan more, if null MAX_SCAN_BYTES is used
 
     Returns:
         A dictionary object containing information about the process.
@@ -1199,6 +3411,16 @@ def load_table_from_gcs_fixedwidth(dataset_name, table_name, fixedwidth_spec, so
     Raises:
        Standard errors are printed to stdout and raised.
     """
+    if use_external_table:
+        try:
+            return _load_table_from_gcs_fixedwidth_external(dataset_name, table_name, fixedwidth_spec, source,
+                                                            skip_leading_rows, max_bad_records, project, client,
+                                                            max_scan_bytes=max_scan_bytes)
+        except Exception as e:
+            errorStr = 'ERROR (load_table_from_gcs_fixedwidth): ' + str(e)
+            print(errorStr)
+            raise
+
     temp_schema = """[
                             {
                                "description": "full record",
@@ -1210,28 +3432,31 @@ def load_table_from_gcs_fixedwidth(dataset_name, table_name, fixedwidth_spec, so
                             """
     temp_table_name = table_name + '_tmp'
     try:
-        _ = drop_table(dataset_name, temp_table_name)
-        print str(_["msg"])
+        bigquery_client = get_client(project, client=client)
+        _ = drop_table(dataset_name, temp_table_name, project, client=bigquery_client)
+        print(str(_["msg"]))
 
         # load fixed width files into a temp table of one full string column
         load_job_output = load_table_from_gcs(dataset_name, temp_table_name, temp_schema, source, skip_leading_rows,
-                                              'CSV', max_bad_records, 'WRITE_EMPTY', ",", project)
-        print str(load_job_output['msg'])
+                                              'CSV', max_bad_records, 'WRITE_EMPTY', ",", project,
+                                              client=bigquery_client)
+        print(str(load_job_output['msg']))
         # get the select query from the provided fixedwidth_spec
         sqlQuery = convert_sqlquery_from_fixedwidth_spec(dataset_name, temp_table_name, fixedwidth_spec,
                                                          full_col_name="fullstring")
-        print 'sqlQuery: ', sqlQuery
+        print('sqlQuery: ' + sqlQuery)
 
-        _ = drop_table(dataset_name, table_name)
-        print str(_["msg"])
+        _ = drop_table(dataset_name, table_name, project, client=bigquery_client)
+        print(str(_["msg"]))
 
         # create the final table from select SQL query
-        select_job_output = create_table_as_select(dataset_name, table_name, sqlQuery, project)
-        print select_job_output['msg']
+        select_job_output = create_table_as_select(dataset_name, table_name, sqlQuery, project,
+                                                   client=bigquery_client, max_scan_bytes=max_scan_bytes)
+        print(select_job_output['msg'])
 
         # finally, drop temp table
-        _ = drop_table(dataset_name, temp_table_name, project)
-        print str(_["msg"])
+        _ = drop_table(dataset_name, temp_table_name, project, client=bigquery_client)
+        print(str(_["msg"]))
 
         output_dict = {
             "dataset_name": dataset_name,
@@ -1259,13 +3484,266 @@ def load_table_from_gcs_fixedwidth(dataset_name, table_name, fixedwidth_spec, so
         raise
 
 
+# bytes of a fixed width file parsed per chunk by iter_fixedwidth_tables, this bounds the memory used
+FIXEDWIDTH_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+def _parse_fixedwidth_spec(fixedwidth_spec):
+    """
+    _parse_fixedwidth_spec splits "Name:Width:Type,..." into a list of (name, width, type),
+    the same rules as convert_sqlquery_from_fixedwidth_spec
+    """
+    columns = []
+    for col in fixedwidth_spec.split(","):
+        col_spec = col.strip().split(":")
+        if len(col_spec) != 3:
+            raise ValueError('fixedwidth_spec is missing arguments: ' + str(col_spec))
+        name, width, data_type = col_spec
+        if data_type not in ('STRING', 'INTEGER', 'FLOAT', 'BOOLEAN', 'TIMESTAMP'):
+            raise ValueError('data type must be either STRING, INTEGER, FLOAT, BOOLEAN or TIMESTAMP, not ' +
+                             str(data_type))
+        columns.append((name, int(width), data_type))
+
+    return columns
+
+
+def _fixedwidth_grid_values(grid, offset, width):
+    """
+    _fixedwidth_grid_values turns grid[:, offset:offset + width] (one row per record, ascii only,
+    so a byte is a character) into an arrow string array without copying the fields one by one
+    """
+    n = grid.shape[0]
+    data = np.ascontiguousarray(grid[:, offset:offset + width])
+    offsets = np.arange(n + 1, dtype=np.int32) * width
+    return pa.Array.from_buffers(pa.string(), n, [None, pa.py_buffer(offsets), pa.py_buffer(data)])
+
+
+def _fixedwidth_line_values(lines, offset, width):
+    """
+    _fixedwidth_line_values cuts characters offset to offset + width out of every line like SUBSTR does,
+    lines still end in their \n (or \r\n), which a field running past the end of a short record drops
+    """
+    values = pc.utf8_slice_codeunits(lines, start=offset, stop=offset + width)
+    return pc.utf8_rtrim(values, characters='\r\n')
+
+
+def _fixedwidth_column(values, data_type):
+    """
+    _fixedwidth_column turns the string values of one field into a typed arrow array,
+    STRING keeps the field as it is like SUBSTR, the other types are trimmed and blank is NULL
+    """
+    if data_type == 'STRING':
+        return values
+
+    values = pc.utf8_trim_whitespace(values)
+    values = pc.if_else(pc.equal(pc.utf8_length(values), 0), pa.scalar(None, pa.string()), values)
+    if data_type == 'INTEGER':
+        return pc.cast(values, pa.int64())
+    if data_type == 'FLOAT':
+        return pc.cast(values, pa.float64())
+    if data_type == 'BOOLEAN':
+        return pc.cast(values, pa.bool_())
+
+    # TIMESTAMP, values without a zone are utc like they are in bq
+    try:
+        return pc.assume_timezone(pc.cast(values, pa.timestamp('us')), 'UTC')
+    except pa.ArrowInvalid:
+        return pc.cast(values, pa.timestamp('us', tz='UTC'))
+
+
+def iter_fixedwidth_tables(local_file_name, fixedwidth_spec, skip_leading_rows=1, chunk_bytes=FIXEDWIDTH_CHUNK_BYTES):
+    """
+    iter_fixedwidth_tables reads a local fixed width file chunk by chunk and yields each chunk as a typed
+    pyarrow table, the records are cut into fields with numpy/pyarrow compute, not line by line in python,
+    so memory stays around a few chunk_bytes whatever the file size
+    the widths are characters (utf-8), the fields are cut like the SUBSTR of load_table_from_gcs_fixedwidth:
+    a STRING field past the end of a short record comes back shorter (or empty), a longer record is cut
+
+    Args:
+       local_file_name (str, required):  The file location, fully qualified is best i.e. /opt/projects/test/filename.txt
+       fixedwidth_spec (str, required):  ColumnName1:Width:DataType,... see load_table_from_gcs_fixedwidth
+       skip_leading_rows (int, default 1):  set to 0 if no header
+       chunk_bytes (int, default FIXEDWIDTH_CHUNK_BYTES):  bytes read per chunk
+
+    Returns:
+        A generator of pyarrow tables, one per chunk.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        if pa is None:
+            raise ImportError('iter_fixedwidth_tables needs pyarrow and numpy installed')
+
+        columns = _parse_fixedwidth_spec(fixedwidth_spec)
+        record_width = sum(width for name, width, data_type in columns)
+        schema = pa.schema([(name, {'STRING': pa.string(), 'INTEGER': pa.int64(), 'FLOAT': pa.float64(),
+                                    'BOOLEAN': pa.bool_(), 'TIMESTAMP': pa.timestamp('us', tz='UTC')}[data_type])
+                            for name, width, data_type in columns])
+        line_number = 0
+        total_bytes = 0
+
+        with open(local_file_name, 'rb') as readable:
+            carry = b''
+            while True:
+                data = readable.read(chunk_bytes)
+                chunk = carry + data
+                if not chunk:
+                    break
+                if data:
+                    # only whole records are parsed, the tail waits for the next read
+                    cut = chunk.rfind(b'\n') + 1
+                    if cut == 0:
+                        carry = chunk
+                        continue
+                    chunk, carry = chunk[:cut], chunk[cut:]
+                else:
+                    carry = b''
+                chunk_offset = total_bytes
+                total_bytes += len(chunk)
+
+                buf = np.frombuffer(chunk, dtype=np.uint8)
+                newlines = np.flatnonzero(buf == ord('\n'))
+                starts = np.concatenate(([0], newlines + 1))
+                if starts[-1] == len(buf):
+                    starts = starts[:-1]
+                ends = np.append(newlines, len(buf))[:len(starts)]
+
+                first = min(max(skip_leading_rows - line_number, 0), len(starts))
+                line_number += len(starts)
+                starts, ends = starts[first:], ends[first:]
+                if not len(starts):
+                    continue
+                ends = ends - ((ends > starts) & (buf[np.maximum(ends - 1, 0)] == ord('\r')))
+                lengths = ends - starts
+
+                stride = starts[1] - starts[0] if len(starts) > 1 else len(buf) - starts[0]
+                grid = None
+                lines = None
+                if (lengths == record_width).all() and (np.diff(starts) == stride).all() and \
+                        starts[0] + stride * len(starts) <= len(buf) and not (buf >= 0x80).any():
+                    # every record is ascii with the same length and line ending, the chunk is already a grid
+                    grid = buf[starts[0]:starts[0] + stride * len(starts)].reshape(len(starts), stride)
+                else:
+                    # multibyte characters or ragged records, fields are cut at character positions,
+                    # each line is one string (terminator included) straight over the chunk bytes
+                    line_offsets = np.append(starts, len(buf)).astype(np.int32)
+                    lines = pa.Array.from_buffers(pa.string(), len(starts),
+                                                  [None, pa.py_buffer(line_offsets), pa.py_buffer(chunk)])
+                    try:
+                        lines.validate(full=True)
+                    except pa.ArrowInvalid as e:
+                        raise ValueError('the records from byte {} to {} are not valid utf-8: {}'.format(
+                            chunk_offset, total_bytes, str(e)))
+
+                arrays = []
+                offset = 0
+                for name, width, data_type in columns:
+                    try:
+                        if grid is not None:
+                            values = _fixedwidth_grid_values(grid, offset, width)
+                        else:
+                            values = _fixedwidth_line_values(lines, offset, width)
+                        arrays.append(_fixedwidth_column(values, data_type))
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                        raise ValueError('column {} in the records from byte {} to {}: {}'.format(
+                            name, chunk_offset, total_bytes, str(e)))
+                    offset += width
+
+                yield pa.Table.from_arrays(arrays, schema=schema)
+
+    except Exception as e:
+        errorStr = 'ERROR (iter_fixedwidth_tables): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def load_table_from_local_fixedwidth(dataset_name, table_name, fixedwidth_spec, local_file_name,
+                                     skip_leading_rows=1, write_disposition='WRITE_TRUNCATE',
+                                     chunk_bytes=FIXEDWIDTH_CHUNK_BYTES, project=None, client=None):
+    """
+    load_table_from_local_fixedwidth loads a local fixed width file to bq with fixedwidth_spec,
+    the file is parsed here (see iter_fixedwidth_tables) into one snappy parquet file of typed columns,
+    written chunk by chunk, and loaded with a single load job -
+    no _tmp table, no CTAS and no drop_table calls like load_table_from_gcs_fixedwidth
+        py> bqTools.load_table_from_local_fixedwidth('my_dataset', 'books',
+                                                     "Id:3:INTEGER,firstName:9:STRING,lastName:10:STRING",
+                                                     '/data/drop/books.txt')
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_name (str, required):  The bq table name of the table to get loaded
+       fixedwidth_spec (str, required):  ColumnName1:Width:DataType,... see load_table_from_gcs_fixedwidth
+       local_file_name (str, required):  The file location, fully qualified is best i.e. /opt/projects/test/filename.txt
+       skip_leading_rows (int, default 1):  set to 0 if no header
+       write_disposition (str, default WRITE_TRUNCATE):  other options: WRITE_EMPTY WRITE_APPEND
+       chunk_bytes (int, default FIXEDWIDTH_CHUNK_BYTES):  bytes of the file parsed at a time
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary object containing information about the process.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
+        table_ref = bigquery_client.dataset(dataset_name).table(table_name)
+
+        job_config = LoadJobConfig()
+        job_config.source_format = 'PARQUET'
+        job_config.schema = [bigquery.SchemaField(name, data_type, mode='NULLABLE')
+                             for name, width, data_type in _parse_fixedwidth_spec(fixedwidth_spec)]
+        job_config.create_disposition = 'CREATE_IF_NEEDED'
+        job_config.write_disposition = write_disposition
+
+        rows = 0
+        with tempfile.SpooledTemporaryFile(max_size=PARQUET_SPOOL_MAX_BYTES) as spool:
+            writer = None
+            for table in iter_fixedwidth_tables(local_file_name, fixedwidth_spec, skip_leading_rows, chunk_bytes):
+                if writer is None:
+                    writer = pq.ParquetWriter(spool, table.schema, compression='snappy')
+                writer.write_table(table)
+                rows += table.num_rows
+            if writer is None:
+                raise ValueError('no records in ' + str(local_file_name))
+            writer.close()
+
+            spool.seek(0)
+            load_job = bigquery_client.load_table_from_file(spool, table_ref, job_config=job_config,
+                                                            job_id_prefix="bqTools_load_job")
+            load_job.result()  # Waits for job to complete
+
+        invalidate_metadata_cache(bigquery_client.project, dataset_name, table_name)
+
+        output_dict = {
+            "dataset_name": dataset_name,
+            "table_name": table_name,
+            "local_file_name": local_file_name,
+            "job_id": load_job.job_id,
+            "parsedRows": rows,
+            "outputRows": str(load_job.output_rows),
+            "outputBytes": str(load_job.output_bytes),
+            "status": "complete",
+            "msg": 'load_table_from_local_fixedwidth {}:{} {}'.format(dataset_name, table_name, local_file_name)
+        }
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (load_table_from_local_fixedwidth): ' + str(e)
+        print(errorStr)
+        raise
+
+
 # ------------------------------------------------------------------
 # export functions
 # ------------------------------------------------------------------
 
 
 def export_table_to_gcs(dataset_name, table_name, destination, field_delimiter=",", print_header=None,
-                        destination_format="CSV", compression="GZIP", project=None):
+                        destination_format="CSV", compression="GZIP", project=None, client=None):
     """
     export_table_to_gcs exports a table from bq into a file on gcs,
         the destination should look like the following, with no brackets {}
@@ -1286,6 +3764,7 @@ def export_table_to_gcs(dataset_name, table_name, destination, field_delimiter="
         destination_format (str, default "CSV"):  cannot imagine us using anything but CSV
         compression (str, default "GZIP"): compression algorithm, leave NULL/None if no compression
         project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+        client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         A dictionary object containing information about the process.
@@ -1294,7 +3773,33 @@ def export_table_to_gcs(dataset_name, table_name, destination, field_delimiter="
        Standard errors are printed to stdout and raised.
     """
     try:
-        bigquery_client = bigquery.Client(project=project)
+        # Wait for job to complete
+        return submit_export_table_to_gcs(dataset_name, table_name, destination, field_delimiter=field_delimiter,
+                                          print_header=print_header, destination_format=destination_format,
+                                          compression=compression, project=project, client=client).wait()
+
+    except Exception as e:
+        errorStr = 'ERROR (export_data_to_gcs): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def submit_export_table_to_gcs(dataset_name, table_name, destination, field_delimiter=",", print_header=None,
+                               destination_format="CSV", compression="GZIP", project=None, client=None):
+    """
+    submit_export_table_to_gcs starts an export_table_to_gcs job and returns without waiting for it
+
+    Args:
+        same as export_table_to_gcs
+
+    Returns:
+        A JobHandle, its wait() returns the export_table_to_gcs dictionary.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        bigquery_client = get_client(project, client=client)
         dataset_ref = bigquery_client.dataset(dataset_name)
         table_ref = dataset_ref.table(table_name)
 
@@ -1307,7 +3812,7 @@ def export_table_to_gcs(dataset_name, table_name, destination, field_delimiter="
             job_config.field_delimiter = field_delimiter
 
         # default is true
-        if print_header:
+        if print_header is not None:
             job_config.print_header = print_header
 
         # CSV, NEWLINE_DELIMITED_JSON, or AVRO
@@ -1325,30 +3830,85 @@ def export_table_to_gcs(dataset_name, table_name, destination, field_delimiter="
 
         job = bigquery_client.extract_table(table_ref, destination, job_config=job_config, job_id_prefix=job_id_prefix)
 
-        # job.begin()
-        job.result()  # Wait for job to complete
+        def on_done(job):
+            output_dict = {
+                "dataset_name": dataset_name,
+                "table_name": table_name,
+                "destination": destination,
+                "job_id": job.job_id,
+                "status": "complete",
+                "msg": 'Exported {}:{} to {}'.format(dataset_name, table_name, destination)
+            }
 
-        output_dict = {
-            "dataset_name": dataset_name,
-            "table_name": table_name,
-            "destination": destination,
-            "job_id": job.job_id,
-            "status": "complete",
-            "msg": 'Exported {}:{} to {}'.format(dataset_name, table_name, destination)
-        }
+            return output_dict
 
-        return output_dict
+        return JobHandle(job, on_done)
 
     except Exception as e:
-        errorStr = 'ERROR (export_data_to_gcs): ' + str(e)
+        errorStr = 'ERROR (submit_export_table_to_gcs): ' + str(e)
         print(errorStr)
         raise
 
 
+# extract destination_format names as EXPORT DATA format names
+_EXPORT_DATA_FORMATS = {'CSV': 'CSV', 'NEWLINE_DELIMITED_JSON': 'JSON', 'AVRO': 'AVRO', 'PARQUET': 'PARQUET'}
+
+
+def _sql_string(value):
+    """
+    _sql_string quotes a python string as a standard sql string literal
+    """
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def _export_data_to_gcs(bigquery_client, sqlQuery, destination, field_delimiter, print_header, destination_format,
+                        compression, max_scan_bytes):
+    """
+    _export_data_to_gcs is the EXPORT_DATA mode of export_query_to_gcs, one EXPORT DATA query job
+    that writes the results straight to the gs:// uri (which needs one * wildcard)
+    """
+    export_format = _EXPORT_DATA_FORMATS[(destination_format or 'CSV').upper()]
+    if compression == "GZIP" and destination.lower()[-3:] != ".gz":
+        destination = str(destination) + ".gz"
+
+    options = ["uri=" + _sql_string(destination), "format=" + _sql_string(export_format), "overwrite=true"]
+    if export_format == 'CSV':
+        # the extract job prints a header unless told not to, EXPORT DATA is the other way around
+        options.append("header=" + ("false" if print_header is False else "true"))
+        if field_delimiter:
+            options.append("field_delimiter=" + _sql_string(field_delimiter))
+    if compression and compression.upper() != 'NONE':
+        options.append("compression=" + _sql_string(compression))
+
+    exportQuery = 'EXPORT DATA OPTIONS({}) AS\n{}'.format(', '.join(options), sqlQuery)
+
+    job_config = bigquery.QueryJobConfig()
+    job_config.use_legacy_sql = False
+    job_config.maximum_bytes_billed = _max_scan_bytes(max_scan_bytes)
+    query_job = bigquery_client.query(exportQuery, job_config=job_config, job_id_prefix="bqTools_export_job")
+    query_job.result()  # Waits for job to complete
+
+    output_dict = {
+        "destination": destination,
+        "job_id": query_job.job_id,
+        "sqlQuery": exportQuery,
+        "status": "complete",
+        "msg": 'Exported query to {}'.format(destination)
+    }
+
+    return output_dict
+
+
 def export_query_to_gcs(dataset_name, sqlQuery, destination, field_delimiter=",", print_header=None,
-                        destination_format="CSV", compression="GZIP", keep_temp_table=None, project=None):
+                        destination_format="CSV", compression="GZIP", keep_temp_table=None, project=None,
+                        client=None, max_scan_bytes=None, export_mode=None):
     """
-    export_query_to_gcs creates a temporary table and export it to gs, then drop the temp table
+    export_query_to_gcs exports the results of a query to gs, export_mode picks how:
+        EXPORT_DATA - one EXPORT DATA query job, destination needs one * wildcard (default for a wildcard destination)
+        ANONYMOUS - the query job, then an extract of its anonymous result table (default otherwise)
+        TEMP_TABLE - CTAS into a temporary table in dataset_name, extract, drop the temp table
+            (default when keep_temp_table is YES)
+    only TEMP_TABLE writes the results to permanent storage
 
     Args:
         dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
@@ -1360,6 +3920,9 @@ def export_query_to_gcs(dataset_name, sqlQuery, destination, field_delimiter=","
         compression (str, default "GZIP"): compression algorith, leave NULL/None if no compression
         keep_temp_table (str, optional): set to YES if you want to keep the temp table for some reason
         project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+        client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+        max_scan_bytes (int, optional):  reject the query if it would scan more, if null MAX_SCAN_BYTES is used
+        export_mode (str, optional):  EXPORT_DATA, ANONYMOUS or TEMP_TABLE, see above
 
     Returns:
         A dictionary object containing information about the process.
@@ -1368,15 +3931,48 @@ def export_query_to_gcs(dataset_name, sqlQuery, destination, field_delimiter=","
        Standard errors are printed to stdout and raised.
     """
     try:
+        bigquery_client = get_client(project, client=client)
+
+        if keep_temp_table is None:
+            keep_temp_table = "NO"
 
-        my_date = datetime.datetime.now()
-        date_str = str(my_date.year) + str(my_date.month) + str(my_date.day) + str(my_date.hour)
-        date_str = date_str + str(my_date.minute) + str(my_date.second) + '0000'
-        tmp_table_name = "TMP_EXPORT_" + date_str.upper()
+        if export_mode is None:
+            if keep_temp_table.upper() == "YES":
+                export_mode = "TEMP_TABLE"
+            elif '*' in destination:
+                export_mode = "EXPORT_DATA"
+            else:
+                export_mode = "ANONYMOUS"
+        export_mode = export_mode.upper()
+
+        if export_mode == "EXPORT_DATA":
+            output_dict = _export_data_to_gcs(bigquery_client, sqlQuery, destination, field_delimiter, print_header,
+                                              destination_format, compression, max_scan_bytes)
+            output_dict.update({"export_mode": export_mode, "tmp_table_kept": "N/A", "run_drop": "NO"})
+            return output_dict
+
+        if export_mode == "ANONYMOUS":
+            # bq already keeps every query result in an anonymous table for a day, extract that one
+            query_job = _run_query_to_destination(bigquery_client, sqlQuery, 'standard', max_scan_bytes)
+            result_table = query_job.destination
+            output_dict = export_table_to_gcs(result_table.dataset_id, result_table.table_id, destination,
+                                              field_delimiter=field_delimiter, print_header=print_header,
+                                              destination_format=destination_format, compression=compression,
+                                              project=result_table.project, client=bigquery_client)
+            output_dict.update({"export_mode": export_mode, "query_job_id": query_job.job_id,
+                                "tmp_table_kept": "N/A", "run_drop": "NO"})
+            return output_dict
+
+        if export_mode != "TEMP_TABLE":
+            raise ValueError('export_mode must be EXPORT_DATA, ANONYMOUS or TEMP_TABLE, not ' + str(export_mode))
+
+        # microseconds plus a random suffix, two exports started in the same second used to get the same name
+        tmp_table_name = "TMP_EXPORT_{}_{}".format(datetime.datetime.now().strftime('%Y%m%d%H%M%S%f'),
+                                                    uuid.uuid4().hex[:8].upper())
 
         myResult = None
-        if table_exists(dataset_name, tmp_table_name):
-            myResult = drop_table(dataset_name, tmp_table_name)
+        if table_exists(dataset_name, tmp_table_name, project, client=bigquery_client):
+            myResult = drop_table(dataset_name, tmp_table_name, project, client=bigquery_client)
 
         if myResult:
             run_drop = "YES"
@@ -1385,7 +3981,8 @@ def export_query_to_gcs(dataset_name, sqlQuery, destination, field_delimiter=","
 
         # comment out print if not needed
         print("creating TMP table " + str(tmp_table_name))
-        tmpTableResult = create_table_as_select(dataset_name, tmp_table_name, sqlQuery)
+        tmpTableResult = create_table_as_select(dataset_name, tmp_table_name, sqlQuery, project,
+                                                client=bigquery_client, max_scan_bytes=max_scan_bytes)
         # comment out print if not needed
         print(tmpTableResult)
 
@@ -1393,19 +3990,17 @@ def export_query_to_gcs(dataset_name, sqlQuery, destination, field_delimiter=","
         exportTableResult = export_table_to_gcs(dataset_name, tmp_table_name, destination,
                                                 field_delimiter=field_delimiter, print_header=print_header,
                                                 destination_format=destination_format, compression=compression,
-                                                project=project)
+                                                project=project, client=bigquery_client)
 
         output_dict = exportTableResult
-
-        if keep_temp_table is None:
-            keep_temp_table = "NO"
+        output_dict.update({"export_mode": export_mode})
 
         if keep_temp_table.upper() == "YES":
             print("temporary table not dropped")
             output_dict.update({"tmp_table_kept": "YES"})
         else:
-            if table_exists(dataset_name, tmp_table_name):
-                myResult = drop_table(dataset_name, tmp_table_name)
+            if table_exists(dataset_name, tmp_table_name, project, client=bigquery_client):
+                myResult = drop_table(dataset_name, tmp_table_name, project, client=bigquery_client)
                 output_dict.update({"tmp_table_kept": "NO"})
 
                 if myResult:
@@ -1427,12 +4022,128 @@ def export_query_to_gcs(dataset_name, sqlQuery, destination, field_delimiter=","
         raise
 
 
+def export_table_to_local(dataset_name, table_name, local_path, bucket_name, gs_prefix=None, field_delimiter=",",
+                          print_header=True, compression="GZIP", merge=True, max_workers=8, keep_gcs_files=False,
+                          project=None, client=None):
+    """
+    export_table_to_local exports a table to a local file (or folder of shards) in one call,
+    the export uses a wildcard uri so bq writes many shards in parallel, the shards are downloaded on
+    max_workers threads and, with merge, streamed (decompressed) into one file with a single header
+        py> bqTools.export_table_to_local('my_dataset', 'orders', '/data/out/orders.csv', 'my-staging-bucket')
+
+    Args:
+        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+        table_name (str, required):  The bq table name of the table to get exported
+        local_path (str, required):  the merged file, or with merge=False the folder the shards go in
+        bucket_name (str, required):  gcs bucket the shards are written to
+        gs_prefix (str, optional):  gcs "folder" for the shards, if null bqTools_export/<table>_<timestamp>/,
+            only the <table>_NNNNNNNNNNNN.csv shards this export writes there are downloaded and deleted
+        field_delimiter (str, default ","):  the file delimiter, use "/t" for tab
+        print_header (boolean, default true):  print a header row, once in the merged file, on every shard otherwise
+        compression (str, default "GZIP"):  compression of the shards, the merged file is never compressed
+        merge (boolean, default True):  merge the shards into local_path and remove them
+        max_workers (int, default 8):  number of downloads in flight
+        keep_gcs_files (boolean, default False):  leave the shards on gcs
+        project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+        client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary object containing information about the process, "file_list" has the local shards
+        (already removed when merged).
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        if not gs_prefix:
+            gs_prefix = 'bqTools_export/{}_{}/'.format(table_name, datetime.datetime.now().strftime('%Y%m%d%H%M%S%f'))
+        if not gs_prefix.endswith('/'):
+            gs_prefix = gs_prefix + '/'
+
+        export_start = time.time()
+        destination = 'gs://{}/{}{}_*.csv'.format(bucket_name, gs_prefix, table_name)
+        output_dict = export_table_to_gcs(dataset_name, table_name, destination, field_delimiter=field_delimiter,
+                                          print_header=print_header, compression=compression,
+                                          project=project, client=client)
+        export_seconds = time.time() - export_start
+
+        # only the shards this export wrote: the wildcard name bq fills in (12 digits), created after the
+        # export started - anything else under gs_prefix is neither merged nor deleted
+        shard_prefix = '{}{}_'.format(gs_prefix, table_name)
+        shard_re = re.compile(re.escape(shard_prefix) + r'\d{12}\.csv(\.gz)?$')
+        blob_df = gsTools.get_blob_list_dataframe(bucket_name, max_results=None, prefix=shard_prefix,
+                                                  project=project)
+        gs_files = []
+        if len(blob_df):
+            # a few seconds of slack for the clock difference between here and gcs
+            export_started = pd.Timestamp(export_start - 5, unit='s', tz='UTC')
+            new_shards = blob_df["fileName"].str.match(shard_re) & (blob_df["time_created"] >= export_started)
+            gs_files = sorted(blob_df.loc[new_shards, "fileName"])
+        if not gs_files:
+            raise ValueError('the export wrote no files under gs://{}/{}'.format(bucket_name, gs_prefix))
+
+        if merge:
+            shard_dir = tempfile.mkdtemp(prefix='bqTools_export_', dir=os.path.dirname(os.path.abspath(local_path)))
+        else:
+            shard_dir = local_path
+            if not os.path.isdir(shard_dir):
+                os.makedirs(shard_dir)
+
+        def download_one(gs_filename):
+            local_filename = os.path.join(shard_dir, os.path.basename(gs_filename))
+            gsTools.download_file(bucket_name, gs_filename, local_filename)
+            return local_filename
+
+        download_start = time.time()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            file_list = list(executor.map(download_one, gs_files))
+        download_seconds = time.time() - download_start
+
+        merge_seconds = None
+        if merge:
+            merge_start = time.time()
+            with open(local_path, 'wb') as writable:
+                for i, local_filename in enumerate(file_list):
+                    opener = gzip.open if local_filename.lower().endswith('.gz') else open
+                    with opener(local_filename, 'rb') as readable:
+                        if print_header is not False and i > 0:
+                            # every shard starts with the header, keep only the first one
+                            readable.readline()
+                        shutil.copyfileobj(readable, writable, 1024 * 1024)
+            shutil.rmtree(shard_dir)
+            merge_seconds = round(time.time() - merge_start, 3)
+
+        if not keep_gcs_files:
+            bucket = gsTools.get_client(project).bucket(bucket_name)
+            bucket.delete_blobs([bucket.blob(f) for f in gs_files])
+
+        output_dict.update({
+            "local_path": local_path,
+            "shards": len(gs_files),
+            "file_list": file_list,
+            "merged": "YES" if merge else "NO",
+            "export_seconds": round(export_seconds, 3),
+            "download_seconds": round(download_seconds, 3),
+            "merge_seconds": merge_seconds,
+            "gcs_files_kept": "YES" if keep_gcs_files else "NO",
+            "msg": 'export_table_to_local {}:{} to {} in {} shards'.format(dataset_name, table_name, local_path,
+                                                                           len(gs_files))
+        })
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (export_table_to_local): ' + str(e)
+        print(errorStr)
+        raise
+
+
 # ------------------------------------------------------------------
 # view functions
 # ------------------------------------------------------------------
 
 
-def create_view(dataset_name, view_name, sqlQuery, project=None):
+def create_view(dataset_name, view_name, sqlQuery, project=None, client=None):
     """
     note:  in bq, you do not use DDL - "create view as select ...."
     create_view creates a view using the SQL passed in,
@@ -1445,6 +4156,7 @@ def create_view(dataset_name, view_name, sqlQuery, project=None):
         view_name (str, required):  The bq view name to be created
         sqlQuery (str, required): the sql to be executed for the view
         project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+        client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
 
     Returns:
         True:  view created
@@ -1455,13 +4167,14 @@ def create_view(dataset_name, view_name, sqlQuery, project=None):
     """
     try:
 
-        bigquery_client = bigquery.Client(project=project)
+        bigquery_client = get_client(project, client=client)
         dataset_ref = bigquery_client.dataset(dataset_name)
         table_ref = dataset_ref.table(view_name)
         table = Table(table_ref)
         table.view_query = sqlQuery
         table.view_use_legacy_sql = False
         bigquery_client.create_table(table)
+        invalidate_metadata_cache(bigquery_client.project, dataset_name, view_name)
 
         return True
 
@@ -1491,7 +4204,7 @@ def convert_schema(schema_json_str):
     """
     try:
         schema_str = schema_json_str.replace('\n', '')
-        schema_str = re.sub('\s+', ' ', schema_str)
+        schema_str = re.sub(r'\s+', ' ', schema_str)
         schemaJson = json.loads(schema_str)
 
         SCHEMA = []
@@ -1499,14 +4212,106 @@ def convert_schema(schema_json_str):
             fieldName = item["name"]
             fieldType = item["type"]
             fieldMode = item["mode"]
-            myThing = bigquery.SchemaField(fieldName.encode('utf-8'), fieldType.encode('utf-8'),
-                                           mode=fieldMode.encode('utf-8'))
+            myThing = bigquery.SchemaField(fieldName, fieldType, mode=fieldMode)
             SCHEMA.append(myThing)
 
         return SCHEMA
 
     except Exception as e:
-        errorStr = 'ERROR (create_dataset): ' + str(e)
+        errorStr = 'ERROR (convert_schema): ' + str(e)
+        print(errorStr)
+        raise
+
+
+def _bq_type_from_arrow(arrow_type, field_name):
+    """
+    _bq_type_from_arrow returns the bq type a parquet load reads an arrow type as
+    """
+    if pa.types.is_dictionary(arrow_type):
+        # pandas categoricals, parquet stores the values
+        return _bq_type_from_arrow(arrow_type.value_type, field_name)
+    if pa.types.is_boolean(arrow_type):
+        return 'BOOLEAN'
+    if pa.types.is_integer(arrow_type):
+        return 'INTEGER'
+    if pa.types.is_floating(arrow_type):
+        return 'FLOAT'
+    if pa.types.is_timestamp(arrow_type):
+        return 'TIMESTAMP'
+    if pa.types.is_date(arrow_type):
+        return 'DATE'
+    if pa.types.is_time(arrow_type):
+        return 'TIME'
+    if pa.types.is_decimal(arrow_type):
+        # NUMERIC is 29 digits before the point and 9 after
+        if arrow_type.scale <= 9 and arrow_type.precision - arrow_type.scale <= 29:
+            return 'NUMERIC'
+        return 'BIGNUMERIC'
+    if pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type) or \
+            pa.types.is_fixed_size_binary(arrow_type):
+        return 'BYTES'
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or \
+            pa.types.is_null(arrow_type) or pa.types.is_duration(arrow_type):
+        # null (all None) and duration columns are written as strings, see _arrow_table_from_df
+        return 'STRING'
+
+    raise ValueError('column {} has type {}, which the parquet load_format does not handle'.format(
+        field_name, arrow_type))
+
+
+def _arrow_table_from_df(dataframe):
+    """
+    _arrow_table_from_df converts a dataframe to the arrow table the parquet load_format writes,
+    timedelta columns become strings and all None columns string typed - bq reads neither from parquet
+    """
+    timedelta_cols = [col for col, dtype in dataframe.dtypes.items() if pd.api.types.is_timedelta64_dtype(dtype)]
+    if timedelta_cols:
+        dataframe = dataframe.copy()
+        for col in timedelta_cols:
+            dataframe[col] = dataframe[col].astype(str).where(dataframe[col].notnull(), None)
+
+    table = pa.Table.from_pandas(dataframe, preserve_index=False)
+    fields = [pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+              for field in table.schema]
+
+    return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+
+def _bq_schema_from_arrow(arrow_schema):
+    """
+    _bq_schema_from_arrow returns the bq schema list (all NULLABLE) for the arrow schema of _arrow_table_from_df
+    """
+    SCHEMA = []
+    for field in arrow_schema:
+        fieldType = _bq_type_from_arrow(field.type, field.name)
+        SCHEMA.append(bigquery.SchemaField(str(field.name), fieldType, mode='NULLABLE'))
+
+    return SCHEMA
+
+
+def convert_schema_from_df(dataframe):
+    """
+    convert_schema_from_df builds the bq schema list for a pandas dataframe, every field is NULLABLE,
+    the types come from the arrow schema pyarrow writes to parquet, so object columns of dates, Decimals
+    or bytes become DATE, NUMERIC (or BIGNUMERIC) and BYTES, timedelta and all None columns become STRING
+
+    Args:
+        dataframe (pandas dataframe, required):  the frame to be loaded
+
+    Returns:
+        A list of the table schema which the load can use.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        if pa is None:
+            raise ImportError('convert_schema_from_df needs pyarrow installed')
+
+        return _bq_schema_from_arrow(_arrow_table_from_df(dataframe).schema)
+
+    except Exception as e:
+        errorStr = 'ERROR (convert_schema_from_df): ' + str(e)
         print(errorStr)
         raise
 
@@ -1522,7 +4327,7 @@ def convert_sqlquery_from_fixedwidth_spec(dataset_name, table_name, fixedwidth_s
     example fixedwidth_spec= "Id:3:INTEGER,firstName:9:STRING,lastName:10:STRING,ISBN:11:STRING"
 
     Args:
-        dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+        dataset_name (str, required):  The bq dataset name string, None when table_name is a temporary table.
         table_name (str, required):  The bq table name of the table to be processed.
         fixedwidth_spec (str, required):  TBD.
         full_col_name (str, default "fullstring"):  TBD.
@@ -1542,8 +4347,8 @@ def convert_sqlquery_from_fixedwidth_spec(dataset_name, table_name, fixedwidth_s
         if len(col_spec) != 3:
             errorStr = 'ERROR (convert_sqlquery_from_fixedwidth_spec): fixedwidth_spec is missing arguments'
             print(errorStr)
-            print str(col_spec)
-            raise
+            print(str(col_spec))
+            raise ValueError(errorStr)
         else:
             name = col_spec[0]
             width = col_spec[1]
@@ -1555,7 +4360,7 @@ def convert_sqlquery_from_fixedwidth_spec(dataset_name, table_name, fixedwidth_s
                 STRING, INTEGER, FLOAT, BOOLEAN, TIMESTAMP or RECORD
                 """
                 print(errorStr)
-                raise
+                raise ValueError('unsupported data_type ' + data_type)
             else:
                 if data_type == 'INTEGER':
                     sqlQuery = sqlQuery + 'CAST(LTRIM(RTRIM(SUBSTR(' + full_col_name + ',' + str(loc) + ','
@@ -1575,7 +4380,10 @@ def convert_sqlquery_from_fixedwidth_spec(dataset_name, table_name, fixedwidth_s
                 # update location for the next field
                 loc = loc + int(width)
 
-    sqlQuery = sqlQuery[:-2] + ' FROM `' + dataset_name + '.' + table_name + '`'
+    if dataset_name:
+        sqlQuery = sqlQuery[:-2] + ' FROM `' + dataset_name + '.' + table_name + '`'
+    else:
+        sqlQuery = sqlQuery[:-2] + ' FROM `' + table_name + '`'
     return sqlQuery
 
 
@@ -0,0 +1,190 @@
+# compressTools.py
+"""
+Name:
+    compressTools.py
+
+Objectives:
+    Compress big local files on all cores on the way to gcs/bq, without writing a second copy to disk
+
+    The file is cut into blocks and each block is compressed on its own thread (zlib and zstandard
+    both let go of the GIL while they work), every block becomes a complete gzip member (or zstd frame)
+    and the members are read back in order - gzip/zstd readers, gcs and bq loads all take
+    concatenated members as one file
+        py> with compressTools.CompressedStream('/data/big.csv', method='gzip') as stream:
+        py>     blob.upload_from_file(stream)
+
+Problem:
+    Contact Rich or Tam
+
+Install list:
+    sudo pip install --upgrade futures  (python 2 only, for concurrent.futures)
+    sudo pip install --upgrade zstandard  (optional, for method='zstd')
+
+"""
+
+import io
+import zlib
+import collections
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# size of the uncompressed blocks handed to the threads
+BLOCK_SIZE = 16 * 1024 * 1024
+
+# file name suffix for each method
+SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def _compress_block_gzip(data, level):
+    """
+    _compress_block_gzip returns data as one complete gzip member
+    """
+    # wbits 31 = gzip header and trailer around a deflate stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_block_zstd(data, level):
+    """
+    _compress_block_zstd returns data as one complete zstd frame
+    """
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def iter_compressed_blocks(local_filename, method='gzip', level=None, block_size=BLOCK_SIZE, max_workers=None):
+    """
+    iter_compressed_blocks yields the compressed blocks of a file in file order,
+    at most 2 x max_workers blocks are in memory at any time
+
+    Args:
+       local_filename (str, required):  the file to compress
+       method (str, default gzip):  gzip or zstd, any case
+       level (int, optional):  compression level, if null 6 for gzip and 3 for zstd
+       block_size (int, default BLOCK_SIZE):  uncompressed bytes per block
+       max_workers (int, optional):  compression threads, if null the number of cpus
+
+    Returns:
+        A generator of compressed byte strings.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        method = str(method).lower()
+        if method == 'gzip':
+            compress_block = _compress_block_gzip
+            level = 6 if level is None else level
+        elif method == 'zstd':
+            if zstandard is None:
+                raise ImportError('method zstd needs the zstandard package installed')
+            compress_block = _compress_block_zstd
+            level = 3 if level is None else level
+        else:
+            raise ValueError('method must be gzip or zstd, not ' + str(method))
+
+        max_workers = max_workers or multiprocessing.cpu_count()
+        with open(local_filename, 'rb') as readable:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                in_flight = collections.deque()
+                while True:
+                    # keep every thread busy plus one block queued each, but no more
+                    while len(in_flight) < 2 * max_workers:
+                        data = readable.read(block_size)
+                        if not data:
+                            break
+                        in_flight.append(executor.submit(compress_block, data, level))
+
+                    if not in_flight:
+                        break
+
+                    yield in_flight.popleft().result()
+
+    except Exception as e:
+        errorStr = 'ERROR (iter_compressed_blocks): ' + str(e)
+        print(errorStr)
+        raise
+
+
+class CompressedStream(io.RawIOBase):
+    """
+    CompressedStream is a read-only file object over iter_compressed_blocks, for upload_from_file,
+    load_table_from_file and anything else that reads a stream,
+    the resumable uploads seek back after a failed chunk, so the last rewind_bytes read are kept for that
+
+    Args:
+       local_filename (str, required):  the file to compress
+       method (str, default gzip):  gzip or zstd
+       level (int, optional):  compression level
+       rewind_bytes (int, default 32MB):  how far back seek() can go, keep it >= the upload chunk size
+       max_workers (int, optional):  compression threads, if null the number of cpus
+    """
+
+    def __init__(self, local_filename, method='gzip', level=None, rewind_bytes=32 * 1024 * 1024, max_workers=None):
+        io.RawIOBase.__init__(self)
+        self._blocks = iter_compressed_blocks(local_filename, method=method, level=level, max_workers=max_workers)
+        self._rewind_bytes = rewind_bytes
+        # bytes already read that are still kept, _kept ends at _buffer_end
+        self._kept = bytearray()
+        self._buffer = bytearray()
+        self._buffer_end = 0
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """
+        seek only goes to positions inside the kept window (or to the current position)
+        """
+        if whence == io.SEEK_CUR:
+            offset = self._position + offset
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('CompressedStream can not seek from the end')
+
+        window_start = self._buffer_end - len(self._buffer) - len(self._kept)
+        if not window_start <= offset <= self._buffer_end:
+            raise io.UnsupportedOperation('CompressedStream can not seek to {} (window {}-{})'.format(
+                offset, window_start, self._buffer_end))
+
+        # put everything from offset on back into the unread buffer
+        everything = self._kept + self._buffer
+        split = offset - window_start
+        self._kept = everything[:split]
+        self._buffer = everything[split:]
+        self._position = offset
+        return offset
+
+    def readinto(self, b):
+        n = len(b)
+        while len(self._buffer) < n:
+            block = next(self._blocks, None)
+            if block is None:
+                break
+            self._buffer += block
+            self._buffer_end += len(block)
+
+        chunk = self._buffer[:n]
+        del self._buffer[:n]
+        b[:len(chunk)] = chunk
+        self._position += len(chunk)
+
+        self._kept += chunk
+        if len(self._kept) > self._rewind_bytes:
+            del self._kept[:len(self._kept) - self._rewind_bytes]
+
+        return len(chunk)
+
+    def close(self):
+        self._blocks.close()
+        io.RawIOBase.close(self)
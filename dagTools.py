@@ -0,0 +1,314 @@
+# dagTools.py
+"""
+Name:
+    dagTools.py
+
+Objectives:
+    Run a nightly build of bqTools steps (CTAS, views, exports, anything callable) as a small DAG,
+    steps that do not depend on each other run at the same time, up to max_concurrent,
+    each step is retried on failure and a per-step timing report shows the critical path
+
+    Dependencies are either declared (depends_on=) or inferred - a step that reads
+    dataset.table in its SQL depends on the step that creates dataset.table
+        py> pipeline = dagTools.Pipeline(max_concurrent=4, retries=2)
+        py> pipeline.add_ctas('orders_clean', 'my_dataset', 'orders_clean', 'SELECT ... FROM `raw.orders`')
+        py> pipeline.add_ctas('daily_totals', 'my_dataset', 'daily_totals', 'SELECT ... FROM `my_dataset.orders_clean`')
+        py> pipeline.add_view('v_totals', 'my_dataset', 'v_totals', 'SELECT * FROM `my_dataset.daily_totals`')
+        py> result = pipeline.run(report_path='/tmp/nightly_timing.csv')
+
+Problem:
+    Contact Rich or Tam
+
+Install list:
+    see bqTools.py
+
+"""
+
+import re
+import time
+import collections
+import pandas as pd
+import bqTools
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as futures_wait
+from concurrent.futures import FIRST_COMPLETED
+
+# dataset.table or project.dataset.table after FROM / JOIN, with or without backticks,
+# a name followed by ( is a function (i.e. FROM UNNEST(...) or a table function), not a table
+_TABLE_REF_RE = re.compile(r'\b(?:FROM|JOIN)\s+[`\[]?([\w\-]+(?:[.:][\w\-]+){1,2})[`\]]?(?![\w\-]|\s*\()',
+                           re.IGNORECASE)
+
+# EXTRACT(YEAR FROM t.col) - the FROM inside EXTRACT reads a column, not a table
+_EXTRACT_FROM_RE = re.compile(r'\bEXTRACT\s*\(\s*\w+(?:\s*\(\s*\w+\s*\))?\s+FROM\b', re.IGNORECASE)
+
+
+def referenced_tables(sqlQuery):
+    """
+    referenced_tables returns the set of "dataset.table" names the sql reads from (FROM / JOIN),
+    a project prefix is dropped, so `proj.ds.t` and ds.t are the same table
+
+    Args:
+       sqlQuery (str, required):  The bq sql to be scanned.
+
+    Returns:
+        A set of "dataset.table" strings.
+
+    Raises:
+       No exceptions raised.
+    """
+    tables = set()
+    sqlQuery = _EXTRACT_FROM_RE.sub('EXTRACT(', sqlQuery or '')
+    for match in _TABLE_REF_RE.findall(sqlQuery):
+        parts = re.split(r'[.:]', match)
+        tables.add('.'.join(parts[-2:]))
+
+    return tables
+
+
+class Pipeline(object):
+    """
+    Pipeline holds the steps of a build and runs them as a DAG, see the module docstring for an example
+
+    Args:
+       max_concurrent (int, default 4):  max number of steps running at the same time
+       retries (int, default 1):  how many times a failed step is tried again before it is marked error
+       retry_wait_seconds (float, default 10):  wait before a retry, multiplied by the attempt number
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+    """
+
+    def __init__(self, max_concurrent=4, retries=1, retry_wait_seconds=10, project=None):
+        self.max_concurrent = max_concurrent
+        self.retries = retries
+        self.retry_wait_seconds = retry_wait_seconds
+        self.project = project
+        self.steps = collections.OrderedDict()
+
+    def add_step(self, name, func, kwargs=None, depends_on=None, outputs=None, sqlQuery=None):
+        """
+        add_step adds any callable as a step
+
+        Args:
+           name (str, required):  unique step name, used in depends_on and the report
+           func (callable, required):  the function to run, i.e. bqTools.create_table_as_select
+           kwargs (dict, optional):  keyword arguments for func
+           depends_on (list, optional):  step names that must complete first
+           outputs (list, optional):  "dataset.table" names this step creates, used to infer dependencies
+           sqlQuery (str, optional):  sql the step reads with, used to infer dependencies
+        """
+        if name in self.steps:
+            raise ValueError('ERROR (add_step): duplicate step name ' + str(name))
+
+        self.steps[name] = {
+            "name": name,
+            "func": func,
+            "kwargs": kwargs or {},
+            "depends_on": list(depends_on or []),
+            "outputs": set(outputs or []),
+            "inputs": referenced_tables(sqlQuery),
+        }
+        return name
+
+    def add_ctas(self, name, dataset_name, table_name, sqlQuery, depends_on=None,
+                 write_disposition='WRITE_TRUNCATE'):
+        """
+        add_ctas adds a bqTools.create_table_as_select step, WRITE_TRUNCATE by default so a retried step
+        or a rerun of the pipeline replaces the table instead of appending the rows again
+        """
+        kwargs = {"dataset_name": dataset_name, "table_name": table_name, "sqlQuery": sqlQuery,
+                  "project": self.project, "write_disposition": write_disposition}
+        return self.add_step(name, bqTools.create_table_as_select, kwargs, depends_on,
+                             outputs=[dataset_name + '.' + table_name], sqlQuery=sqlQuery)
+
+    def add_view(self, name, dataset_name, view_name, sqlQuery, depends_on=None):
+        """
+        add_view adds a bqTools.create_view step
+        """
+        kwargs = {"dataset_name": dataset_name, "view_name": view_name, "sqlQuery": sqlQuery,
+                  "project": self.project}
+        return self.add_step(name, bqTools.create_view, kwargs, depends_on,
+                             outputs=[dataset_name + '.' + view_name], sqlQuery=sqlQuery)
+
+    def add_export(self, name, dataset_name, sqlQuery, destination, depends_on=None, **export_kwargs):
+        """
+        add_export adds a bqTools.export_query_to_gcs step, export_kwargs are passed through
+        """
+        kwargs = {"dataset_name": dataset_name, "sqlQuery": sqlQuery, "destination": destination,
+                  "project": self.project}
+        kwargs.update(export_kwargs)
+        return self.add_step(name, bqTools.export_query_to_gcs, kwargs, depends_on, sqlQuery=sqlQuery)
+
+    def dependencies(self):
+        """
+        dependencies returns {step name: set of step names it waits on}, declared plus inferred
+        """
+        producers = {}
+        for step in self.steps.values():
+            for table in step["outputs"]:
+                producers[table] = step["name"]
+
+        deps = {}
+        for step in self.steps.values():
+            step_deps = set(step["depends_on"])
+            for table in step["inputs"]:
+                if table in producers and producers[table] != step["name"]:
+                    step_deps.add(producers[table])
+
+            unknown = step_deps - set(self.steps)
+            if unknown:
+                raise ValueError('ERROR (dependencies): step {} depends on unknown steps {}'.format(
+                    step["name"], sorted(unknown)))
+            deps[step["name"]] = step_deps
+
+        return deps
+
+    def _topological_order(self, deps):
+        """
+        _topological_order returns the step names so that every step comes after its dependencies,
+        a cycle raises ValueError
+        """
+        order = []
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError('ERROR (run): dependency cycle ' + ' -> '.join(path + [name]))
+            state[name] = 'visiting'
+            for dep in sorted(deps[name]):
+                visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.steps:
+            visit(name, [])
+
+        return order
+
+    def _run_step(self, step, run_start):
+        """
+        _run_step runs one step with retries and returns its report row
+        """
+        row = {"step": step["name"], "attempts": 0, "status": "error", "msg": ""}
+        row["start_seconds"] = time.time() - run_start
+        for attempt in range(1, self.retries + 2):
+            row["attempts"] = attempt
+            try:
+                result = step["func"](**step["kwargs"])
+                # some bqTools functions return an 'ERROR ...' string instead of raising
+                if not isinstance(result, dict) and str(result).startswith('ERROR'):
+                    raise ValueError(str(result))
+                row["status"] = "complete"
+                row["msg"] = str(result.get("msg", "") if isinstance(result, dict) else result)
+                break
+            except Exception as e:
+                row["msg"] = 'ERROR (' + step["name"] + '): ' + str(e)
+                print(row["msg"])
+                if attempt <= self.retries:
+                    time.sleep(self.retry_wait_seconds * attempt)
+
+        row["end_seconds"] = time.time() - run_start
+        row["duration_seconds"] = row["end_seconds"] - row["start_seconds"]
+        return row
+
+    def run(self, report_path=None):
+        """
+        run executes the pipeline, ready steps run concurrently up to max_concurrent,
+        a step whose dependency failed is not run and is reported as "skipped"
+
+        Args:
+           report_path (str, optional):  write the per-step timing report to this csv file
+
+        Returns:
+            A dictionary object containing information about the process, "report" is a pandas dataframe
+            with one row per step and "critical_path" the chain of steps that decided the total run time.
+
+        Raises:
+           Standard errors are printed to stdout and raised.
+        """
+        try:
+            deps = self.dependencies()
+            order = self._topological_order(deps)
+            status = dict((name, "pending") for name in order)
+            rows = {}
+            run_start = time.time()
+
+            with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+                running = {}
+                while True:
+                    # order is topological, so one pass is enough to push "skipped" down a chain
+                    for name in order:
+                        if status[name] != "pending":
+                            continue
+                        dep_status = [status[dep] for dep in deps[name]]
+                        if any(s in ("error", "skipped") for s in dep_status):
+                            status[name] = "skipped"
+                            rows[name] = {"step": name, "attempts": 0, "status": "skipped",
+                                          "msg": 'dependency failed', "start_seconds": None,
+                                          "end_seconds": None, "duration_seconds": None}
+                        elif all(s == "complete" for s in dep_status):
+                            status[name] = "running"
+                            running[executor.submit(self._run_step, self.steps[name], run_start)] = name
+
+                    if not running:
+                        break
+
+                    done, not_done = futures_wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        rows[name] = future.result()
+                        status[name] = rows[name]["status"]
+                        print('dagTools: step {} {} ({:.1f}s)'.format(name, status[name],
+                                                                      rows[name]["duration_seconds"]))
+
+            for name in order:
+                rows[name]["depends_on"] = ','.join(sorted(deps[name]))
+
+            report = pd.DataFrame([rows[name] for name in order],
+                                  columns=["step", "status", "attempts", "start_seconds", "end_seconds",
+                                           "duration_seconds", "depends_on", "msg"])
+            critical_path = self._critical_path(deps, rows)
+            report["on_critical_path"] = report["step"].isin(critical_path)
+
+            if report_path:
+                report.to_csv(report_path, index=False)
+
+            failed = [name for name in order if status[name] != "complete"]
+            output_dict = {
+                "steps": len(order),
+                "failed_steps": failed,
+                "critical_path": critical_path,
+                "elapsed_seconds": time.time() - run_start,
+                "report": report,
+                "report_path": report_path,
+                "status": "complete" if not failed else "complete/with-errors",
+                "msg": 'dagTools run: {} steps, {} not complete'.format(len(order), len(failed))
+            }
+
+            return output_dict
+
+        except Exception as e:
+            errorStr = 'ERROR (run): ' + str(e)
+            print(errorStr)
+            raise
+
+    @staticmethod
+    def _critical_path(deps, rows):
+        """
+        _critical_path walks back from the last step to finish, always through the dependency that
+        finished last - that chain is what the total run time waited on
+        """
+        finished = dict((name, row["end_seconds"]) for name, row in rows.items()
+                        if row["end_seconds"] is not None)
+        if not finished:
+            return []
+
+        path = [max(finished, key=finished.get)]
+        while True:
+            candidates = [dep for dep in deps[path[-1]] if dep in finished]
+            if not candidates:
+                break
+            path.append(max(candidates, key=finished.get))
+
+        path.reverse()
+        return path
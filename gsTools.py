@@ -13,11 +13,72 @@ Problems?:
     Contact Rich or Tam
 
 """
-import google.auth
+import threading
+import authTools
+import compressTools
 from google.cloud import storage
 import pandas as pd
 
 
+# ------------------------------------------------------------------
+# client functions
+# ------------------------------------------------------------------
+
+# storage clients keyed by project, built once with the cached authTools credentials
+_client_registry = {}
+_client_registry_lock = threading.Lock()
+
+
+def get_client(project=None):
+    """
+    get_client returns the shared storage client for a project,
+    built with the cached authTools credentials so there is no credential discovery per call
+
+    Args:
+       project (str, optional):  The gcp project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+
+    Returns:
+        A storage.Client object.
+
+    Raises:
+       Standard errors are raised.
+    """
+    with _client_registry_lock:
+        client = _client_registry.get(project)
+        if client is None:
+            credentials, project_id = authTools.get_credentials()
+            client = storage.Client(project=(project or project_id), credentials=credentials)
+            _client_registry[project] = client
+
+    return client
+
+
+def close_clients():
+    """
+    close_clients closes the http sessions of every pooled storage client and empties the registry
+
+    Args:
+       No inbound arguments.
+
+    Returns:
+        The number of clients closed.
+
+    Raises:
+       No exceptions raised.
+    """
+    with _client_registry_lock:
+        n = len(_client_registry)
+        for client in _client_registry.values():
+            client._http.close()
+        _client_registry.clear()
+
+    return n
+
+
+# the pooled clients hold the cached credentials, drop them when authTools.clear_credentials runs
+authTools.on_clear_credentials(close_clients)
+
+
 # ------------------------------------------------------------------
 # google cloud storage (gcs) aka google storage (gs) functions 
 # ------------------------------------------------------------------
@@ -28,12 +89,8 @@ def copy_blob(bucket_name, blob_name, new_bucket_name, new_blob_name, project=No
     Copies a blob from one bucket to another with a new name.
     """
     try:
-        # the read_gbq requires the project_id(project name), so fetch it if none passed in
-        if not project:
-            credentials, project_id = google.auth.default(scopes=['https://www.googleapis.com/auth/iam'])
-            project = str(project_id)
-
-        client = storage.Client(project=project)
+        project = authTools.get_project(project)
+        client = get_client(project)
         source_bucket = client.get_bucket(bucket_name)
         source_blob = source_bucket.blob(blob_name)
         # note:  (x or y) will is the IfNull/IsNull equiv in python, 
@@ -69,14 +126,8 @@ def rename_blob(bucket_name, blob_name, new_name, project=None):
     Renames a blob.
     """
     try:
-        # the read_gbq requires the project_id(project name), so fetch it if none passed in
-        if not project:
-            credentials, project_id = google.auth.default(scopes=['https://www.googleapis.com/auth/iam'])
-        else:
-            project_id = None
-
-        project = (project or project_id)
-        client = storage.Client(project=project)
+        project = authTools.get_project(project)
+        client = get_client(project)
         bucket = client.get_bucket(bucket_name)
         blob = bucket.blob(blob_name)
 
@@ -112,14 +163,8 @@ def new_gs_file_from_string(bucket_name, blob_name, string_text, project=None):
     create a new file on gs and place the string in it
     """
     try:
-        # the read_gbq requires the project_id(project name), so fetch it if none passed in
-        if not project:
-            credentials, project_id = google.auth.default(scopes=['https://www.googleapis.com/auth/iam'])
-        else:
-            project_id = None
-
-        project = (project or project_id)
-        client = storage.Client(project=project)
+        project = authTools.get_project(project)
+        client = get_client(project)
         bucket = client.get_bucket(bucket_name)
         blob = bucket.blob(blob_name)
         blob.upload_from_string(string_text, content_type='text/plain', client=client)
@@ -147,14 +192,8 @@ def print_bucket_list(project=None):
     simply print out the names of the buckets
     """
     try:
-        # the read_gbq requires the project_id(project name), so fetch it if none passed in
-        if not project:
-            credentials, project_id = google.auth.default(scopes=['https://www.googleapis.com/auth/iam'])
-        else:
-            project_id = None
-
-        project = (project or project_id)
-        client = storage.Client(project=project)
+        project = authTools.get_project(project)
+        client = get_client(project)
         buckets = client.list_buckets()
         for bkt in buckets:
             print(bkt)
@@ -179,13 +218,8 @@ def get_blob_list_dataframe(bucket_name, max_results=99999, prefix=None, project
     return a pandas dataframe of the filenames in a bucket, search for files by using prefix
     """
     try:
-        if not project:
-            credentials, project_id = google.auth.default(scopes=['https://www.googleapis.com/auth/iam'])
-        else:
-            project_id = None
-
-        project = (project or project_id)
-        client = storage.Client(project=project)
+        project = authTools.get_project(project)
+        client = get_client(project)
         bucket = client.get_bucket(bucket_name)
         blobs = bucket.list_blobs(max_results=max_results, prefix=prefix)
         output_dict = []
@@ -194,12 +228,13 @@ def get_blob_list_dataframe(bucket_name, max_results=99999, prefix=None, project
             fileName = blobFile.name
             fileId = blobFile.id
             fileSize = blobFile.size
+            generation = blobFile.generation
             time_created = blobFile.time_created
             updated = blobFile.updated
             if printOut:
                 print(fileName)
             output_dict.append({'fileName': fileName, 'fileId': fileId, 'fileSize': fileSize,
-                                'time_created': time_created, 'updated': updated})
+                                'generation': generation, 'time_created': time_created, 'updated': updated})
 
         df = pd.DataFrame(output_dict)
 
@@ -216,7 +251,7 @@ def read_gcs_file(bucket_name='blah-blah-blah', blob_name='fake-data-3cols_20171
     reading a file from gcs in python
     Michael L. asked to research reading a file from gcs in python
     """
-    client = storage.Client()
+    client = get_client()
     bucket = client.get_bucket(bucket_name)
     blob = storage.Blob(blob_name, bucket)
     content = blob.download_as_string()
@@ -240,16 +275,33 @@ def read_gcs_file(bucket_name='blah-blah-blah', blob_name='fake-data-3cols_20171
     return output_dict
 
 
-def upload_file(local_filename, bucket_name, gs_filename):
+# resumable upload chunk for compressed streams, a multiple of 256KB and inside the CompressedStream rewind window
+COMPRESSED_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def upload_file(local_filename, bucket_name, gs_filename, compression=None):
     """
     upload a file to gs
     https://cloud.google.com/storage/docs/object-basics#storage-upload-object-python
+    compression gzip or zstd (any case) compresses on all cores while the file uploads (no compressed copy on disk),
+    .gz/.zst is added to gs_filename if it is not there
     """
     try:
-        client = storage.Client()
+        client = get_client()
         bucket = client.get_bucket(bucket_name)
-        blob = bucket.blob(gs_filename)
-        blob.upload_from_filename(local_filename)
+        if compression:
+            compression = compression.lower()
+            suffix = compressTools.SUFFIXES.get(compression)
+            if suffix and not gs_filename.endswith(suffix):
+                gs_filename = gs_filename + suffix
+            blob = bucket.blob(gs_filename, chunk_size=COMPRESSED_CHUNK_SIZE)
+            # the rewind window is tied to the chunk size, a failed chunk is sent again from its start
+            with compressTools.CompressedStream(local_filename, method=compression,
+                                                rewind_bytes=2 * COMPRESSED_CHUNK_SIZE) as stream:
+                blob.upload_from_file(stream, content_type='application/octet-stream')
+        else:
+            blob = bucket.blob(gs_filename)
+            blob.upload_from_filename(local_filename)
 
         msg = 'local_filename {} has been sent to {} {} '.format(local_filename, bucket_name, gs_filename)
 
@@ -257,6 +309,7 @@ def upload_file(local_filename, bucket_name, gs_filename):
             "bucket_name": str(bucket_name),
             "local_filename": str(local_filename),
             "gs_filename": str(gs_filename),
+            "compression": compression,
             "status": "complete",
             "msg": msg
         }
@@ -275,7 +328,7 @@ def download_file(bucket_name, gs_filename, local_filename):
     https://cloud.google.com/storage/docs/object-basics#storage-upload-object-python
     """
     try:
-        client = storage.Client()
+        client = get_client()
         bucket = client.get_bucket(bucket_name)
         blob = bucket.blob(gs_filename)
         blob.download_to_filename(local_filename)
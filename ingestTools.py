@@ -0,0 +1,442 @@
+# ingestTools.py
+"""
+Name:
+    ingestTools.py
+
+Objectives:
+    Load only the new (or changed) files under a gcs prefix into a bq table, on a schedule,
+    instead of reloading the whole prefix or keeping track by hand
+
+    Every file that is loaded is written to a manifest - destination, file name, generation, size, load job id -
+    kept in a local sqlite file or in a bq table, the next run skips every file the manifest already has
+    with the same generation, a file that was overwritten in gcs gets a new generation and is loaded again
+    The new files go into as few load jobs as the load job limits allow
+        py> ingestTools.ingest_new_files('my_dataset', 'events', schema, 'my-bucket', prefix='events/',
+                                         manifest_path='/var/lib/etl/events_manifest.db')
+        py> ingestTools.ingest_new_files('my_dataset', 'events', schema, 'my-bucket', prefix='events/',
+                                         manifest_table='etl_admin.ingest_manifest')
+
+    A LoadCoalescer takes load requests from many threads and, per destination table and load options,
+    gathers them for window_seconds (or until max_uris files) into one multi-uri load job -
+    one load job against the per table quota instead of one per small file,
+    each caller gets a future that resolves when the job with its files is done
+        py> coalescer = ingestTools.LoadCoalescer(window_seconds=10)
+        py> future = coalescer.submit('my_dataset', 'events', 'gs://my-bucket/events/part-0001.csv', schema)
+        py> future.result()
+
+Problem:
+    Contact Rich or Tam
+
+Install list:
+    see bqTools.py
+
+"""
+
+import sqlite3
+import datetime
+import threading
+import time
+import collections
+import bqTools
+import gsTools
+from google.cloud import bigquery
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+# bq load job limits - source uris per job and total bytes per job
+MAX_FILES_PER_JOB = 10000
+MAX_BYTES_PER_JOB = 15 * 1024 ** 4
+
+MANIFEST_SCHEMA = """[
+                     {"name": "destination", "type": "STRING", "mode": "REQUIRED"},
+                     {"name": "file_name", "type": "STRING", "mode": "REQUIRED"},
+                     {"name": "generation", "type": "INTEGER", "mode": "REQUIRED"},
+                     {"name": "size", "type": "INTEGER", "mode": "NULLABLE"},
+                     {"name": "job_id", "type": "STRING", "mode": "NULLABLE"},
+                     {"name": "loaded_at", "type": "TIMESTAMP", "mode": "NULLABLE"}
+                    ]
+                    """
+
+
+class _SqliteManifest(object):
+    """
+    _SqliteManifest keeps the manifest in a local sqlite file, one row per (destination, file_name)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS manifest (
+                                      destination TEXT NOT NULL, file_name TEXT NOT NULL,
+                                      generation INTEGER NOT NULL, size INTEGER, job_id TEXT, loaded_at TEXT,
+                                      PRIMARY KEY (destination, file_name))""")
+        connection.close()
+
+    def loaded(self, destination):
+        connection = sqlite3.connect(self.path)
+        try:
+            cursor = connection.execute('SELECT file_name, generation FROM manifest WHERE destination = ?',
+                                        (destination,))
+            return dict(cursor.fetchall())
+        finally:
+            connection.close()
+
+    def record(self, rows):
+        with self._lock:
+            connection = sqlite3.connect(self.path)
+            try:
+                with connection:
+                    connection.executemany('INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?, ?, ?)',
+                                           [(r["destination"], r["file_name"], r["generation"], r["size"],
+                                             r["job_id"], r["loaded_at"]) for r in rows])
+            finally:
+                connection.close()
+
+
+class _BigQueryManifest(object):
+    """
+    _BigQueryManifest keeps the manifest in a bq table (created on first use), rows are only appended,
+    so the newest row of a file wins
+    """
+
+    def __init__(self, manifest_table, project=None, client=None):
+        self.dataset_name, self.table_name = manifest_table.split('.')[-2:]
+        self.project = project
+        self.bigquery_client = bqTools.get_client(project, client=client)
+        if not bqTools.table_exists(self.dataset_name, self.table_name, project, client=self.bigquery_client):
+            bqTools.create_empty_table(self.dataset_name, self.table_name, MANIFEST_SCHEMA, project,
+                                       client=self.bigquery_client)
+        self.table_ref = self.bigquery_client.dataset(self.dataset_name).table(self.table_name)
+
+    def loaded(self, destination):
+        table = self.bigquery_client.get_table(self.table_ref)
+        loaded = {}
+        for row in sorted(self.bigquery_client.list_rows(table), key=lambda r: r["loaded_at"]):
+            if row["destination"] == destination:
+                loaded[row["file_name"]] = row["generation"]
+
+        return loaded
+
+    def record(self, rows):
+        job_config = bigquery.LoadJobConfig()
+        job_config.schema = bqTools.convert_schema(MANIFEST_SCHEMA)
+        job_config.write_disposition = 'WRITE_APPEND'
+        # a load job, not streaming inserts, so the rows are there for the next list_rows right away
+        self.bigquery_client.load_table_from_json(rows, self.table_ref, job_config=job_config,
+                                                  job_id_prefix="bqTools_manifest_job").result()
+
+
+def _batch_files(files, max_files, max_bytes):
+    """
+    _batch_files cuts the list of file rows into batches that each fit in one load job
+    """
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for f in files:
+        if batch and (len(batch) >= max_files or batch_bytes + f["size"] > max_bytes):
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+        batch.append(f)
+        batch_bytes += f["size"]
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def ingest_new_files(dataset_name, table_name, schema, bucket_name, prefix=None, manifest_path=None,
+                     manifest_table=None, skip_leading_rows=1, source_format='CSV', max_bad_records=0,
+                     field_delimiter=",", max_files_per_job=MAX_FILES_PER_JOB, max_bytes_per_job=MAX_BYTES_PER_JOB,
+                     dry_run=False, project=None, client=None):
+    """
+    ingest_new_files appends the files under gs://bucket_name/prefix that are not in the manifest yet
+    (or are there with an older generation) to dataset_name.table_name, the table is created on the first run,
+    a batch is written to the manifest as soon as its load job is done, so a failed job only loses its own batch
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_name (str, required):  The bq table name of the table to get loaded
+       schema (str, required):  the bq schema and column structure, in json bq cli format
+       bucket_name (str, required):  the gcs bucket to look in
+       prefix (str, optional):  only files whose name starts with this
+       manifest_path (str, optional):  local sqlite file for the manifest, created if missing
+       manifest_table (str, optional):  "dataset.table" in bq for the manifest instead, created if missing
+       skip_leading_rows (int, default 1):  set to 0 if no header
+       source_format (str, default CSV):  only set this to CSV or things like Avro, etc.
+       max_bad_records (int, default 0):  suggest setting this to a higher number, like 1000 or something
+       field_delimiter (str, default ","):  the file delimiter, use "/t" for tab
+       max_files_per_job (int, default MAX_FILES_PER_JOB):  source uris per load job
+       max_bytes_per_job (int, default MAX_BYTES_PER_JOB):  bytes per load job
+       dry_run (boolean, default False):  only work out what would be loaded
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+
+    Returns:
+        A dictionary object containing information about the process, "new_files" lists the files
+        picked up and "job_list" the output of each load job.
+
+    Raises:
+       Standard errors are printed to stdout and raised.
+    """
+    try:
+        if bool(manifest_path) == bool(manifest_table):
+            raise ValueError('set one of manifest_path or manifest_table')
+
+        if manifest_path:
+            manifest = _SqliteManifest(manifest_path)
+        else:
+            manifest = _BigQueryManifest(manifest_table, project, client=client)
+
+        destination = '{}.{}'.format(dataset_name, table_name)
+        loaded = manifest.loaded(destination)
+
+        blob_df = gsTools.get_blob_list_dataframe(bucket_name, max_results=None, prefix=prefix, project=project)
+        new_files = []
+        for blob_row in blob_df.to_dict('records'):
+            # "folders" are zero byte objects ending in /
+            if blob_row["fileName"].endswith('/'):
+                continue
+            if loaded.get(blob_row["fileName"]) == int(blob_row["generation"]):
+                continue
+            new_files.append({"file_name": blob_row["fileName"], "generation": int(blob_row["generation"]),
+                              "size": int(blob_row["fileSize"] or 0)})
+
+        new_files.sort(key=lambda f: f["file_name"])
+        batches = _batch_files(new_files, max_files_per_job, max_bytes_per_job)
+
+        handles = []
+        if not dry_run:
+            for batch in batches:
+                source = ['gs://{}/{}'.format(bucket_name, f["file_name"]) for f in batch]
+                handle = bqTools.submit_load_table_from_gcs(dataset_name, table_name, schema, source,
+                                                            skip_leading_rows, source_format, max_bad_records,
+                                                            'WRITE_APPEND', field_delimiter, project,
+                                                            client=client, create_table=False)
+                handles.append((handle, batch))
+
+        job_list = []
+        failed_files = 0
+        batch_of = dict((id(handle), batch) for handle, batch in handles)
+        for handle in bqTools.as_completed([handle for handle, batch in handles]):
+            batch = batch_of[id(handle)]
+            try:
+                job_output = handle.wait()
+            except Exception as e:
+                failed_files += len(batch)
+                job_list.append({"job_id": handle.job_id, "files": len(batch), "status": "error",
+                                 "msg": 'ERROR (ingest_new_files): ' + str(e)})
+                continue
+
+            loaded_at = datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')
+            manifest.record([{"destination": destination, "file_name": f["file_name"],
+                              "generation": f["generation"], "size": f["size"], "job_id": handle.job_id,
+                              "loaded_at": loaded_at} for f in batch])
+            job_output["files"] = len(batch)
+            job_list.append(job_output)
+
+        output_dict = {
+            "dataset_name": dataset_name,
+            "table_name": table_name,
+            "bucket_name": bucket_name,
+            "prefix": prefix,
+            "files_listed": len(blob_df),
+            "new_files": new_files,
+            "new_bytes": sum(f["size"] for f in new_files),
+            "load_jobs": len(batches),
+            "job_list": job_list,
+            "failed_files": failed_files,
+            "dry_run": "YES" if dry_run else "NO",
+            "status": "complete" if not failed_files else "complete/with-errors",
+            "msg": 'ingest_new_files {} {} new files in {} load jobs, {} failed'.format(
+                destination, len(new_files), len(batches), failed_files)
+        }
+
+        return output_dict
+
+    except Exception as e:
+        errorStr = 'ERROR (ingest_new_files): ' + str(e)
+        print(errorStr)
+        raise
+
+
+class LoadCoalescer(object):
+    """
+    LoadCoalescer merges load requests for the same destination and load options into one load job,
+    see the module docstring for an example, requests with WRITE_TRUNCATE in one group all land in the same
+    truncate, which is usually what several writers of one table mean but check it before you use it
+
+    Args:
+       window_seconds (float, default 5):  how long a group collects requests after its first one
+       max_uris (int, default MAX_FILES_PER_JOB):  a group is sent right away once it has this many files
+       max_running_jobs (int, default 8):  load jobs waited on at the same time
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+    """
+
+    def __init__(self, window_seconds=5, max_uris=MAX_FILES_PER_JOB, max_running_jobs=8, project=None, client=None):
+        self.window_seconds = window_seconds
+        self.max_uris = max_uris
+        self.project = project
+        self.bigquery_client = bqTools.get_client(project, client=client)
+
+        # group key -> {"opened": time, "uris": [...], "futures": [(future, uris)]}
+        self._groups = {}
+        # groups cut off but not sent yet, in the order they were cut - the job inserts happen
+        # outside _condition (so submit never waits on a network call) but still in this order
+        self._outbox = collections.deque()
+        self._send_lock = threading.Lock()
+        self._closing = False
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_running_jobs)
+        self._timer = threading.Thread(target=self._timer_loop, name='LoadCoalescer')
+        self._timer.daemon = True
+        self._timer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, dataset_name, table_name, source, schema=None, skip_leading_rows=1, source_format='CSV',
+               max_bad_records=0, write_disposition='WRITE_APPEND', field_delimiter=","):
+        """
+        submit queues a load of source into dataset_name.table_name and returns right away
+
+        Args:
+           dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+           table_name (str, required):  The bq table name of the table to get loaded, created if missing
+           source (str or list, required):  gs:// uri(s) of the files, at most max_uris
+           schema (str, optional):  the bq schema in json bq cli format, if null autodetect
+           skip_leading_rows (int, default 1):  set to 0 if no header
+           source_format (str, default CSV):  only set this to CSV or things like Avro, etc.
+           max_bad_records (int, default 0):  for the whole merged job, not per request
+           write_disposition (str, default WRITE_APPEND):  other options: WRITE_TRUNCATE WRITE_EMPTY
+           field_delimiter (str, default ","):  the file delimiter, use "/t" for tab
+
+        Returns:
+            A concurrent.futures.Future, its result() is the load_table_from_gcs dictionary of the merged job
+            with "source" set to this request's uris, a failed job raises its error there.
+        """
+        uris = source if isinstance(source, list) else [source]
+        key = (dataset_name, table_name, schema, skip_leading_rows, source_format, max_bad_records,
+               write_disposition, field_delimiter)
+        future = Future()
+
+        with self._condition:
+            if self._closing:
+                raise ValueError('ERROR (submit): LoadCoalescer is closed')
+            if len(uris) > self.max_uris:
+                raise ValueError('ERROR (submit): {} uris in one request, max_uris is {}'.format(
+                    len(uris), self.max_uris))
+            group = self._groups.get(key)
+            if group is not None and len(group["uris"]) + len(uris) > self.max_uris:
+                # this request would push the group past max_uris, send the group as it is
+                self._outbox.append((key, self._groups.pop(key)))
+                group = None
+            if group is None:
+                group = {"opened": time.time(), "uris": [], "futures": []}
+                self._groups[key] = group
+            group["uris"].extend(uris)
+            group["futures"].append((future, uris))
+            if len(group["uris"]) >= self.max_uris:
+                # the timer thread sends it, so the caller does not wait on the job insert
+                self._outbox.append((key, self._groups.pop(key)))
+            self._condition.notify_all()
+
+        return future
+
+    def flush(self):
+        """
+        flush sends every open group now, without waiting for the windows to end
+        """
+        with self._condition:
+            for key in list(self._groups):
+                self._outbox.append((key, self._groups.pop(key)))
+        self._drain()
+
+    def close(self):
+        """
+        close sends the open groups and waits for every load job, the coalescer can not be used after this
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._timer.join()
+        self._executor.shutdown(wait=True)
+
+    def _timer_loop(self):
+        """
+        _timer_loop runs on the timer thread and sends each group when its window ends
+        """
+        while True:
+            with self._condition:
+                closing = self._closing
+                now = time.time()
+                wait = None
+                for key in list(self._groups):
+                    due = self._groups[key]["opened"] + self.window_seconds
+                    if closing or due <= now:
+                        self._outbox.append((key, self._groups.pop(key)))
+                    else:
+                        wait = due - now if wait is None else min(wait, due - now)
+                if not closing and not self._outbox:
+                    self._condition.wait(wait)
+
+            self._drain()
+            if closing:
+                return
+
+    def _drain(self):
+        """
+        _drain sends the groups in _outbox in order, called without _condition held
+        """
+        with self._send_lock:
+            while True:
+                with self._condition:
+                    if not self._outbox:
+                        return
+                    key, group = self._outbox.popleft()
+                self._send(key, group)
+
+    def _send(self, key, group):
+        """
+        _send starts the load job of a group and hands the wait to the pool, caller holds _send_lock
+        """
+        (dataset_name, table_name, schema, skip_leading_rows, source_format, max_bad_records,
+         write_disposition, field_delimiter) = key
+        try:
+            handle = bqTools.submit_load_table_from_gcs(dataset_name, table_name, schema, group["uris"],
+                                                        skip_leading_rows, source_format, max_bad_records,
+                                                        write_disposition, field_delimiter, self.project,
+                                                        client=self.bigquery_client, create_table=False)
+        except Exception as e:
+            for future, uris in group["futures"]:
+                future.set_exception(e)
+            return
+
+        self._executor.submit(self._resolve, handle, group)
+
+    @staticmethod
+    def _resolve(handle, group):
+        """
+        _resolve waits for one merged load job and resolves the future of every request in it
+        """
+        try:
+            output_dict = handle.wait()
+        except Exception as e:
+            for future, uris in group["futures"]:
+                future.set_exception(e)
+            return
+
+        for future, uris in group["futures"]:
+            caller_dict = dict(output_dict)
+            caller_dict["source"] = uris
+            caller_dict["coalesced_requests"] = len(group["futures"])
+            caller_dict["coalesced_uris"] = len(group["uris"])
+            future.set_result(caller_dict)
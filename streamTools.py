@@ -0,0 +1,274 @@
+# streamTools.py
+"""
+Name:
+    streamTools.py
+
+Objectives:
+    Get rows into bq within a second instead of through load jobs (which take seconds to minutes
+    and count against the per table daily load job quota)
+
+    A StreamWriter buffers rows (dicts or pandas dataframes) in memory and background threads send them
+    with the bq streaming insert api, a batch goes out when it has max_rows rows, max_bytes bytes,
+    or its oldest row has waited max_latency_seconds, whichever comes first
+    When max_buffer_rows rows are waiting (buffered or being sent) write() blocks until there is room,
+    so a producer that is faster than bq slows down instead of using up all the memory
+        py> with streamTools.StreamWriter('my_dataset', 'events') as writer:
+        py>     for event in events:
+        py>         writer.write(event)
+        py> writer.stats()
+
+Problem:
+    Contact Rich or Tam
+
+Install list:
+    see bqTools.py
+
+"""
+
+import json
+import time
+import uuid
+import threading
+import collections
+import bqTools
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+# streaming insert limits are 50,000 rows and 10MB per request, bq suggests about 500 rows
+DEFAULT_MAX_ROWS = 500
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+# how many errors StreamWriter.errors keeps
+MAX_KEPT_ERRORS = 1000
+
+
+class StreamWriter(object):
+    """
+    StreamWriter streams rows into an existing bq table in micro batches, see the module docstring for an example
+
+    Args:
+       dataset_name (str, required):  The bq dataset name string, sometimes called id though not numeric.
+       table_name (str, required):  The bq table name of the table to stream into, it must exist
+       max_rows (int, default DEFAULT_MAX_ROWS):  send a batch once this many rows are waiting
+       max_bytes (int, default DEFAULT_MAX_BYTES):  send a batch once this many bytes of json are waiting
+       max_latency_seconds (float, default 0.5):  send a batch once its oldest row has waited this long
+       max_buffer_rows (int, default 100000):  write() blocks while this many rows are buffered or in flight
+       flush_threads (int, default 4):  batches sent at the same time
+       retries (int, default 3):  tries again after a failed request, with a growing wait
+       skip_invalid_rows (boolean, default False):  insert the valid rows of a batch that has invalid ones
+       ignore_unknown_values (boolean, default False):  drop fields the table does not have instead of failing
+       project (str, optional):  The bq project, if null the project is pulled from GOOGLE_APPLICATION_CREDENTIALS.
+       client (bigquery.Client, optional):  a shared client, if null one is pulled from the client pool
+    """
+
+    def __init__(self, dataset_name, table_name, max_rows=DEFAULT_MAX_ROWS, max_bytes=DEFAULT_MAX_BYTES,
+                 max_latency_seconds=0.5, max_buffer_rows=100000, flush_threads=4, retries=3,
+                 skip_invalid_rows=False, ignore_unknown_values=False, project=None, client=None):
+        self.dataset_name = dataset_name
+        self.table_name = table_name
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_latency_seconds = max_latency_seconds
+        self.max_buffer_rows = max_buffer_rows
+        self.retries = retries
+        self.skip_invalid_rows = skip_invalid_rows
+        self.ignore_unknown_values = ignore_unknown_values
+
+        self.bigquery_client = bqTools.get_client(project, client=client)
+        # get_table once, insert_rows_json then skips the schema lookup on every batch
+        self.table = self.bigquery_client.get_table(self.bigquery_client.dataset(dataset_name).table(table_name))
+
+        # (row id, row, json bytes, time written) waiting to be sent
+        self._buffer = collections.deque()
+        self._buffer_bytes = 0
+        # rows buffered plus rows in batches being sent, this is what max_buffer_rows limits
+        self._pending_rows = 0
+        self._flush_requested = 0
+        self._closing = False
+        self._condition = threading.Condition()
+
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.batches = 0
+        self.errors = []
+
+        self._executor = ThreadPoolExecutor(max_workers=flush_threads)
+        self._dispatcher = threading.Thread(target=self._dispatch_loop,
+                                            name='StreamWriter-{}.{}'.format(dataset_name, table_name))
+        self._dispatcher.daemon = True
+        self._dispatcher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, rows, timeout=None):
+        """
+        write adds rows to the buffer and returns, blocking only while the buffer is full
+
+        Args:
+           rows (dict, list of dicts or pandas dataframe, required):  the rows, json-able values keyed by column
+           timeout (float, optional):  seconds to wait for room in the buffer, if null wait forever
+
+        Returns:
+            The number of rows added.
+
+        Raises:
+           queue.Full when there is still no room after timeout, ValueError after close().
+        """
+        if isinstance(rows, dict):
+            rows = [rows]
+        elif hasattr(rows, 'to_json'):
+            # to_json turns timestamps into iso strings and NaN into null, which is what bq wants
+            rows = json.loads(rows.to_json(orient='records', date_format='iso'))
+
+        entries = [(str(uuid.uuid4()), row, len(json.dumps(row)), time.time()) for row in rows]
+        deadline = None if timeout is None else time.time() + timeout
+
+        with self._condition:
+            for entry in entries:
+                while self._pending_rows >= self.max_buffer_rows and not self._closing:
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        raise queue.Full('StreamWriter buffer full, {} rows waiting'.format(self._pending_rows))
+                    self._condition.wait(remaining)
+                if self._closing:
+                    raise ValueError('ERROR (write): StreamWriter is closed')
+
+                self._buffer.append(entry)
+                self._buffer_bytes += entry[2]
+                self._pending_rows += 1
+            self._condition.notify_all()
+
+        return len(entries)
+
+    def flush(self, timeout=None):
+        """
+        flush sends everything buffered now and waits until it has all been sent (or failed)
+
+        Args:
+           timeout (float, optional):  seconds to wait, if null wait forever
+
+        Returns:
+            True when everything was sent, False on timeout.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            self._flush_requested += 1
+            self._condition.notify_all()
+            try:
+                while self._pending_rows:
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self._flush_requested -= 1
+
+        return True
+
+    def close(self):
+        """
+        close flushes the buffer and stops the background threads, the writer can not be used after this
+        """
+        self.flush()
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def stats(self):
+        """
+        stats returns the counters of the writer as a dictionary
+        """
+        with self._condition:
+            return {
+                "dataset_name": self.dataset_name,
+                "table_name": self.table_name,
+                "rows_written": self.rows_written,
+                "rows_failed": self.rows_failed,
+                "batches": self.batches,
+                "pending_rows": self._pending_rows,
+                "buffered_rows": len(self._buffer),
+                "errors": len(self.errors),
+            }
+
+    def _seconds_until_due(self):
+        """
+        _seconds_until_due returns 0 when a batch should go out now, else how long until the oldest row is due,
+        None when the buffer is empty, caller holds _condition
+        """
+        if not self._buffer:
+            return None
+        if self._flush_requested or self._closing or len(self._buffer) >= self.max_rows or \
+                self._buffer_bytes >= self.max_bytes:
+            return 0
+
+        return max(self._buffer[0][3] + self.max_latency_seconds - time.time(), 0)
+
+    def _dispatch_loop(self):
+        """
+        _dispatch_loop runs on the dispatcher thread, cutting batches off the buffer and handing them to the pool
+        """
+        while True:
+            with self._condition:
+                wait = self._seconds_until_due()
+                while wait != 0:
+                    if wait is None and self._closing:
+                        return
+                    self._condition.wait(wait)
+                    wait = self._seconds_until_due()
+
+                batch = []
+                batch_bytes = 0
+                while self._buffer and len(batch) < self.max_rows and \
+                        (not batch or batch_bytes + self._buffer[0][2] <= self.max_bytes):
+                    entry = self._buffer.popleft()
+                    batch.append(entry)
+                    batch_bytes += entry[2]
+                self._buffer_bytes -= batch_bytes
+
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch):
+        """
+        _send inserts one batch, retrying failed requests, the row ids let bq drop rows a retry sends twice
+        """
+        row_ids = [entry[0] for entry in batch]
+        rows = [entry[1] for entry in batch]
+        failed = 0
+        new_errors = []
+        for attempt in range(self.retries + 1):
+            try:
+                insert_errors = self.bigquery_client.insert_rows_json(
+                    self.table, rows, row_ids=row_ids, skip_invalid_rows=self.skip_invalid_rows,
+                    ignore_unknown_values=self.ignore_unknown_values)
+                if insert_errors and not self.skip_invalid_rows:
+                    # one bad row fails the whole request
+                    failed = len(rows)
+                else:
+                    failed = len(insert_errors)
+                new_errors = insert_errors
+                break
+            except Exception as e:
+                if attempt == self.retries:
+                    failed = len(rows)
+                    new_errors = [{"index": None, "errors": ['ERROR (StreamWriter): ' + str(e)]}]
+                    print(new_errors[0]["errors"][0])
+                else:
+                    time.sleep(0.5 * 2 ** attempt)
+
+        with self._condition:
+            self.batches += 1
+            self.rows_written += len(rows) - failed
+            self.rows_failed += failed
+            self.errors.extend(new_errors[:max(MAX_KEPT_ERRORS - len(self.errors), 0)])
+            self._pending_rows -= len(rows)
+            self._condition.notify_all()